@@ -1,18 +1,33 @@
-from urllib.parse import urljoin
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urljoin, urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 import frappe
 from frappe import _
-from frappe.utils import sbool
+from frappe.utils import cint, sbool
 from frappe.utils.scheduler import is_scheduler_disabled
 
 from india_compliance.exceptions import GatewayTimeoutError, GSPServerError
 from india_compliance.gst_india.utils import is_api_enabled
-from india_compliance.gst_india.utils.api import enqueue_integration_request
+from india_compliance.gst_india.utils.api import (
+    enqueue_integration_request,
+    should_log_integration_request,
+)
 
 BASE_URL = "https://asp.resilient.tech"
 
+# can be overridden using `ic_api_pool_size` and `ic_api_timeout` in site config
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 10  # seconds
+DEFAULT_READ_TIMEOUT = 300  # seconds
+
+SESSIONS = {}
+SESSIONS_LOCK = threading.Lock()
+
 
 class BaseAPI:
     API_NAME = "GST"
@@ -133,7 +148,13 @@ class BaseAPI:
         try:
             self.before_request(request_args)
 
-            response = requests.request(method, **request_args)
+            try:
+                response = get_session(request_args.url).request(
+                    method, timeout=get_request_timeout(), **request_args
+                )
+            except requests.Timeout:
+                raise GatewayTimeoutError
+
             if api_request_id := response.headers.get("x-amzn-RequestId"):
                 log.request_id = api_request_id
 
@@ -170,12 +191,13 @@ class BaseAPI:
             raise e
 
         finally:
-            if response_json:
-                log.output = response_json.copy()
+            if should_log_integration_request(self.settings, log.error, response_json):
+                if response_json:
+                    log.output = response_json.copy()
 
-            self.mask_sensitive_info(log)
+                self.mask_sensitive_info(log)
 
-            enqueue_integration_request(**log)
+                enqueue_integration_request(**log)
 
             if self.sandbox_mode and not frappe.flags.ic_sandbox_message_shown:
                 frappe.msgprint(
@@ -283,8 +305,64 @@ class BaseAPI:
                 request_body[key] = "*****"
 
 
+def get_session(url):
+    """
+    Returns `requests.Session` for the base URL of `url`, shared across the process.
+
+    Connections are kept alive and reused by all API classes (and threads).
+    """
+    scheme, netloc, *_ = urlsplit(url)
+    base_url = f"{scheme}://{netloc}"
+
+    with SESSIONS_LOCK:
+        if not (session := SESSIONS.get(base_url)):
+            session = SESSIONS[base_url] = create_session(base_url)
+
+    return session
+
+
+def create_session(base_url):
+    """
+    - Failed connections are retried with backoff for all methods.
+    - Requests that reached the server are retried only for GET,
+      since POST requests (e.g. e-Invoice generation) are not idempotent.
+    - Cookies are not persisted, since the session is shared across GSTINs.
+    """
+    pool_size = cint(frappe.conf.ic_api_pool_size) or DEFAULT_POOL_SIZE
+    retry = Retry(
+        total=3,
+        connect=3,
+        read=0,
+        status=2,
+        status_forcelist=(502, 503),
+        allowed_methods=("GET",),
+        backoff_factor=0.5,
+        raise_on_status=False,
+    )
+
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    session.mount(
+        base_url,
+        HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry),
+    )
+
+    return session
+
+
+def get_request_timeout():
+    return (
+        DEFAULT_CONNECT_TIMEOUT,
+        cint(frappe.conf.ic_api_timeout) or DEFAULT_READ_TIMEOUT,
+    )
+
+
 def get_public_ip():
-    return requests.get("https://api.ipify.org").text
+    return (
+        get_session("https://api.ipify.org")
+        .get("https://api.ipify.org", timeout=get_request_timeout())
+        .text
+    )
 
 
 def check_scheduler_status():
@@ -134,6 +134,7 @@ async function enqueue_bulk_e_invoice_generation(docnames) {
 
 async function enqueue_bulk_generation(method, args) {
     const job_id = await frappe.xcall(method, args);
+    show_bulk_generation_progress();
 
     const now = frappe.datetime.system_datetime();
     const creation_filter = `[">", "${now}"]`;
@@ -168,6 +169,22 @@ async function enqueue_bulk_generation(method, args) {
     );
 }
 
+function show_bulk_generation_progress() {
+    frappe.realtime.off("bulk_generation_progress");
+    frappe.realtime.on("bulk_generation_progress", data => {
+        frappe.show_progress(
+            data.title,
+            data.current,
+            data.total,
+            __("Processed {0} of {1}", [data.current, data.total]),
+            true
+        );
+
+        if (data.current_progress === 100)
+            frappe.realtime.off("bulk_generation_progress");
+    });
+}
+
 async function validate_doc_status(selected_docs, allowed_status) {
     const valid_docs = [];
     const invalid_docs = [];
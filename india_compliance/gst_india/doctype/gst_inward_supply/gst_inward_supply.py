@@ -3,24 +3,37 @@
 
 import frappe
 from frappe import _
+from frappe.model import default_fields, optional_fields
 from frappe.model.document import Document
-from frappe.utils import get_link_to_form
+from frappe.model.naming import NamingSeries
+from frappe.utils import cint, get_link_to_form, getdate, now
 
 from india_compliance.gst_india.constants import ORIGINAL_VS_AMENDED
 
+# as in autoname `format:GST-IS-{######}`
+NAME_PREFIX = "GST-IS-"
+NAMING_SERIES = "######"
+BULK_QUERY_CHUNK_SIZE = 1000
+
 
 class GSTInwardSupply(Document):
     def before_save(self):
+        self.set_flags()
+
+        if self.needs_amendment_update():
+            update_docs_for_amendment(self)
+
+    def set_flags(self):
         if self.classification.endswith("A"):
             self.is_amended = True
 
         if self.gstr_1_filing_date:
             self.gstr_1_filled = True
 
-        if self.match_status != "Amended" and (
+    def needs_amendment_update(self):
+        return self.match_status != "Amended" and (
             self.other_return_period or self.is_amended
-        ):
-            update_docs_for_amendment(self)
+        )
 
     def on_trash(self):
         frappe.db.set_value(
@@ -45,6 +58,240 @@ def create_inward_supply(transaction):
     return gst_inward_supply.save(ignore_permissions=True)
 
 
+def bulk_create_inward_supply(transactions):
+    """
+    Create or update GST Inward Supply for transactions with bulk queries.
+
+    - Existing documents are fetched with a few queries instead of one per transaction.
+    - Existing documents are updated in place and only their items are replaced.
+    - New documents and items are written with bulk inserts.
+    - Amended and original documents are linked using `BulkAmendmentLinker`.
+
+    Documents are prepared as in `create_inward_supply` and versions are created
+    for updated documents, but documents are not validated.
+    """
+    if not transactions:
+        return []
+
+    existing_rows = get_existing_inward_supplies(transactions)
+    new_keys = {
+        key
+        for transaction in transactions
+        if (key := get_inward_supply_key(transaction)) not in existing_rows
+    }
+
+    names = iter(get_next_names(len(new_keys)))
+    timestamp = now()
+
+    # {key: doc}, same transaction may appear more than once
+    docs = {}
+    for transaction in transactions:
+        key = get_inward_supply_key(transaction)
+        doc = docs.get(key)
+
+        if not doc and (row := existing_rows.get(key)):
+            doc = frappe.get_doc({**row, "doctype": "GST Inward Supply"})
+
+        elif not doc:
+            doc = frappe.new_doc("GST Inward Supply")
+            doc.name = next(names)
+            doc.owner = frappe.session.user
+            doc.creation = timestamp
+
+        doc.modified = timestamp
+        doc.modified_by = frappe.session.user
+        doc.update(transaction)
+        doc.set_flags()
+        docs[key] = doc
+
+    docs = list(docs.values())
+    BulkAmendmentLinker(docs).link()
+
+    for doc in docs:
+        # reuse names of existing items
+        existing_items = existing_rows.get(get_inward_supply_key(doc), {}).get(
+            "items", []
+        )
+
+        for item in doc.items:
+            item.name = (
+                existing_items[item.idx - 1].name
+                if item.idx <= len(existing_items)
+                else frappe.generate_hash(length=10)
+            )
+            item.parent = doc.name
+            item.parenttype = doc.doctype
+            item.owner = item.modified_by = frappe.session.user
+            item.creation = item.modified = timestamp
+
+    existing_names = {row.name for row in existing_rows.values()}
+    updated_docs = [doc for doc in docs if doc.name in existing_names]
+
+    update_inward_supplies(updated_docs, timestamp)
+    bulk_insert_docs(
+        "GST Inward Supply", [doc for doc in docs if doc.name not in existing_names]
+    )
+
+    delete_inward_supply_items([doc.name for doc in updated_docs])
+    bulk_insert_docs(
+        "GST Inward Supply Item", [item for doc in docs for item in doc.items]
+    )
+
+    create_versions(updated_docs, existing_rows)
+
+    return docs
+
+
+def get_inward_supply_key(transaction):
+    # case insensitive, same as filters in database
+    return (
+        (transaction.get("bill_no") or "").lower(),
+        getdate(transaction.bill_date) if transaction.get("bill_date") else None,
+        (transaction.get("classification") or "").lower(),
+        (transaction.get("supplier_gstin") or "").lower(),
+    )
+
+
+def get_existing_inward_supplies(transactions):
+    """
+    Returns dict of existing rows (with items) for transactions with key as
+    (bill_no, bill_date, classification, supplier_gstin)
+    """
+    bill_nos = list({transaction.bill_no for transaction in transactions})
+    classifications = list({transaction.classification for transaction in transactions})
+    keys = {get_inward_supply_key(transaction) for transaction in transactions}
+
+    existing_rows = {}
+    for chunk in get_chunks(bill_nos):
+        for row in frappe.get_all(
+            "GST Inward Supply",
+            filters={
+                "bill_no": ("in", chunk),
+                "classification": ("in", classifications),
+            },
+            fields=["*"],
+            order_by="creation desc",
+        ):
+            key = get_inward_supply_key(row)
+            if key in keys:
+                existing_rows.setdefault(key, row)
+
+    items = {}
+    for chunk in get_chunks([row.name for row in existing_rows.values()]):
+        for item in frappe.get_all(
+            "GST Inward Supply Item",
+            filters={"parent": ("in", chunk), "parenttype": "GST Inward Supply"},
+            fields=["*"],
+            order_by="idx",
+        ):
+            items.setdefault(item.parent, []).append(item)
+
+    for row in existing_rows.values():
+        row["items"] = items.get(row.name, [])
+
+    return existing_rows
+
+
+def get_chunks(values):
+    for index in range(0, len(values), BULK_QUERY_CHUNK_SIZE):
+        yield values[index : index + BULK_QUERY_CHUNK_SIZE]
+
+
+def get_next_names(count):
+    """
+    Reserves `count` names from the counter used by autoname in a single update
+    """
+    if not count:
+        return []
+
+    # counter key used by frappe for the braced part of autoname
+    key = NamingSeries(NAMING_SERIES).get_prefix()
+    digits = NAMING_SERIES.count("#")
+
+    series = frappe.qb.DocType("Series")
+    current = (
+        frappe.qb.from_(series)
+        .select(series.current)
+        .where(series.name == key)
+        .for_update()
+    ).run()
+
+    if current and current[0][0] is not None:
+        current = cint(current[0][0])
+        (
+            frappe.qb.update(series)
+            .set(series.current, current + count)
+            .where(series.name == key)
+        ).run()
+
+    else:
+        current = 0
+        (frappe.qb.into(series).columns("name", "current").insert(key, count)).run()
+
+    return [
+        f"{NAME_PREFIX}{number:0{digits}d}"
+        for number in range(current + 1, current + count + 1)
+    ]
+
+
+def update_inward_supplies(docs, timestamp):
+    """Updates existing documents in place, keeping fields like tags and assignments"""
+    if not docs:
+        return
+
+    skip_fields = {*default_fields, *optional_fields}
+    frappe.db.bulk_update(
+        "GST Inward Supply",
+        {
+            doc.name: {
+                field: value
+                for field, value in doc.get_valid_dict(
+                    convert_dates_to_str=True
+                ).items()
+                if field not in skip_fields
+            }
+            for doc in docs
+        },
+        chunk_size=BULK_QUERY_CHUNK_SIZE,
+        modified=timestamp,
+        modified_by=frappe.session.user,
+    )
+
+
+def delete_inward_supply_items(names):
+    """Deletes items of existing documents, these are inserted again after update"""
+    for chunk in get_chunks(names):
+        frappe.db.delete(
+            "GST Inward Supply Item",
+            {"parent": ("in", chunk), "parenttype": "GST Inward Supply"},
+        )
+
+
+def create_versions(docs, existing_rows):
+    for doc in docs:
+        row = existing_rows[get_inward_supply_key(doc)]
+        previous_doc = frappe.get_doc({**row, "doctype": "GST Inward Supply"})
+
+        version = frappe.new_doc("Version")
+        if version.update_version_info(previous_doc, doc):
+            version.insert(ignore_permissions=True)
+
+
+def bulk_insert_docs(doctype, docs):
+    if not docs:
+        return
+
+    rows = [doc.get_valid_dict(convert_dates_to_str=True) for doc in docs]
+    fields = list(rows[0])
+
+    frappe.db.bulk_insert(
+        doctype,
+        fields,
+        [[row.get(field) for field in fields] for row in rows],
+        chunk_size=BULK_QUERY_CHUNK_SIZE,
+    )
+
+
 def update_docs_for_amendment(doc):
     fields = [
         "name",
@@ -164,6 +411,236 @@ def update_docs_for_amendment(doc):
         )
 
 
+class BulkAmendmentLinker:
+    """
+    Links amended and original documents same as `update_docs_for_amendment`,
+    for documents created in bulk.
+
+    Documents that could be linked are fetched with a few queries. Documents are
+    then processed in order, and each one is visible to the documents after it,
+    same as when these are saved one by one.
+    """
+
+    FIELDS = (
+        "name",
+        "bill_no",
+        "bill_date",
+        "original_bill_no",
+        "original_bill_date",
+        "supplier_gstin",
+        "classification",
+        "match_status",
+        "action",
+        "link_doctype",
+        "link_name",
+        "sup_return_period",
+    )
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.docs_by_name = {doc.name: doc for doc in docs}
+
+        # {name: row}
+        self.rows = {}
+
+        # {key: [names]}
+        self.by_bill = {}
+        self.by_original_bill = {}
+
+        # {name: values} for documents not in `docs`
+        self.updates = {}
+
+    def link(self):
+        docs = [doc for doc in self.docs if doc.needs_amendment_update()]
+        if not docs:
+            return
+
+        self.fetch_rows(docs)
+
+        for doc in self.docs:
+            if doc.needs_amendment_update():
+                if doc.is_amended:
+                    self.update_amended(doc)
+                else:
+                    self.update_original(doc)
+
+            self.add_row(doc)
+
+        if self.updates:
+            frappe.db.bulk_update(
+                "GST Inward Supply", self.updates, chunk_size=BULK_QUERY_CHUNK_SIZE
+            )
+
+    def fetch_rows(self, docs):
+        supplier_gstins = list({doc.supplier_gstin for doc in docs})
+        bill_nos = list(
+            {doc.original_bill_no for doc in docs if doc.is_amended} - {None}
+        )
+        original_bill_nos = list(
+            {doc.original_bill_no if doc.is_amended else doc.bill_no for doc in docs}
+            - {None}
+        )
+
+        for field, values in (
+            ("bill_no", bill_nos),
+            ("original_bill_no", original_bill_nos),
+        ):
+            for chunk in get_chunks(values):
+                self.add_rows(
+                    {field: ("in", chunk), "supplier_gstin": ("in", supplier_gstins)}
+                )
+
+        # previous amendments, for future amendments
+        link_names = list(
+            {
+                row.link_name
+                for row in self.rows.values()
+                if row.match_status == "Amended"
+                and row.link_doctype == "GST Inward Supply"
+                and row.link_name
+            }
+            - set(self.rows)
+        )
+
+        for chunk in get_chunks(link_names):
+            self.add_rows({"name": ("in", chunk)})
+
+    def add_rows(self, filters):
+        for row in frappe.get_all(
+            "GST Inward Supply",
+            filters=filters,
+            fields=self.FIELDS,
+            order_by="creation",
+        ):
+            if row.name not in self.rows:
+                self.add_row(row)
+
+    def add_row(self, row):
+        self.rows[row.name] = row
+
+        for index, fields in (
+            (self.by_bill, ("bill_no", "bill_date")),
+            (self.by_original_bill, ("original_bill_no", "original_bill_date")),
+        ):
+            names = index.setdefault(self.get_key(row, *fields), [])
+            if row.name not in names:
+                names.append(row.name)
+
+    def find(self, index, key, exclude=None):
+        for name in index.get(key, []):
+            if name != exclude:
+                return self.rows[name]
+
+    def get_key(self, row, bill_no, bill_date, classification=None):
+        # case insensitive, same as filters in database
+        return (
+            (row.get(bill_no) or "").lower(),
+            getdate(row.get(bill_date)) if row.get(bill_date) else None,
+            (row.supplier_gstin or "").lower(),
+            (classification or row.classification or "").lower(),
+        )
+
+    def set_values(self, name, values):
+        if doc := self.docs_by_name.get(name):
+            doc.update(values)
+        else:
+            self.updates.setdefault(name, {}).update(values)
+
+        if row := self.rows.get(name):
+            row.update(values)
+
+    def update_amended(self, doc):
+        other_classification = get_other_classification(doc)
+        original = self.find(
+            self.by_bill,
+            self.get_key(
+                doc, "original_bill_no", "original_bill_date", other_classification
+            ),
+        )
+        if not original:
+            # handle amendment from amendments where original is not available
+            original = self.find(
+                self.by_original_bill,
+                self.get_key(doc, "original_bill_no", "original_bill_date"),
+                exclude=doc.name,
+            )
+            if not original:
+                return
+
+        # handle future amendments
+        if (
+            original.match_status == "Amended"
+            and original.link_name
+            and original.link_name != doc.name
+            and doc.is_new()
+        ):
+            previous_amendment = original.link_name
+            self.set_values(original.name, {"link_name": doc.name})
+
+            # new original
+            original = self.rows.get(previous_amendment)
+            if not original:
+                return
+
+        if original.match_status == "Amended":
+            return
+
+        original = frappe._dict({field: original.get(field) for field in self.FIELDS})
+
+        # update_original_from_amended
+        self.set_values(
+            original.name,
+            {
+                "match_status": "Amended",
+                "action": "No Action",
+                "link_doctype": "GST Inward Supply",
+                "link_name": doc.name,
+            },
+        )
+
+        # update_amended_from_original
+        doc.update(
+            {
+                "match_status": original.match_status,
+                "action": original.action,
+                "link_doctype": original.link_doctype,
+                "link_name": original.link_name,
+            }
+        )
+        if not doc.other_return_period:
+            doc.other_return_period = original.sup_return_period
+
+        ensure_valid_match(doc, original)
+
+    def update_original(self, doc):
+        # Handle case where original is imported after amended
+        ensure_valid_match(doc, doc)
+        if doc.match_status == "Amended":
+            return
+
+        doc.update(
+            {
+                "match_status": "Amended",
+                "action": "No Action",
+            }
+        )
+        amended = self.find(
+            self.by_original_bill,
+            self.get_key(doc, "bill_no", "bill_date", get_other_classification(doc)),
+        )
+
+        if not amended:
+            return
+
+        # update_original_from_amended
+        doc.update(
+            {
+                "link_doctype": "GST Inward Supply",
+                "link_name": amended.name,
+            }
+        )
+
+
 def ensure_valid_match(doc, original):
     """
     Where receiver GSTIN is amended, company cannot claim credit for the original document.
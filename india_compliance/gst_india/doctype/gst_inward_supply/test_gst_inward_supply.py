@@ -1,9 +1,104 @@
 # Copyright (c) 2022, Resilient Tech and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests import IntegrationTestCase
 
+from india_compliance.gst_india.doctype.gst_inward_supply.gst_inward_supply import (
+    bulk_create_inward_supply,
+    create_inward_supply,
+)
+
 
 class TestGSTInwardSupply(IntegrationTestCase):
-    pass
+    def test_bulk_create_after_create(self):
+        created = create_inward_supply(get_transaction("BILL-0001"))
+        bulk_created = bulk_create_inward_supply(
+            [get_transaction("BILL-0002"), get_transaction("BILL-0003")]
+        )
+        created_after = create_inward_supply(get_transaction("BILL-0004"))
+
+        names = [
+            created.name,
+            *(doc.name for doc in bulk_created),
+            created_after.name,
+        ]
+        self.assertTrue(
+            all(frappe.db.exists("GST Inward Supply", name) for name in names)
+        )
+
+        # bulk names continue the counter used by autoname
+        numbers = [int(name.removeprefix("GST-IS-")) for name in names]
+        self.assertListEqual(numbers, list(range(numbers[0], numbers[0] + 4)))
+
+    def test_bulk_update_existing(self):
+        """Existing documents are updated in place and keep tags, with a version"""
+        (doc,) = bulk_create_inward_supply([get_transaction("BILL-0005")])
+        frappe.db.set_value(
+            "GST Inward Supply",
+            doc.name,
+            "_user_tags",
+            ",Verified",
+            update_modified=False,
+        )
+
+        transaction = get_transaction("BILL-0005")
+        transaction["items"].append(
+            {"item_number": 2, "taxable_value": 50, "rate": 5, "igst": 2.5}
+        )
+        (updated,) = bulk_create_inward_supply([transaction])
+        self.assertEqual(updated.name, doc.name)
+
+        self.assertEqual(
+            frappe.db.get_value("GST Inward Supply", doc.name, "_user_tags"),
+            ",Verified",
+        )
+        self.assertEqual(
+            frappe.db.count("GST Inward Supply Item", {"parent": doc.name}), 2
+        )
+        self.assertTrue(
+            frappe.db.exists(
+                "Version", {"ref_doctype": "GST Inward Supply", "docname": doc.name}
+            )
+        )
+
+    def test_bulk_amendment_linkage(self):
+        (original,) = bulk_create_inward_supply([get_transaction("BILL-0006")])
+
+        amendment = get_transaction(
+            "BILL-0006-A",
+            classification="B2BA",
+            original_bill_no="BILL-0006",
+            original_bill_date="2024-07-01",
+        )
+        (amended,) = bulk_create_inward_supply([amendment])
+
+        self.assertDocumentEqual(
+            {
+                "match_status": "Amended",
+                "action": "No Action",
+                "link_doctype": "GST Inward Supply",
+                "link_name": amended.name,
+            },
+            frappe.get_doc("GST Inward Supply", original.name),
+        )
+        self.assertEqual(
+            frappe.db.get_value("GST Inward Supply", amended.name, "is_amended"), 1
+        )
+
+        # original imported again after amendment
+        (original,) = bulk_create_inward_supply([get_transaction("BILL-0006")])
+        self.assertEqual(original.link_name, amended.name)
+
+
+def get_transaction(bill_no, **kwargs):
+    return frappe._dict(
+        bill_no=bill_no,
+        bill_date="2024-07-01",
+        classification="B2B",
+        company_gstin="24AAQCA8719H1ZC",
+        supplier_gstin="29AABCR1718E1ZL",
+        sup_return_period="072024",
+        items=[{"item_number": 1, "taxable_value": 100, "rate": 18, "igst": 18}],
+        **kwargs,
+    )
@@ -1,6 +1,8 @@
 # Copyright (c) 2024, Resilient Tech and contributors
 # For license information, please see license.txt
+import hashlib
 import itertools
+import pickle
 
 import frappe
 from frappe import unscrub
@@ -21,6 +23,9 @@ from india_compliance.gst_india.utils.gstr_1.gstr_1_json_map import (
     summarize_retsum_data,
 )
 
+# beyond this, computing books data afresh is faster
+MAX_INCREMENTAL_CHANGES = 1000
+
 
 class SummarizeGSTR1:
     AMOUNT_FIELDS = {
@@ -217,6 +222,10 @@ class ReconcileGSTR1:
         else:
             update_books_match = True
 
+        previous_data = self.get_reconciled_subcategories()
+        subcategory_hashes = {}
+        is_changed = False
+
         for subcategory in GSTR1_SubCategory:
             subcategory = subcategory.value
             books_subdata = books_data.get(subcategory) or {}
@@ -225,73 +234,123 @@ class ReconcileGSTR1:
             if not books_subdata and not gov_subdata:
                 continue
 
-            is_list = False  # Object Type for the subdata_value
+            # skip reconciliation if data is unchanged since last run
+            data_hash = get_data_hash(books_subdata, gov_subdata)
+            previous_hash, reconcile_subdata = previous_data.get(subcategory) or (
+                None,
+                None,
+            )
 
-            reconcile_subdata = {}
+            if data_hash != previous_hash:
+                is_changed = True
+                reconcile_subdata = self.get_reconciled_subdata(
+                    books_subdata, gov_subdata
+                )
 
-            # Books vs Gov
-            for key, books_value in books_subdata.items():
-                if not reconcile_subdata:
-                    is_list = isinstance(books_value, list)
+            subcategory_hashes[subcategory] = data_hash
 
-                gov_value = gov_subdata.get(key)
+            if update_books_match:
+                self.update_upload_status(books_subdata, gov_subdata, reconcile_subdata)
 
-                reconcile_row = self.get_reconciled_row(books_value, gov_value)
+                if not books_data.get(subcategory):
+                    books_data[subcategory] = books_subdata
 
-                if reconcile_row:
-                    reconcile_subdata[key] = reconcile_row
+            if reconcile_subdata:
+                reconciled_data[subcategory] = reconcile_subdata
 
-                if not update_books_match:
-                    continue
+        if update_books_match:
+            self.update_json_for("books", books_data)
+
+        self.update_json_for("reconcile", reconciled_data)
 
-                books_values = books_value if is_list else [books_value]
+        if is_changed or subcategory_hashes.keys() != previous_data.keys():
+            self.set_reconciled_subcategories(subcategory_hashes, reconciled_data)
 
-                # Update each row in Books Data
-                for row in books_values:
-                    if row.get("upload_status") == "Missing in Books":
-                        continue
+        return reconciled_data
 
-                    if not gov_value:
-                        row["upload_status"] = "Not Uploaded"
-                        continue
+    @staticmethod
+    def get_reconciled_subdata(books_subdata, gov_subdata):
+        """
+        Rows that differ between Books and Gov Data, looked up by row key
+        (invoice number, HSN-UOM-rate, POS-rate, etc.)
+        """
+        reconcile_subdata = {}
 
-                    if reconcile_row:
-                        row["upload_status"] = "Mismatch"
-                    else:
-                        row["upload_status"] = "Uploaded"
+        # Books vs Gov
+        for key, books_value in books_subdata.items():
+            reconcile_row = ReconcileGSTR1.get_reconciled_row(
+                books_value, gov_subdata.get(key)
+            )
 
-            # In Gov but not in Books
-            for key, gov_value in gov_subdata.items():
-                if key in books_subdata:
-                    continue
+            if reconcile_row:
+                reconcile_subdata[key] = reconcile_row
+
+        # In Gov but not in Books
+        for key, gov_value in gov_subdata.items():
+            if key in books_subdata:
+                continue
+
+            reconcile_subdata[key] = ReconcileGSTR1.get_reconciled_row(None, gov_value)
+
+        return reconcile_subdata
+
+    @staticmethod
+    def update_upload_status(books_subdata, gov_subdata, reconcile_subdata):
+        """
+        Update Upload Status for each row in Books Data
+        and add rows missing in Books Data
+        """
+        first_value = next(iter(books_subdata.values() or gov_subdata.values()), None)
+        is_list = isinstance(first_value, list)
 
-                if not reconcile_subdata:
-                    is_list = isinstance(gov_value, list)
+        for key, books_value in books_subdata.items():
+            gov_value = gov_subdata.get(key)
+            books_values = books_value if is_list else [books_value]
 
-                reconcile_subdata[key] = self.get_reconciled_row(None, gov_value)
+            for row in books_values:
+                if row.get("upload_status") == "Missing in Books":
+                    continue
 
-                if not update_books_match:
+                if not gov_value:
+                    row["upload_status"] = "Not Uploaded"
                     continue
 
-                books_empty_row = self.get_empty_row(
-                    gov_value[0] if is_list else gov_value
-                )
-                books_empty_row["upload_status"] = "Missing in Books"
+                if key in reconcile_subdata:
+                    row["upload_status"] = "Mismatch"
+                else:
+                    row["upload_status"] = "Uploaded"
 
-                books_subdata[key] = [books_empty_row] if is_list else books_empty_row
+        for key, gov_value in gov_subdata.items():
+            if key in books_subdata:
+                continue
 
-            if update_books_match and not books_data.get(subcategory):
-                books_data[subcategory] = books_subdata
+            books_empty_row = ReconcileGSTR1.get_empty_row(
+                gov_value[0] if is_list else gov_value
+            )
+            books_empty_row["upload_status"] = "Missing in Books"
 
-            if reconcile_subdata:
-                reconciled_data[subcategory] = reconcile_subdata
+            books_subdata[key] = [books_empty_row] if is_list else books_empty_row
 
-        if update_books_match:
-            self.update_json_for("books", books_data)
+    def get_reconciled_subcategories(self):
+        """
+        Previously reconciled data for each subcategory,
+        with hash of the data it was reconciled from
 
-        self.update_json_for("reconcile", reconciled_data)
+        Unlike the reconcile file, this is kept when Books or Gov data changes.
+        """
+        data = self.get_json_for("reconciled_subcategories") or {}
+        data.pop("creation", None)
 
-        return reconciled_data
+        return data
+
+    def set_reconciled_subcategories(self, subcategory_hashes, reconciled_data):
+        self.update_json_for(
+            "reconciled_subcategories",
+            {
+                subcategory: (data_hash, reconciled_data.get(subcategory) or {})
+                for subcategory, data_hash in subcategory_hashes.items()
+            },
+        )
 
     @staticmethod
     def get_reconciled_row(books_row, gov_row):
@@ -317,19 +376,29 @@ class ReconcileGSTR1:
 
         # Get Empty Row
         if is_list:
-            reconcile_row = ReconcileGSTR1.get_empty_row(
-                gov_row[0] if gov_row else books_row[0], ReconcileGSTR1.UNREQUIRED_KEYS
-            )
+            row = gov_row[0] if gov_row else books_row[0]
+            unrequired_keys = ReconcileGSTR1.UNREQUIRED_KEYS
             gov_row = gov_row[0] if gov_row else {}
             books_row = (
                 AggregateInvoices.get_aggregate_invoices(books_row) if books_row else {}
             )
 
         else:
-            reconcile_row = ReconcileGSTR1.get_empty_row(gov_row or books_row)
+            row = gov_row or books_row
+            unrequired_keys = None
             gov_row = gov_row or {}
             books_row = books_row or {}
 
+        # most rows match, compare before building the reconciled row
+        if (
+            gov_row
+            and books_row
+            and ReconcileGSTR1.is_matched(books_row, gov_row, row, unrequired_keys)
+        ):
+            return
+
+        reconcile_row = ReconcileGSTR1.get_empty_row(row, unrequired_keys)
+
         # Default Status
         reconcile_row["match_status"] = "Matched"
         reconcile_row["differences"] = []
@@ -378,6 +447,26 @@ class ReconcileGSTR1:
 
         return reconcile_row
 
+    @staticmethod
+    def is_matched(books_row, gov_row, row, unrequired_keys=None):
+        """
+        Same comparison as `get_reconciled_row`, for keys of the given row
+        """
+        for key, value in row.items():
+            if (
+                isinstance(value, (int, float))
+                and key not in AggregateInvoices.IGNORED_FIELDS
+                and not (unrequired_keys and key in unrequired_keys)
+            ):
+                if flt((books_row.get(key) or 0) - (gov_row.get(key) or 0), 2) != 0:
+                    return False
+
+            elif key in ("customer_gstin", "place_of_supply"):
+                if books_row.get(key) != gov_row.get(key):
+                    return False
+
+        return True
+
     @staticmethod
     def get_empty_row(row: dict, unrequired_keys=None):
         """
@@ -590,14 +679,73 @@ class GenerateGSTR1(SummarizeGSTR1, ReconcileGSTR1, AggregateInvoices):
         )
 
         # compute data
-        books_data = GSTR1BooksData(_filters).prepare_mapped_data()
+        changes = self.get("changed_documents") or []
+        books_data = self.get_incremental_books_data(_filters, changes)
+
+        if books_data is None:
+            books_data = GSTR1BooksData(_filters).prepare_mapped_data()
+
         if aggregate:
             books_data.update({"aggregate_data": self.get_aggregate_data(books_data)})
 
         self.update_json_for(data_field, books_data, reset_reconcile=True)
+        self.clear_changed_documents(changes)
 
         return books_data
 
+    def get_incremental_books_data(self, filters, changes):
+        """
+        Update existing books data for changed documents only.
+        Returns None if books data needs to be computed afresh.
+        """
+        if not self.get("books") or not changes:
+            return
+
+        invoice_names = {
+            row.document_name for row in changes if row.document_type == "Sales Invoice"
+        }
+
+        if len(invoice_names) > MAX_INCREMENTAL_CHANGES:
+            return
+
+        if not (books_data := self.get_json_for("books")):
+            return
+
+        self.remove_reconciled_details(books_data)
+
+        return GSTR1BooksData(filters).update_mapped_data(books_data, invoice_names)
+
+    @staticmethod
+    def remove_reconciled_details(books_data):
+        """
+        Remove details added to books data after it was computed
+        """
+        books_data.pop("creation", None)
+        books_data.pop("aggregate_data", None)
+
+        for subcategory, subcategory_data in list(books_data.items()):
+            for key, value in list(subcategory_data.items()):
+                rows = value if isinstance(value, list) else [value]
+
+                if all(row.get("upload_status") == "Missing in Books" for row in rows):
+                    del subcategory_data[key]
+                    continue
+
+                for row in rows:
+                    row.pop("upload_status", None)
+
+            if not subcategory_data:
+                del books_data[subcategory]
+
+    def clear_changed_documents(self, changes):
+        if not changes:
+            return
+
+        frappe.db.delete(
+            "GST Return Log Change", {"name": ("in", [row.name for row in changes])}
+        )
+        self.set("changed_documents", [])
+
     # DATA MODIFIERS
     def summarize_data(self, data):
         """
@@ -659,3 +807,10 @@ class GenerateGSTR1(SummarizeGSTR1, ReconcileGSTR1, AggregateInvoices):
                 data[subcategory] = [*subcategory_data.values()]
 
         return data
+
+
+def get_data_hash(*data):
+    """
+    Hash of data, to know if it is unchanged (same values in the same order)
+    """
+    return hashlib.sha256(pickle.dumps(data, protocol=5)).hexdigest()
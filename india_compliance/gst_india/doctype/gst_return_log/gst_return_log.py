@@ -2,6 +2,7 @@
 # For license information, please see license.txt
 
 import gzip
+import json
 from datetime import datetime
 
 import frappe
@@ -21,6 +22,9 @@ from india_compliance.gst_india.doctype.gst_return_log.generate_gstr_1 import (
 from india_compliance.gst_india.utils import is_production_api_enabled
 
 DOCTYPE = "GST Return Log"
+CHANGE_DOCTYPE = "GST Return Log Change"
+SEGMENTED_FILE_HEADER = b"ICSEG1"
+SEGMENTED_FILE_EXTENSION = ".icseg"
 
 
 class GSTReturnLog(GenerateGSTR1, Document):
@@ -32,7 +36,10 @@ class GSTReturnLog(GenerateGSTR1, Document):
         self.db_set("generation_status", status, commit=commit)
 
     # FILE UTILITY
-    def load_data(self, file_field=None):
+    def load_data(self, file_field=None, subcategories=None):
+        """
+        :param subcategories: load only these keys (subcategories) of the data
+        """
         data = {}
 
         if file_field:
@@ -41,7 +48,9 @@ class GSTReturnLog(GenerateGSTR1, Document):
             file_fields = self.get_applicable_file_fields()
 
         for file_field in file_fields:
-            if json_data := self.get_json_for(file_field):
+            # data is empty if none of the subcategories are in the file
+            json_data = self.get_json_for(file_field, subcategories)
+            if json_data is not None:
                 if "summary" not in file_field:
                     json_data = self.normalize_data(json_data)
 
@@ -49,10 +58,25 @@ class GSTReturnLog(GenerateGSTR1, Document):
 
         return data
 
-    def get_json_for(self, file_field):
+    def get_json_for(self, file_field, subcategories=None):
+        """
+        Data is stored segmented by subcategory (key).
+        Only segments for the given subcategories are decompressed and parsed.
+        """
         try:
             if file := get_file_doc(self.doctype, self.name, file_field):
-                return get_decompressed_data(file.get_content(encodings=[]))
+                content = file.get_content(encodings=[])
+
+                if not is_segmented(content):
+                    return get_decompressed_data(content)
+
+                segments = get_segments(content, subcategories)
+                return frappe._dict(
+                    {
+                        key: get_decompressed_data(segment)
+                        for key, segment in segments.items()
+                    }
+                )
 
         except FileNotFoundError:
             # say File not restored
@@ -70,37 +94,44 @@ class GSTReturnLog(GenerateGSTR1, Document):
             if reset_reconcile:
                 self.remove_json_for("reconcile")
 
+        file = self.get(file_field) and get_file_doc(
+            self.doctype, self.name, file_field
+        )
+
+        if file and not overwrite:
+            # only updated segments are compressed again
+            segments = get_segments(file.get_content(encodings=[]))
+            segments.update(get_compressed_segments(json_data))
+            content = get_segmented_content(segments)
+
+        else:
+            content = get_file_content(json_data)
+
+        # segmented content is not a valid gzip file, hence different extension
+        if file and is_segmented(content) != file.file_name.endswith(
+            SEGMENTED_FILE_EXTENSION
+        ):
+            file.delete()
+            file = None
+
         # new file
-        if not getattr(self, file_field):
-            content = get_compressed_data(json_data)
-            file_name = frappe.scrub("{0}-{1}.json.gz".format(self.name, file_field))
+        if not file:
             file = frappe.get_doc(
                 {
                     "doctype": "File",
                     "attached_to_doctype": self.doctype,
                     "attached_to_name": self.name,
                     "attached_to_field": file_field,
-                    "file_name": file_name,
+                    "file_name": get_file_name(self.name, file_field, content),
                     "is_private": 1,
                     "content": content,
                 }
             ).insert()
-            self.db_set(file_field, file.file_url)
-            return
 
         # existing file
-        file = get_file_doc(self.doctype, self.name, file_field)
-
-        if overwrite:
-            new_json = json_data
-
         else:
-            new_json = get_decompressed_data(file.get_content(encodings=[]))
-            new_json.update(json_data)
-
-        content = get_compressed_data(new_json)
+            file.save_file(content=content, overwrite=True)
 
-        file.save_file(content=content, overwrite=True)
         self.db_set(file_field, file.file_url)
 
     def remove_json_for(self, file_field):
@@ -276,12 +307,14 @@ def add_comment_to_gst_return_log(doc, action):
     )
 
 
-def update_is_not_latest_gstr1_data(posting_date, company_gstin):
+def update_is_not_latest_gstr1_data(posting_date, company_gstin, doc=None):
     period = posting_date.strftime("%m%Y")
+    log_name = f"GSTR1-{period}-{company_gstin}"
 
-    frappe.db.set_value(
-        "GST Return Log", f"GSTR1-{period}-{company_gstin}", "is_latest_data", 0
-    )
+    if doc:
+        track_gstr1_data_change(log_name, doc)
+
+    frappe.db.set_value("GST Return Log", log_name, "is_latest_data", 0)
 
     frappe.publish_realtime(
         "is_not_latest_data",
@@ -290,6 +323,38 @@ def update_is_not_latest_gstr1_data(posting_date, company_gstin):
     )
 
 
+def track_gstr1_data_change(log_name, doc):
+    """
+    Records the changed document, so that only its rows are updated in Books Data.
+
+    Changes are tracked only when all of them since Books Data was computed
+    are known (i.e. data was latest on first change).
+    Otherwise, Books Data is computed afresh.
+    """
+    log = frappe.db.get_value(
+        DOCTYPE, log_name, ("books", "is_latest_data"), as_dict=True
+    )
+
+    if not log or not log.books:
+        return
+
+    if not log.is_latest_data and not frappe.db.exists(
+        CHANGE_DOCTYPE, {"parent": log_name, "parenttype": DOCTYPE}
+    ):
+        return
+
+    frappe.get_doc(
+        {
+            "doctype": CHANGE_DOCTYPE,
+            "parent": log_name,
+            "parenttype": DOCTYPE,
+            "parentfield": "changed_documents",
+            "document_type": doc.doctype,
+            "document_name": doc.name,
+        }
+    ).db_insert()
+
+
 def get_file_doc(doctype, docname, attached_to_field):
     try:
         return frappe.get_doc(
@@ -305,9 +370,81 @@ def get_file_doc(doctype, docname, attached_to_field):
         return None
 
 
+def get_file_name(docname, file_field, content):
+    extension = SEGMENTED_FILE_EXTENSION if is_segmented(content) else ".json.gz"
+    return frappe.scrub(f"{docname}-{file_field}") + extension
+
+
 def get_compressed_data(json_data):
     return gzip.compress(frappe.safe_encode(frappe.as_json(json_data)))
 
 
 def get_decompressed_data(content):
     return frappe.parse_json(frappe.safe_decode(gzip.decompress(content)))
+
+
+def get_file_content(json_data):
+    """
+    Objects are stored as separately compressed segments for each key,
+    preceded by an index of their positions:
+
+    HEADER | index length (4 bytes) | index (JSON) | segment 1 | segment 2 | ...
+
+    Other data (e.g. summary) is stored as compressed JSON.
+    """
+    if not isinstance(json_data, dict):
+        return get_compressed_data(json_data)
+
+    return get_segmented_content(get_compressed_segments(json_data))
+
+
+def get_compressed_segments(json_data):
+    return {key: get_compressed_data(value) for key, value in json_data.items()}
+
+
+def get_segmented_content(segments):
+    index = {}
+    offset = 0
+
+    for key, segment in segments.items():
+        index[key] = (offset, len(segment))
+        offset += len(segment)
+
+    index = frappe.safe_encode(json.dumps(index))
+
+    return b"".join(
+        (
+            SEGMENTED_FILE_HEADER,
+            len(index).to_bytes(4, "big"),
+            index,
+            *segments.values(),
+        )
+    )
+
+
+def get_segments(content, keys=None):
+    """
+    Returns compressed segments from file content, without decompressing them.
+    Content compressed as a whole (before segmentation) is segmented.
+    """
+    if not is_segmented(content):
+        return get_compressed_segments(get_decompressed_data(content))
+
+    start = len(SEGMENTED_FILE_HEADER)
+    index_length = int.from_bytes(content[start : start + 4], "big")
+
+    start += 4
+    index = json.loads(content[start : start + index_length])
+
+    start += index_length
+    content = memoryview(content)
+
+    return {
+        key: content[start + offset : start + offset + length]
+        for key, (offset, length) in index.items()
+        if keys is None or key in keys
+    }
+
+
+def is_segmented(content):
+    return content.startswith(SEGMENTED_FILE_HEADER)
@@ -1,9 +1,269 @@
 # Copyright (c) 2024, Resilient Tech and Contributors
 # See license.txt
 
-# import frappe
+import copy
+import gzip
+from unittest.mock import patch
+
+import frappe
 from frappe.tests import IntegrationTestCase
+from frappe.utils import get_first_day, get_last_day, getdate
+
+from india_compliance.gst_india.doctype.gst_return_log.generate_gstr_1 import (
+    GenerateGSTR1,
+)
+from india_compliance.gst_india.doctype.gst_return_log.gst_return_log import (
+    get_compressed_data,
+    get_compressed_segments,
+    get_decompressed_data,
+    get_file_content,
+    get_file_name,
+    get_segmented_content,
+    get_segments,
+)
+from india_compliance.gst_india.utils.gstr_1.gstr_1_json_map import GSTR1BooksData
+from india_compliance.gst_india.utils.tests import create_sales_invoice
 
 
 class TestGSTReturnLog(IntegrationTestCase):
-    pass
+    def test_incremental_books_data(self):
+        books_data = {
+            "creation": "2024-07-31 10:00:00",
+            "aggregate_data": {},
+            "B2B Regular": {
+                "SINV-0001": {
+                    "document_number": "SINV-0001",
+                    "upload_status": "Uploaded",
+                },
+                "SINV-0002": {
+                    "document_number": "SINV-0002",
+                    "upload_status": "Mismatch",
+                },
+                "SINV-0003": {
+                    "document_number": "SINV-0003",
+                    "upload_status": "Missing in Books",
+                },
+            },
+            "B2C (Others)": {
+                "29-Karnataka - 18.0": [
+                    {"document_number": "SINV-0004"},
+                    {"document_number": "SINV-0005"},
+                ],
+                "29-Karnataka - 5.0": [{"document_number": "SINV-0004"}],
+            },
+            "HSN Summary": {
+                "1001 - NOS-NUMBERS - 18.0": {"hsn_code": "1001"},
+            },
+        }
+
+        GenerateGSTR1.remove_reconciled_details(books_data)
+        GSTR1BooksData(frappe._dict()).remove_invoices(
+            books_data, {"SINV-0002", "SINV-0004"}
+        )
+
+        self.assertDictEqual(
+            books_data,
+            {
+                "B2B Regular": {"SINV-0001": {"document_number": "SINV-0001"}},
+                "B2C (Others)": {
+                    "29-Karnataka - 18.0": [{"document_number": "SINV-0005"}],
+                },
+                # aggregated across invoices, prepared afresh
+                "HSN Summary": {
+                    "1001 - NOS-NUMBERS - 18.0": {"hsn_code": "1001"},
+                },
+            },
+        )
+
+    def test_incremental_books_data_for_changed_invoices(self):
+        company_gstin = "24AAQCA8719H1ZC"
+        filters = {
+            "company": "_Test Indian Registered Company",
+            "company_gstin": company_gstin,
+            "from_date": get_first_day(getdate()),
+            "to_date": get_last_day(getdate()),
+        }
+
+        invoices = [
+            create_sales_invoice(is_in_state=True),
+            create_sales_invoice(is_in_state=True),
+            create_sales_invoice(
+                customer="_Test Unregistered Customer", is_in_state=True
+            ),
+        ]
+
+        log_name = f"GSTR1-{getdate().strftime('%m%Y')}-{company_gstin}"
+        if frappe.db.exists("GST Return Log", log_name):
+            log = frappe.get_doc("GST Return Log", log_name)
+        else:
+            log = frappe.new_doc(
+                "GST Return Log",
+                return_period=getdate().strftime("%m%Y"),
+                gstin=company_gstin,
+                return_type="GSTR1",
+            )
+            log.save()
+
+        log.update_json_for(
+            "books", GSTR1BooksData(frappe._dict(filters)).prepare_mapped_data()
+        )
+
+        # change, cancel and add invoices after books data is computed
+        frappe.db.set_value(
+            "Sales Invoice", invoices[0].name, "customer_name", "_Test Changed Customer"
+        )
+        invoices[1].cancel()
+        invoices.extend(
+            (
+                create_sales_invoice(is_in_state=True),
+                create_sales_invoice(
+                    customer="_Test Unregistered Customer", is_in_state=True
+                ),
+            )
+        )
+
+        changes = [
+            frappe._dict(document_type="Sales Invoice", document_name=invoice.name)
+            for invoice in invoices
+        ]
+        incremental_data = log.get_incremental_books_data(
+            frappe._dict(filters), changes
+        )
+        self.assertIsNotNone(incremental_data)
+
+        # same as books data computed afresh (compared as saved to file)
+        full_data = GSTR1BooksData(frappe._dict(filters)).prepare_mapped_data()
+        self.assertDictEqual(
+            frappe.parse_json(frappe.as_json(incremental_data)),
+            frappe.parse_json(frappe.as_json(full_data)),
+        )
+
+    def test_segmented_file_content(self):
+        data = {
+            "creation": "2024-07-31 10:00:00",
+            "B2B Regular": {"SINV-0001": {"document_number": "SINV-0001"}},
+            "HSN Summary": {"1001 - NOS-NUMBERS - 18.0": {"hsn_code": "1001"}},
+        }
+
+        def decompress(segments):
+            return {
+                key: get_decompressed_data(segment) for key, segment in segments.items()
+            }
+
+        content = get_file_content(data)
+        self.assertDictEqual(decompress(get_segments(content)), data)
+        self.assertDictEqual(
+            decompress(get_segments(content, {"HSN Summary"})),
+            {"HSN Summary": data["HSN Summary"]},
+        )
+
+        # patch a segment
+        segments = get_segments(content)
+        segments.update(get_compressed_segments({"B2B Regular": {}}))
+        self.assertDictEqual(
+            decompress(get_segments(get_segmented_content(segments))),
+            {**data, "B2B Regular": {}},
+        )
+
+        # data compressed as a whole
+        self.assertDictEqual(decompress(get_segments(get_compressed_data(data))), data)
+
+    def test_file_name_for_content(self):
+        name = "GSTR1-072024-24AAQCA8719H1ZC"
+
+        # segmented data is not gzip
+        content = get_file_content({"B2B Regular": {}})
+        self.assertTrue(get_file_name(name, "books", content).endswith(".icseg"))
+
+        content = get_file_content([{"description": "B2B, SEZ, DE"}])
+        self.assertTrue(
+            get_file_name(name, "books_summary", content).endswith(".json.gz")
+        )
+        self.assertTrue(gzip.decompress(content))
+
+    def test_reconciled_subdata(self):
+        def get_row(document_number, taxable_value):
+            return {
+                "document_number": document_number,
+                "customer_gstin": "24AANFA2641L1ZF",
+                "place_of_supply": "24-Gujarat",
+                "total_taxable_value": taxable_value,
+            }
+
+        books_subdata = {
+            "SINV-0001": get_row("SINV-0001", 100),
+            "SINV-0002": get_row("SINV-0002", 200),
+            "SINV-0003": get_row("SINV-0003", 300),
+        }
+        gov_subdata = {
+            "SINV-0001": get_row("SINV-0001", 100),
+            "SINV-0002": get_row("SINV-0002", 250),
+            "SINV-0004": get_row("SINV-0004", 400),
+        }
+
+        reconcile_subdata = GenerateGSTR1.get_reconciled_subdata(
+            books_subdata, gov_subdata
+        )
+
+        # only differing rows
+        self.assertDictEqual(
+            {
+                key: (row["match_status"], row["total_taxable_value"])
+                for key, row in reconcile_subdata.items()
+            },
+            {
+                "SINV-0002": ("Mismatch", -50),
+                "SINV-0003": ("Missing in GSTR-1", 300),
+                "SINV-0004": ("Missing in Books", -400),
+            },
+        )
+
+        GenerateGSTR1.update_upload_status(
+            books_subdata, gov_subdata, reconcile_subdata
+        )
+
+        self.assertDictEqual(
+            {key: row["upload_status"] for key, row in books_subdata.items()},
+            {
+                "SINV-0001": "Uploaded",
+                "SINV-0002": "Mismatch",
+                "SINV-0003": "Not Uploaded",
+                "SINV-0004": "Missing in Books",
+            },
+        )
+
+    def test_reconciled_subcategories_kept_after_reset(self):
+        log = frappe.new_doc(
+            "GST Return Log",
+            return_period="032020",
+            gstin="24AAQCA8719H1ZC",
+            return_type="GSTR1",
+        )
+        log.save()
+
+        row = {
+            "document_number": "SINV-0001",
+            "customer_gstin": "24AANFA2641L1ZF",
+            "place_of_supply": "24-Gujarat",
+            "total_taxable_value": 100,
+        }
+        books_data = {"B2B Regular": {"SINV-0001": row}}
+        gov_data = {"B2B Regular": {"SINV-0001": {**row, "total_taxable_value": 150}}}
+
+        log.get_reconcile_gstr1_data(copy.deepcopy(gov_data), copy.deepcopy(books_data))
+
+        # reconcile file is removed when books data is computed again
+        log.update_json_for("books", copy.deepcopy(books_data), reset_reconcile=True)
+        self.assertFalse(log.reconcile)
+
+        with patch.object(GenerateGSTR1, "get_reconciled_subdata") as mock_reconcile:
+            reconciled_data = log.get_reconcile_gstr1_data(gov_data, books_data)
+
+        # unchanged subcategory is not reconciled again
+        mock_reconcile.assert_not_called()
+        self.assertEqual(
+            reconciled_data["B2B Regular"]["SINV-0001"]["match_status"], "Mismatch"
+        )
+        self.assertEqual(
+            books_data["B2B Regular"]["SINV-0001"]["upload_status"], "Mismatch"
+        )
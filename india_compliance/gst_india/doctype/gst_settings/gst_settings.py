@@ -533,7 +533,7 @@ def restrict_gstr_1_transaction_for(doc, gst_settings=None, action="submit"):
         return gstr_1_filed_upto
 
     # postprocess
-    update_is_not_latest_gstr1_data(posting_date, doc.company_gstin)
+    update_is_not_latest_gstr1_data(posting_date, doc.company_gstin, doc)
 
     if posting_date <= getdate(gstr_1_filed_upto):
         add_comment_to_gst_return_log(doc, action)
@@ -4,9 +4,14 @@
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import date_diff, format_date, get_datetime
+from frappe.utils import add_days, cint, date_diff, format_date, get_datetime
 
 from india_compliance.gst_india.utils import is_api_enabled, validate_gstin_check_digit
+from india_compliance.gst_india.utils.concurrency import (
+    MAX_WORKERS,
+    RateLimiter,
+    iter_concurrently,
+)
 from india_compliance.gst_india.utils.gstin_info import (
     fetch_gstin_status,
     fetch_transporter_id_status,
@@ -22,6 +27,19 @@ GSTIN_STATUS = {
 
 GSTIN_BLOCK_STATUS = {"U": 0, "B": 1}
 
+# cached for validating GSTIN status of transactions
+GSTIN_STATUS_FIELDS = (
+    "gstin",
+    "status",
+    "registration_date",
+    "cancelled_date",
+    "last_updated_on",
+)
+
+# scheduled refresh of stale GSTIN statuses
+GSTINS_PER_REFRESH = 500
+GSTIN_REFRESH_RATE = 4  # API calls per second, across workers
+
 
 class GSTIN(Document):
     def before_save(self):
@@ -32,6 +50,12 @@ class GSTIN(Document):
         if not self.cancelled_date and self.status == "Cancelled":
             self.cancelled_date = self.registration_date
 
+    def on_update(self):
+        clear_gstin_status_cache(self.gstin)
+
+    def on_trash(self):
+        clear_gstin_status_cache(self.gstin)
+
     @frappe.whitelist()
     def update_gstin_status(self):
         """
@@ -100,24 +124,82 @@ def get_and_validate_gstin_status(gstin, transaction_date):
         return
 
     if not is_status_refresh_required(gstin, transaction_date):
-        if not frappe.db.exists("GSTIN", gstin):
-            return
-
-        doc = frappe.get_doc("GSTIN", gstin)
-        validate_gstin_status(doc, transaction_date, throw=True)
+        if details := get_gstin_status_details(gstin):
+            validate_gstin_status(details, transaction_date, throw=True)
 
     else:
         # Don't delay the response if API is required
+        enqueue_gstin_status_refresh(gstin, transaction_date)
+
+
+def enqueue_gstin_status_refresh(gstin, transaction_date):
+    """
+    Status of a GSTIN is refreshed once (after commit) for all transactions
+    validated in the request, eg: bulk submission of invoices
+    """
+    if frappe.flags.gstin_status_refresh_queue is None:
+        frappe.flags.gstin_status_refresh_queue = {}
+        frappe.db.after_commit.add(enqueue_queued_gstin_status_refresh)
+        frappe.db.after_rollback.add(
+            lambda: frappe.flags.pop("gstin_status_refresh_queue", None)
+        )
+
+    transaction_dates = frappe.flags.gstin_status_refresh_queue.setdefault(gstin, set())
+    transaction_dates.add(transaction_date)
+
+
+def enqueue_queued_gstin_status_refresh():
+    """
+    Transaction dates are queued in cache for the GSTIN, and are validated by
+    the refresh job. Hence dates are not lost where a job is already queued.
+    """
+    queue = frappe.flags.pop("gstin_status_refresh_queue", None) or {}
+
+    for gstin, transaction_dates in queue.items():
+        if transaction_dates := [str(date) for date in transaction_dates if date]:
+            frappe.cache.sadd(get_gstin_status_refresh_key(gstin), *transaction_dates)
+
         frappe.enqueue(
-            create_or_update_gstin_status,
-            enqueue_after_commit=True,
+            refresh_gstin_status,
             queue="short",
+            # skip if already queued by another request
+            job_id=f"refresh_gstin_status:{gstin}",
+            deduplicate=True,
             gstin=gstin,
-            transaction_date=transaction_date,
-            callback=validate_gstin_status,
         )
 
 
+def refresh_gstin_status(gstin, transaction_dates=None):
+    doc = create_or_update_gstin_status(gstin)
+    if not doc:
+        # dates are validated by the next refresh
+        return
+
+    # transactions validated after this use the updated status
+    frappe.db.commit()  # nosemgrep
+
+    # passed by jobs enqueued before dates were queued in cache
+    for transaction_date in transaction_dates or ():
+        validate_gstin_status(doc, transaction_date)
+
+    # including dates queued while validating
+    while transaction_dates := pop_queued_transaction_dates(gstin):
+        for transaction_date in transaction_dates:
+            validate_gstin_status(doc, transaction_date)
+
+
+def pop_queued_transaction_dates(gstin):
+    key = get_gstin_status_refresh_key(gstin)
+    if transaction_dates := frappe.cache.smembers(key):
+        frappe.cache.srem(key, *transaction_dates)
+
+    return {frappe.safe_decode(date) for date in transaction_dates}
+
+
+def get_gstin_status_refresh_key(gstin):
+    return f"gstin_status_refresh_dates:{gstin}"
+
+
 @frappe.whitelist()
 def get_gstin_status(gstin, transaction_date=None, force_update=False):
     """
@@ -128,7 +210,7 @@ def get_gstin_status(gstin, transaction_date=None, force_update=False):
         return
 
     if not force_update and not is_status_refresh_required(gstin, transaction_date):
-        if not frappe.db.exists("GSTIN", gstin):
+        if not get_gstin_status_details(gstin):
             return
 
         return frappe.get_doc("GSTIN", gstin)
@@ -195,9 +277,7 @@ def is_status_refresh_required(gstin, transaction_date):
     ):
         return
 
-    doc = frappe.db.get_value(
-        "GSTIN", gstin, ["last_updated_on", "status"], as_dict=True
-    )
+    doc = get_gstin_status_details(gstin)
 
     if not doc:
         return True
@@ -212,6 +292,185 @@ def is_status_refresh_required(gstin, transaction_date):
     return days_since_last_update >= settings.gstin_status_refresh_interval
 
 
+def get_gstin_status_details(gstin):
+    """
+    Status details of GSTIN, cached till its status is due for refresh
+    (or till GSTIN is updated)
+    """
+    key = get_gstin_status_cache_key(gstin)
+
+    if details := frappe.cache.get_value(key):
+        return details
+
+    details = frappe.db.get_value("GSTIN", gstin, GSTIN_STATUS_FIELDS, as_dict=True)
+
+    if not details:
+        return
+
+    refresh_interval = frappe.get_cached_value(
+        "GST Settings", None, "gstin_status_refresh_interval"
+    )
+
+    frappe.cache.set_value(
+        key, details, expires_in_sec=max(cint(refresh_interval), 1) * 24 * 60 * 60
+    )
+
+    return details
+
+
+def clear_gstin_status_cache(gstins):
+    """
+    Cleared now, and again after commit (or rollback), since status read
+    by other requests before commit would otherwise stay cached for days
+    """
+    if isinstance(gstins, str):
+        gstins = (gstins,)
+
+    keys = [get_gstin_status_cache_key(gstin) for gstin in gstins]
+    if not keys:
+        return
+
+    def clear_cache():
+        frappe.cache.delete_value(keys)
+
+    clear_cache()
+    frappe.db.after_commit.add(clear_cache)
+    frappe.db.after_rollback.add(clear_cache)
+
+
+def get_gstin_status_cache_key(gstin):
+    return f"gstin_status:{gstin}"
+
+
+### Scheduled GSTIN Status Refresh ###
+
+
+def refresh_stale_gstin_statuses():
+    """
+    Refresh status of GSTINs due for refresh, so that validating transactions
+    rarely needs to refresh it on-demand.
+
+    - Statuses are fetched concurrently, at a limited rate.
+    - Fetched statuses are updated in bulk.
+    """
+    settings = frappe.get_cached_doc("GST Settings")
+
+    if (
+        not settings.validate_gstin_status
+        or not is_api_enabled(settings)
+        or settings.sandbox_mode
+    ):
+        return
+
+    gstins = get_stale_gstins(settings.gstin_status_refresh_interval)
+    if not gstins:
+        return
+
+    rate_limiter = RateLimiter(GSTIN_REFRESH_RATE)
+    chunks = [gstins[i::MAX_WORKERS] for i in range(min(MAX_WORKERS, len(gstins)))]
+    attempted_gstins = []
+    responses = []
+
+    for chunk_attempted_gstins, chunk_responses in iter_concurrently(
+        fetch_gstin_statuses, [(chunk, rate_limiter) for chunk in chunks]
+    ):
+        attempted_gstins.extend(chunk_attempted_gstins)
+        responses.extend(chunk_responses)
+
+    update_gstin_statuses(responses)
+    set_refresh_attempted_on(attempted_gstins)
+
+
+def get_stale_gstins(refresh_interval):
+    # due by the next (daily) run are refreshed early
+    stale_before = add_days(get_datetime(), 1 - cint(refresh_interval))
+    gstin = frappe.qb.DocType("GSTIN")
+
+    return (
+        frappe.qb.from_(gstin)
+        .select(gstin.name)
+        .where(gstin.last_updated_on.isnull() | (gstin.last_updated_on < stale_before))
+        # transporter IDs are refreshed from e-Waybill
+        .where(gstin.name.not_like("88%"))
+        # GSTINs that failed to refresh are retried after others
+        .orderby(gstin.last_refresh_attempted_on)
+        .orderby(gstin.last_updated_on)
+        .limit(GSTINS_PER_REFRESH)
+        .run(pluck=True)
+    )
+
+
+def fetch_gstin_statuses(gstins, rate_limiter):
+    """
+    Returns GSTINs for which status fetch was attempted, and fetched statuses
+    """
+    attempted_gstins = []
+    responses = []
+
+    for gstin in gstins:
+        # retried in the next run
+        if frappe.cache.get_value("gst_server_error"):
+            break
+
+        rate_limiter.wait()
+        attempted_gstins.append(gstin)
+
+        try:
+            response = fetch_gstin_status(gstin=gstin, throw=False)
+
+        except frappe.ValidationError:
+            # invalid GSTIN
+            frappe.clear_last_message()
+            continue
+
+        if response:
+            responses.append(response)
+
+    return attempted_gstins, responses
+
+
+def update_gstin_statuses(responses):
+    """
+    Bulk update of GSTINs with fetched statuses (as done in `GSTIN.before_save`)
+    """
+    if not responses:
+        return
+
+    last_updated_on = get_datetime()
+    doc_updates = {}
+
+    for response in responses:
+        status = GSTIN_STATUS.get(response.status, response.status)
+        cancelled_date = response.cancelled_date
+
+        if not cancelled_date and status == "Cancelled":
+            cancelled_date = response.registration_date
+
+        doc_updates[response.gstin] = {
+            "status": status,
+            "registration_date": response.registration_date,
+            "cancelled_date": cancelled_date,
+            "is_blocked": GSTIN_BLOCK_STATUS.get(response.get("is_blocked"), 0),
+            "last_updated_on": last_updated_on,
+        }
+
+    frappe.db.bulk_update("GSTIN", doc_updates)
+    clear_gstin_status_cache(doc_updates)
+
+
+def set_refresh_attempted_on(gstins):
+    if not gstins:
+        return
+
+    frappe.db.set_value(
+        "GSTIN",
+        {"name": ("in", gstins)},
+        "last_refresh_attempted_on",
+        get_datetime(),
+        update_modified=False,
+    )
+
+
 ### GST Transporter ID Validation ###
 
 
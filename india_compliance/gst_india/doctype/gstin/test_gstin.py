@@ -1,14 +1,29 @@
 # Copyright (c) 2023, Resilient Tech and Contributors
 # See license.txt
+from unittest.mock import patch
+
 import responses
 from responses import matchers
 
 import frappe
 from frappe.tests import IntegrationTestCase, change_settings
 
-from india_compliance.gst_india.doctype.gstin.gstin import validate_gst_transporter_id
+from india_compliance.gst_india.doctype.gstin.gstin import (
+    clear_gstin_status_cache,
+    enqueue_gstin_status_refresh,
+    enqueue_queued_gstin_status_refresh,
+    get_gstin_status_cache_key,
+    get_gstin_status_details,
+    get_gstin_status_refresh_key,
+    get_stale_gstins,
+    refresh_gstin_status,
+    set_refresh_attempted_on,
+    update_gstin_statuses,
+    validate_gst_transporter_id,
+)
 
 TEST_GSTIN = "24AANFA2641L1ZK"
+OTHER_TEST_GSTIN = "29AABCR1718E1ZL"
 
 TRANSPORTER_ID_API_RESPONSE = {
     "success": True,
@@ -33,6 +48,11 @@ class TestGSTIN(IntegrationTestCase):
 
         super().setUpClass()
 
+    def tearDown(self):
+        frappe.db.rollback()
+        clear_gstin_status_cache(TEST_GSTIN)
+        frappe.cache.delete_value(get_gstin_status_refresh_key(TEST_GSTIN))
+
     @responses.activate
     @change_settings("GST Settings", {"validate_gstin_status": 1, "sandbox_mode": 0})
     def test_validate_gst_transporter_id(self):
@@ -40,6 +60,136 @@ class TestGSTIN(IntegrationTestCase):
 
         validate_gst_transporter_id(TEST_GSTIN)
 
+    def test_gstin_status_cache(self):
+        doc = frappe.get_doc(
+            {
+                "doctype": "GSTIN",
+                "gstin": TEST_GSTIN,
+                "status": "Active",
+                "registration_date": "2020-01-01",
+            }
+        ).insert(ignore_permissions=True)
+
+        self.assertEqual(get_gstin_status_details(TEST_GSTIN).status, "Active")
+
+        # served from cache
+        frappe.db.set_value("GSTIN", TEST_GSTIN, "status", "Suspended")
+        self.assertEqual(get_gstin_status_details(TEST_GSTIN).status, "Active")
+
+        # cleared on update
+        doc.reload()
+        doc.save(ignore_permissions=True)
+        self.assertEqual(get_gstin_status_details(TEST_GSTIN).status, "Suspended")
+
+    def test_gstin_status_cache_cleared_after_commit(self):
+        doc = frappe.get_doc(
+            {
+                "doctype": "GSTIN",
+                "gstin": TEST_GSTIN,
+                "status": "Active",
+                "registration_date": "2020-01-01",
+            }
+        ).insert(ignore_permissions=True)
+
+        doc.status = "Suspended"
+        doc.save(ignore_permissions=True)
+
+        # cached by another request before commit
+        frappe.cache.set_value(
+            get_gstin_status_cache_key(TEST_GSTIN), frappe._dict(status="Active")
+        )
+
+        frappe.db.after_commit.run()
+        self.assertEqual(get_gstin_status_details(TEST_GSTIN).status, "Suspended")
+
+    def test_gstin_status_refresh_enqueued_once(self):
+        enqueue_gstin_status_refresh(TEST_GSTIN, "2024-07-01")
+        enqueue_gstin_status_refresh(TEST_GSTIN, "2024-07-02")
+
+        self.assertDictEqual(
+            frappe.flags.gstin_status_refresh_queue,
+            {TEST_GSTIN: {"2024-07-01", "2024-07-02"}},
+        )
+
+    @patch("frappe.enqueue")
+    def test_gstin_status_refresh_dates_merged(self, enqueue):
+        """Dates of a refresh already queued are validated by the same job"""
+        for transaction_date in ("2024-07-01", "2024-07-02"):
+            enqueue_gstin_status_refresh(TEST_GSTIN, transaction_date)
+            enqueue_queued_gstin_status_refresh()
+
+        self.assertEqual(enqueue.call_count, 2)
+        self.assertEqual(
+            enqueue.call_args.kwargs["job_id"], f"refresh_gstin_status:{TEST_GSTIN}"
+        )
+
+        doc = frappe._dict(gstin=TEST_GSTIN)
+        validated_dates = []
+
+        with patch.object(frappe.db, "commit"), patch(
+            "india_compliance.gst_india.doctype.gstin.gstin.create_or_update_gstin_status",
+            return_value=doc,
+        ), patch(
+            "india_compliance.gst_india.doctype.gstin.gstin.validate_gstin_status",
+            side_effect=lambda doc, transaction_date: validated_dates.append(
+                transaction_date
+            ),
+        ):
+            refresh_gstin_status(TEST_GSTIN)
+
+        self.assertListEqual(sorted(validated_dates), ["2024-07-01", "2024-07-02"])
+        self.assertFalse(
+            frappe.cache.smembers(get_gstin_status_refresh_key(TEST_GSTIN))
+        )
+
+    def test_bulk_gstin_status_update(self):
+        frappe.get_doc(
+            {
+                "doctype": "GSTIN",
+                "gstin": TEST_GSTIN,
+                "status": "Active",
+                "registration_date": "2020-01-01",
+            }
+        ).insert(ignore_permissions=True)
+
+        # cached before update
+        get_gstin_status_details(TEST_GSTIN)
+
+        update_gstin_statuses(
+            [
+                frappe._dict(
+                    gstin=TEST_GSTIN,
+                    status="CNL",
+                    registration_date=frappe.utils.getdate("2020-01-01"),
+                    cancelled_date=None,
+                )
+            ]
+        )
+
+        details = get_gstin_status_details(TEST_GSTIN)
+        self.assertEqual(details.status, "Cancelled")
+        self.assertEqual(str(details.cancelled_date), "2020-01-01")
+
+    def test_failed_gstins_refreshed_after_others(self):
+        gstins = (TEST_GSTIN, OTHER_TEST_GSTIN)
+
+        for gstin in gstins:
+            frappe.get_doc(
+                {"doctype": "GSTIN", "gstin": gstin, "status": "Active"}
+            ).insert(ignore_permissions=True)
+
+        frappe.db.set_value(
+            "GSTIN", {"name": ("in", gstins)}, "last_updated_on", "2020-01-01"
+        )
+
+        # failed in previous run
+        set_refresh_attempted_on([TEST_GSTIN])
+
+        stale_gstins = get_stale_gstins(refresh_interval=30)
+        self.assertLess(
+            stale_gstins.index(OTHER_TEST_GSTIN), stale_gstins.index(TEST_GSTIN)
+        )
+
     def mock_get_transporter_details_response(self):
         url = "https://asp.resilient.tech/ewb/Master/GetTransporterDetails"
 
@@ -6,7 +6,7 @@ from datetime import datetime
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.query_builder.functions import Date, Sum
+from frappe.query_builder.functions import Sum
 from frappe.utils import get_last_day, getdate
 
 from india_compliance.gst_india.api_classes.taxpayer_base import (
@@ -191,8 +191,8 @@ def get_net_gst_liability(company, company_gstin, month_or_quarter, year):
         .select(gl_entry.account, (Sum(gl_entry.credit) - Sum(gl_entry.debit)))
         .where(gl_entry.account.isin(list(accounts.values())))
         .where(gl_entry.company == filters.company)
-        .where(Date(gl_entry.posting_date) >= getdate(filters.from_date))
-        .where(Date(gl_entry.posting_date) <= getdate(filters.to_date))
+        .where(gl_entry.posting_date >= getdate(filters.from_date))
+        .where(gl_entry.posting_date <= getdate(filters.to_date))
         .where(gl_entry.company_gstin == filters.company_gstin)
         .groupby(gl_entry.account)
         .run()
@@ -14,6 +14,7 @@ from india_compliance.gst_india.doctype.gstr_1_beta.gstr_1_beta import get_perio
 from india_compliance.gst_india.utils.exporter import ExcelExporter
 from india_compliance.gst_india.utils.gstr_1 import (
     JSON_CATEGORY_EXCEL_CATEGORY_MAPPING,
+    SUB_CATEGORY_GOV_CATEGORY_MAPPING,
     GovExcelField,
     GovExcelSheetName,
     GovJsonKey,
@@ -185,7 +186,7 @@ class GovExcel(DataProcessor):
         return category_wise_data
 
     def build_excel(self, data):
-        excel = ExcelExporter()
+        excel = ExcelExporter(write_only=True)
         for category, cat_data in data.items():
             excel.create_sheet(
                 sheet_name=JSON_CATEGORY_EXCEL_CATEGORY_MAPPING.get(category, category),
@@ -735,6 +736,10 @@ class BooksExcel(DataProcessor):
     PERCENT_FORMAT = "0.00"
     DEFAULT_DATA_FORMAT = {"height": 15}
 
+    # exported in invoices sheet
+    DOCUMENT_CATEGORIES = ("B2B", "EXP", "B2CL", "CDNR", "CDNUR", "B2CS")
+    OTHER_CATEGORIES = ("NIL_EXEMPT", "HSN", "AT", "TXP", "DOC_ISSUE")
+
     def __init__(self, company_gstin, month_or_quarter, year):
         self.company_gstin = company_gstin
         self.month_or_quarter = month_or_quarter
@@ -745,7 +750,12 @@ class BooksExcel(DataProcessor):
             "GST Return Log", f"GSTR1-{self.period}-{company_gstin}"
         )
 
-        self.data = self.process_data(gstr1_log.load_data("books")["books"])
+        subcategories = get_subcategories(
+            self.DOCUMENT_CATEGORIES + self.OTHER_CATEGORIES
+        )
+        self.data = self.process_data(
+            gstr1_log.load_data("books", subcategories)["books"]
+        )
 
     def process_data(self, data):
         category_wise_data = super().process_data(data)
@@ -777,7 +787,7 @@ class BooksExcel(DataProcessor):
         return category_wise_data
 
     def export_data(self):
-        excel = ExcelExporter()
+        excel = ExcelExporter(write_only=True)
         excel.remove_sheet("Sheet")
 
         excel.create_sheet(
@@ -792,7 +802,7 @@ class BooksExcel(DataProcessor):
         excel.export(get_file_name("Books", self.company_gstin, self.period))
 
     def create_other_sheets(self, excel: ExcelExporter):
-        for category in ("NIL_EXEMPT", "HSN", "AT", "TXP", "DOC_ISSUE"):
+        for category in self.OTHER_CATEGORIES:
             data = self.data.get(GovJsonKey[category].value)
 
             if not data:
@@ -808,12 +818,7 @@ class BooksExcel(DataProcessor):
 
     def get_document_data(self):
         taxable_inv_categories = [
-            GovJsonKey.B2B.value,
-            GovJsonKey.EXP.value,
-            GovJsonKey.B2CL.value,
-            GovJsonKey.CDNR.value,
-            GovJsonKey.CDNUR.value,
-            GovJsonKey.B2CS.value,
+            GovJsonKey[category].value for category in self.DOCUMENT_CATEGORIES
         ]
 
         category_data = []
@@ -1135,6 +1140,21 @@ class ReconcileExcel:
     AMOUNT_FORMAT = "#,##0.00"
     DATE_FORMAT = "dd-mmm-yy"
 
+    # exported in separate sheets
+    CATEGORIES = (
+        "B2B",
+        "EXP",
+        "B2CL",
+        "B2CS",
+        "NIL_EXEMPT",
+        "CDNR",
+        "CDNUR",
+        "AT",
+        "TXP",
+        "HSN",
+        "DOC_ISSUE",
+    )
+
     COLOR_PALLATE = frappe._dict(
         {
             "dark_gray": "d9d9d9",
@@ -1162,11 +1182,12 @@ class ReconcileExcel:
         )
 
         self.summary = gstr1_log.load_data("reconcile_summary")["reconcile_summary"]
-        data = gstr1_log.load_data("reconcile")["reconcile"]
+        subcategories = get_subcategories(self.CATEGORIES)
+        data = gstr1_log.load_data("reconcile", subcategories)["reconcile"]
         self.data = get_category_wise_data(data)
 
     def export_data(self):
-        excel = ExcelExporter()
+        excel = ExcelExporter(write_only=True)
         excel.remove_sheet("Sheet")
 
         excel.create_sheet(
@@ -1178,19 +1199,7 @@ class ReconcileExcel:
             add_totals=False,
         )
 
-        for category in (
-            "B2B",
-            "EXP",
-            "B2CL",
-            "B2CS",
-            "NIL_EXEMPT",
-            "CDNR",
-            "CDNUR",
-            "AT",
-            "TXP",
-            "HSN",
-            "DOC_ISSUE",
-        ):
+        for category in self.CATEGORIES:
             self.create_sheet(excel, category)
 
         excel.export(get_file_name("Reconcile", self.company_gstin, self.period))
@@ -2020,6 +2029,19 @@ class ReconcileExcel:
         ]
 
 
+def get_subcategories(categories):
+    """
+    Subcategories (keys of GSTR-1 data) for the given Gov JSON categories
+    """
+    categories = {GovJsonKey[category] for category in categories}
+
+    return {
+        subcategory.value
+        for subcategory, category in SUB_CATEGORY_GOV_CATEGORY_MAPPING.items()
+        if category in categories
+    }
+
+
 @frappe.whitelist()
 def download_filed_as_excel(company_gstin, month_or_quarter, year):
     frappe.has_permission("GSTR-1 Beta", "export", throw=True)
@@ -1,9 +1,34 @@
 # Copyright (c) 2024, Resilient Tech and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests import IntegrationTestCase
 
+from india_compliance.gst_india.doctype.gstr_1_beta.gstr_1_export import (
+    BooksExcel,
+    ReconcileExcel,
+)
+
 
 class TestGSTR1Beta(IntegrationTestCase):
-    pass
+    def test_export_empty_data(self):
+        """Books and reconciled data without any rows (eg: all matched) are exported"""
+        log = frappe.new_doc(
+            "GST Return Log",
+            return_period="022020",
+            gstin="24AAQCA8719H1ZC",
+            return_type="GSTR1",
+        )
+        log.save()
+
+        log.update_json_for("books", {})
+        log.update_json_for("reconcile", {})
+        log.update_json_for("reconcile_summary", [])
+
+        books_excel = BooksExcel("24AAQCA8719H1ZC", "February", "2020")
+        books_excel.export_data()
+        self.assertTrue(frappe.local.response.get("filecontent"))
+
+        reconcile_excel = ReconcileExcel("24AAQCA8719H1ZC", "February", "2020")
+        reconcile_excel.export_data()
+        self.assertTrue(frappe.local.response.get("filecontent"))
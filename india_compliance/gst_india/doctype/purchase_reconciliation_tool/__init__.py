@@ -1,6 +1,7 @@
 # Copyright (c) 2022, Resilient Tech and contributors
 # For license information, please see license.txt
 
+import heapq
 from enum import Enum
 
 from dateutil.rrule import MONTHLY, rrule
@@ -10,7 +11,7 @@ import frappe
 from frappe.query_builder import Case
 from frappe.query_builder.custom import ConstantColumn
 from frappe.query_builder.functions import Abs, IfNull, Sum
-from frappe.utils import add_months, format_date, getdate, rounded
+from frappe.utils import add_months, format_date, getdate, now, rounded
 
 from india_compliance.gst_india.constants import GST_TAX_TYPES
 from india_compliance.gst_india.utils import get_gstin_list, get_party_for_gstin
@@ -245,6 +246,23 @@ PAN_RULES = (
 )
 
 
+# Fields that can be used as blocking keys for candidate generation
+BLOCKING_FIELDS = (
+    Fields.FISCAL_YEAR,
+    Fields.SUPPLIER_GSTIN,
+    Fields.COMPANY_GSTIN,
+    Fields.BILL_NO,
+    Fields.PLACE_OF_SUPPLY,
+    Fields.REVERSE_CHARGE,
+)
+
+# Maximum difference in days between bill dates for fuzzy and residual matches
+BILL_DATE_TOLERANCE = 10
+
+# Number of documents updated per query while saving reconciliation results
+UPDATE_CHUNK_SIZE = 1000
+
+
 class InwardSupply:
     def __init__(self, **kwargs):
         self.__dict__.update(kwargs)
@@ -754,10 +772,22 @@ class BaseReconciliation:
 
 
 class Reconciler(BaseReconciliation):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.bill_no_matcher = BillNoMatcher()
+        self.writer = ReconciliationWriter(
+            kwargs.get("update_chunk_size") or UPDATE_CHUNK_SIZE
+        )
+
     def reconcile(self, category, amended_category):
         """
         Reconcile purchases and inward supplies for given category.
+        Results are saved in bulk once all rules are applied.
         """
+        self._reconcile(category, amended_category)
+        self.writer.flush()
+
+    def _reconcile(self, category, amended_category):
         # GSTIN Level matching
         purchases = self.get_unmatched_purchase_or_bill_of_entry(category)
         inward_supplies = self.get_unmatched_inward_supply(category, amended_category)
@@ -792,20 +822,32 @@ class Reconciler(BaseReconciliation):
         """
 
         matching_purchases = {}
+        is_fuzzy_rule = rules.get(Fields.BILL_NO) == Rule.FUZZY_MATCH
+
         for supplier_gstin in purchases:
             if not inward_supplies.get(supplier_gstin):
                 continue
 
+            candidate_index = CandidateIndex(
+                inward_supplies[supplier_gstin], match_status, rules
+            )
+
             for purchase_invoice_name, purchase in (
                 purchases[supplier_gstin].copy().items()
             ):
-                for inward_supply_name, inward_supply in (
-                    inward_supplies[supplier_gstin].copy().items()
-                ):
+                candidates = candidate_index.get_candidates(purchase)
+
+                if is_fuzzy_rule:
+                    candidates = list(candidates)
+                    self.bill_no_matcher.prefetch(
+                        purchase, [inward_supply for _, inward_supply in candidates]
+                    )
+
+                for inward_supply_name, inward_supply in candidates:
                     if match_status == "Residual Match":
                         if (
                             abs((purchase.bill_date - inward_supply.bill_date).days)
-                            > 10
+                            > BILL_DATE_TOLERANCE
                         ):
                             continue
 
@@ -872,27 +914,16 @@ class Reconciler(BaseReconciliation):
         if not purchase.bill_no or not inward_supply.bill_no:
             return False
 
-        if abs((purchase.bill_date - inward_supply.bill_date).days) > 10:
+        if (
+            abs((purchase.bill_date - inward_supply.bill_date).days)
+            > BILL_DATE_TOLERANCE
+        ):
             return False
 
-        if not purchase._bill_no:
-            purchase._bill_no = BaseUtil.get_cleaner_bill_no(
-                purchase.bill_no, purchase.fy
-            )
+        BaseUtil.set_cleaner_bill_no(purchase)
+        BaseUtil.set_cleaner_bill_no(inward_supply)
 
-        if not inward_supply._bill_no:
-            inward_supply._bill_no = BaseUtil.get_cleaner_bill_no(
-                inward_supply.bill_no, inward_supply.fy
-            )
-
-        partial_ratio = fuzz.partial_ratio(purchase._bill_no, inward_supply._bill_no)
-        if float(partial_ratio) == 100:
-            return True
-
-        return (
-            float(process.extractOne(purchase._bill_no, [inward_supply._bill_no])[1])
-            >= 90.0
-        )
+        return self.bill_no_matcher.is_match(purchase, inward_supply)
 
     def get_amount_difference(self, purchase, inward_supply, field):
         if field == "cess":
@@ -912,14 +943,13 @@ class Reconciler(BaseReconciliation):
         if match_status == "Residual Match":
             match_status = "Mismatch"
 
-        inward_supply_fields = {
-            "match_status": match_status,
-            "link_doctype": link_doctype,
-            "link_name": purchase_invoice_name,
-        }
-
-        frappe.db.set_value(
-            "GST Inward Supply", inward_supply_name, inward_supply_fields
+        self.writer.add_inward_supply(
+            inward_supply_name,
+            {
+                "match_status": match_status,
+                "link_doctype": link_doctype,
+                "link_name": purchase_invoice_name,
+            },
         )
 
     def update_reconciliation_status(self, matching_purchases: dict):
@@ -929,12 +959,7 @@ class Reconciler(BaseReconciliation):
         param matching_purchases: dict of doctype and list of matched invoices
         """
         for doctype, doc_names in matching_purchases.items():
-            frappe.db.set_value(
-                doctype,
-                {"name": ("in", doc_names)},
-                "reconciliation_status",
-                "Match Found",
-            )
+            self.writer.add_purchases(doctype, doc_names, "Match Found")
 
     def get_pan_level_data(self, data):
         out = {}
@@ -949,6 +974,221 @@ class Reconciler(BaseReconciliation):
         return out
 
 
+class CandidateIndex:
+    """
+    Blocking index over inward supplies of a supplier (GSTIN or PAN) for a rule.
+
+    Inward supplies are grouped by the fields that the rule requires to match
+    exactly and, for fuzzy and residual matches, by bill date buckets.
+    A purchase is then compared only with inward supplies from its own block
+    (and adjacent date buckets) instead of every inward supply of the supplier.
+
+    Candidates are yielded in their original order, so the first match found
+    is the same as when comparing with all inward supplies.
+    """
+
+    def __init__(self, inward_supplies, match_status, rules):
+        self.inward_supplies = inward_supplies
+        self.key_fields = tuple(
+            field.value
+            for field in BLOCKING_FIELDS
+            if rules.get(field) == Rule.EXACT_MATCH
+        )
+        self.match_dates = (
+            match_status == MatchStatus.RESIDUAL_MATCH.value
+            or rules.get(Fields.BILL_NO) == Rule.FUZZY_MATCH
+        )
+
+        # {key: {date_bucket: [(position, inward_supply_name), ...]}}
+        self.index = {}
+        for position, (name, inward_supply) in enumerate(inward_supplies.items()):
+            self.index.setdefault(self.get_key(inward_supply), {}).setdefault(
+                self.get_date_bucket(inward_supply), []
+            ).append((position, name))
+
+    def get_candidates(self, purchase):
+        """
+        Yields (name, inward_supply) for inward supplies that could match
+        the purchase and are not yet matched.
+        """
+        buckets = self.index.get(self.get_key(purchase))
+        if not buckets:
+            return
+
+        date_bucket = self.get_date_bucket(purchase)
+        if date_bucket is None:
+            candidates = buckets.values()
+        else:
+            candidates = [
+                buckets[bucket]
+                for bucket in (date_bucket - 1, date_bucket, date_bucket + 1, None)
+                if bucket in buckets
+            ]
+
+        for _, name in heapq.merge(*candidates):
+            # inward supplies matched with earlier purchases are removed
+            if inward_supply := self.inward_supplies.get(name):
+                yield name, inward_supply
+
+    def get_key(self, doc):
+        return tuple(doc.get(field) for field in self.key_fields)
+
+    def get_date_bucket(self, doc):
+        if not self.match_dates or not doc.get("bill_date"):
+            return
+
+        # dates within tolerance always fall in the same or adjacent buckets
+        return doc.bill_date.toordinal() // BILL_DATE_TOLERANCE
+
+
+class BillNoMatcher:
+    """
+    Batch fuzzy matching of cleaned bill numbers.
+
+    Scores of a purchase against all its candidate inward supplies are computed
+    with a single call to rapidfuzz (for each unique bill number),
+    instead of scoring one pair at a time. Only matching bill numbers are kept.
+    """
+
+    def __init__(self):
+        # {(doctype, name): {matching cleaned bill nos}}
+        self.matches = {}
+
+    def prefetch(self, purchase, inward_supplies):
+        if not purchase.bill_no:
+            return
+
+        choices = {
+            BaseUtil.set_cleaner_bill_no(inward_supply): None
+            for inward_supply in inward_supplies
+            if inward_supply.bill_no
+        }
+
+        self.matches[(purchase.doctype, purchase.name)] = self.get_matching_bill_nos(
+            BaseUtil.set_cleaner_bill_no(purchase), list(choices)
+        )
+
+    def is_match(self, purchase, inward_supply):
+        matches = self.matches.get((purchase.doctype, purchase.name))
+        if matches is None:
+            matches = self.get_matching_bill_nos(
+                purchase._bill_no, [inward_supply._bill_no]
+            )
+
+        return inward_supply._bill_no in matches
+
+    @staticmethod
+    def get_matching_bill_nos(bill_no, choices):
+        """
+        Returns set of choices approximately matching the bill number.
+        - First check for partial ratio, with 100% confidence
+        - Next check for approximate match, with 90% confidence
+        """
+        if not choices:
+            return set()
+
+        matches = {
+            choice
+            for choice, *_ in process.extract(
+                bill_no,
+                choices,
+                scorer=fuzz.partial_ratio,
+                processor=None,
+                score_cutoff=100,
+                limit=None,
+            )
+        }
+
+        if remaining := [choice for choice in choices if choice not in matches]:
+            # same scorer and processor as `process.extractOne`
+            matches.update(
+                choice
+                for choice, *_ in process.extract(
+                    bill_no, remaining, score_cutoff=90, limit=None
+                )
+            )
+
+        return matches
+
+
+class ReconciliationWriter:
+    """
+    Buffers reconciliation results and saves them with bulk updates.
+
+    - Inward supplies are updated with one `UPDATE ... CASE` query per chunk.
+    - Purchases are updated with one query per chunk for each status.
+    - All documents updated in a flush share the same `modified` timestamp.
+    """
+
+    INWARD_SUPPLY_FIELDS = ("match_status", "link_doctype", "link_name")
+
+    def __init__(self, chunk_size=UPDATE_CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.reset()
+
+    def reset(self):
+        # {inward_supply_name: {field: value}}
+        self.inward_supplies = {}
+
+        # {(doctype, reconciliation_status): [names]}
+        self.purchases = {}
+
+    def add_inward_supply(self, name, values):
+        self.inward_supplies[name] = values
+
+    def add_purchases(self, doctype, names, reconciliation_status):
+        self.purchases.setdefault((doctype, reconciliation_status), []).extend(names)
+
+    def flush(self):
+        if not (self.inward_supplies or self.purchases):
+            return
+
+        modified = now()
+        self.update_inward_supplies(modified)
+        self.update_purchases(modified)
+        self.reset()
+
+    def update_inward_supplies(self, modified):
+        GSTR2 = frappe.qb.DocType("GST Inward Supply")
+
+        for names in self.get_chunks(list(self.inward_supplies)):
+            query = frappe.qb.update(GSTR2)
+
+            for field in self.INWARD_SUPPLY_FIELDS:
+                values = Case()
+                for name in names:
+                    values = values.when(
+                        GSTR2.name == name, self.inward_supplies[name][field]
+                    )
+
+                query = query.set(GSTR2[field], values)
+
+            (
+                query.set(GSTR2.modified, modified)
+                .set(GSTR2.modified_by, frappe.session.user)
+                .where(GSTR2.name.isin(names))
+                .run()
+            )
+
+    def update_purchases(self, modified):
+        for (doctype, status), doc_names in self.purchases.items():
+            doc = frappe.qb.DocType(doctype)
+
+            for names in self.get_chunks(doc_names):
+                (
+                    frappe.qb.update(doc)
+                    .set(doc.reconciliation_status, status)
+                    .set(doc.modified, modified)
+                    .set(doc.modified_by, frappe.session.user)
+                    .where(doc.name.isin(names))
+                    .run()
+                )
+
+    def get_chunks(self, names):
+        for index in range(0, len(names), self.chunk_size):
+            yield names[index : index + self.chunk_size]
+
+
 class ReconciledData(BaseReconciliation):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -1307,6 +1547,16 @@ class BaseUtil:
         inv = " ".join(inv.split()).lstrip("0")
         return inv
 
+    @staticmethod
+    def set_cleaner_bill_no(doc):
+        """
+        Caches the cleaner bill number on the doc and returns it.
+        """
+        if doc._bill_no is None:
+            doc._bill_no = BaseUtil.get_cleaner_bill_no(doc.bill_no, doc.fy)
+
+        return doc._bill_no
+
     @staticmethod
     def get_dict_for_key(key, args_list):
         new_dict = frappe._dict()
@@ -25,7 +25,7 @@ from india_compliance.gst_india.doctype.purchase_reconciliation_tool import (
 )
 from india_compliance.gst_india.utils import (
     get_gstin_list,
-    get_json_from_file,
+    get_streamed_json_from_file,
     get_timespan_date_range,
     is_api_enabled,
 )
@@ -46,6 +46,10 @@ STATUS_MAP = {
     "Ignore": "Ignored",
 }
 
+# Categories reconciled together in a single auto reconciliation job.
+# B2B and ISD are matched against the same purchases, hence run sequentially.
+AUTO_RECONCILE_PARTITIONS = (("B2B", "ISD"), ("CDNR",), ("IMPG",), ("IMPGSEZ",))
+
 
 class PurchaseReconciliationTool(Document):
     def __init__(self, *args, **kwargs):
@@ -99,7 +103,7 @@ class PurchaseReconciliationTool(Document):
         frappe.has_permission("Purchase Reconciliation Tool", "write", throw=True)
 
         return_type = ReturnType(return_type)
-        json_data = get_json_from_file(file_path)
+        json_data = get_streamed_json_from_file(file_path)
         if return_type == ReturnType.GSTR2A:
             return save_gstr_2a(self.company_gstin, period, json_data)
 
@@ -184,7 +188,7 @@ class PurchaseReconciliationTool(Document):
 
         return_type = ReturnType(return_type)
         try:
-            json_data = get_json_from_file(file_path)
+            json_data = get_streamed_json_from_file(file_path)
             if return_type == ReturnType.GSTR2A:
                 return json_data.get("fp")
 
@@ -685,28 +689,52 @@ class AutoReconcile:
         )
 
     def reconcile_purchases(self):
-        """Reconcile purchases for selected companies and GSTINs with valid credentials"""
-        if not self.is_reconciliation_enabled():
+        """
+        Reconcile purchases for selected companies and GSTINs with valid credentials.
+
+        One background job is enqueued for each company and category partition.
+        Progress of these jobs is tracked in `AutoReconcileLog`, and once all of
+        them finish, Purchase Reconciliation Tool is updated for the last company.
+        """
+        if not self.is_reconciliation_enabled() or not self.reconciliation_companies:
             return
 
-        for company in self.reconciliation_companies:
-            self.reconcile_purchases_for_company(company)
+        companies = sorted(self.reconciliation_companies)
+        log = AutoReconcileLog(frappe.generate_hash(length=10))
+        partitions = {
+            log.get_partition_key(company, categories): (company, categories)
+            for company in companies
+            for categories in AUTO_RECONCILE_PARTITIONS
+        }
 
-    def reconcile_purchases_for_company(self, company):
-        purchase_reconciliation_tool = frappe.get_doc("Purchase Reconciliation Tool")
-        purchase_reconciliation_tool.update(
-            {
-                "company": company,
-                "company_gstin": "All",
-                "gst_return": "Both GSTR 2A & 2B",
-                "purchase_from_date": frappe.utils.add_years(self.today, -1),
-                "purchase_to_date": self.today,
-                "inward_supply_from_date": self.inward_supply_from_date,
-                "inward_supply_to_date": self.today,
-            }
-        )
+        log.start(partitions, reco_doc=self.get_reco_doc(companies[-1]))
+
+        for partition_key, (company, categories) in partitions.items():
+            frappe.enqueue(
+                reconcile_purchases_for_partition,
+                queue="long",
+                timeout=3600,
+                run_id=log.run_id,
+                partition_key=partition_key,
+                categories=categories,
+                **self.get_reco_doc(company),
+            )
 
-        purchase_reconciliation_tool.save(ignore_permissions=True)
+    def get_reco_doc(self, company):
+        return {
+            "company": company,
+            "company_gstin": "All",
+            "gst_return": "Both GSTR 2A & 2B",
+            "purchase_from_date": frappe.utils.add_years(self.today, -1),
+            "purchase_to_date": self.today,
+            "inward_supply_from_date": self.inward_supply_from_date,
+            "inward_supply_to_date": self.today,
+            "include_ignored": cint(
+                frappe.db.get_single_value(
+                    "Purchase Reconciliation Tool", "include_ignored"
+                )
+            ),
+        }
 
     def get_reconciliation_company_list(self):
         """Returns list of companies for which auto reconciliation is enabled and credentials are available"""
@@ -740,6 +768,116 @@ def auto_reconcile():
     AutoReconcile().reconcile_purchases()
 
 
+def reconcile_purchases_for_partition(run_id, partition_key, categories, **reco_doc):
+    """Reconcile purchases for a company and given categories (background job)"""
+    log = AutoReconcileLog(run_id)
+    log.set_status(partition_key, "Running")
+
+    try:
+        reconciler = Reconciler(**reco_doc)
+        for row in ORIGINAL_VS_AMENDED:
+            if row["original"] in categories:
+                reconciler.reconcile(row["original"], row["amended"])
+
+        frappe.db.commit()  # nosemgrep
+        status = "Completed"
+
+    except Exception:
+        frappe.db.rollback()
+        frappe.log_error(
+            title="Auto Reconciliation Failed",
+            message=frappe.get_traceback(),
+            reference_doctype="Purchase Reconciliation Tool",
+        )
+        status = "Failed"
+
+    if log.set_status(partition_key, status):
+        update_purchase_reconciliation_tool(log.get_run().reco_doc)
+        frappe.db.commit()  # nosemgrep
+
+
+def update_purchase_reconciliation_tool(reco_doc):
+    """
+    Updates filters and reconciled data of Purchase Reconciliation Tool,
+    as saving it would reconcile all categories again.
+    """
+    reconciled_data = ReconciledData(**reco_doc).get()
+
+    frappe.db.set_single_value(
+        "Purchase Reconciliation Tool",
+        {
+            **reco_doc,
+            "reconciliation_data": json.dumps(reconciled_data, default=json_handler),
+            "is_modified": 0,
+        },
+    )
+
+
+class AutoReconcileLog:
+    """
+    Tracks status of auto reconciliation jobs of a run in cache.
+
+    Status of each partition is stored as a separate field of a hash,
+    so that concurrent jobs can update it safely.
+    """
+
+    CACHE_KEY = "auto_reconcile_log"
+    PENDING_STATUSES = ("Queued", "Running")
+
+    def __init__(self, run_id):
+        self.run_id = run_id
+
+    @staticmethod
+    def get_partition_key(company, categories):
+        return f"{company}:{'+'.join(categories)}"
+
+    def start(self, partitions, reco_doc=None):
+        # only the latest run is tracked
+        frappe.cache.delete_value(self.CACHE_KEY)
+        frappe.cache.hset(
+            self.CACHE_KEY,
+            "_run",
+            {"run_id": self.run_id, "started_on": now_datetime(), "reco_doc": reco_doc},
+        )
+
+        for partition_key in partitions:
+            frappe.cache.hset(self.CACHE_KEY, partition_key, "Queued")
+
+    def set_status(self, partition_key, status):
+        """Returns True if the run is completed with this status"""
+        if not self.is_current_run():
+            return False
+
+        frappe.cache.hset(self.CACHE_KEY, partition_key, status)
+
+        if status in self.PENDING_STATUSES or not self.is_completed():
+            return False
+
+        run = self.get_run()
+        run["completed_on"] = now_datetime()
+        frappe.cache.hset(self.CACHE_KEY, "_run", run)
+
+        return True
+
+    def is_current_run(self):
+        run = self.get_run()
+        return bool(run) and run.get("run_id") == self.run_id
+
+    def get_run(self):
+        return frappe._dict(frappe.cache.hget(self.CACHE_KEY, "_run") or {})
+
+    def is_completed(self):
+        return not any(
+            status in self.PENDING_STATUSES for status in self.get_status().values()
+        )
+
+    def get_status(self):
+        """Returns {partition_key: status} for the latest run"""
+        status = frappe.cache.hgetall(self.CACHE_KEY) or {}
+        status.pop("_run", None)
+        return status
+
+
 class BuildExcel:
     COLOR_PALLATE = frappe._dict(
         {
@@ -771,7 +909,7 @@ class BuildExcel:
 
     def export_data(self):
         """Exports data to an excel file"""
-        excel = ExcelExporter()
+        excel = ExcelExporter(write_only=True)
         excel.create_sheet(
             sheet_name="Match Summary Data",
             filters=self.filters,
@@ -2,14 +2,29 @@
 # See license.txt
 
 import datetime
+import json
+from unittest.mock import patch
 
 import frappe
 from frappe.tests import IntegrationTestCase
 from frappe.tests.utils import make_test_objects
+from frappe.utils import getdate
 
 from india_compliance.gst_india.doctype.bill_of_entry.bill_of_entry import (
     make_bill_of_entry,
 )
+from india_compliance.gst_india.doctype.purchase_reconciliation_tool import (
+    BillNoMatcher,
+    CandidateIndex,
+    Fields,
+    Reconciler,
+    Rule,
+)
+from india_compliance.gst_india.doctype.purchase_reconciliation_tool.purchase_reconciliation_tool import (
+    AUTO_RECONCILE_PARTITIONS,
+    AutoReconcileLog,
+    reconcile_purchases_for_partition,
+)
 from india_compliance.gst_india.utils.tests import (
     create_purchase_invoice as _create_purchase_invoice,
 )
@@ -112,6 +127,96 @@ class TestPurchaseReconciliationTool(IntegrationTestCase):
                 or {},
             )
 
+    def test_partitioned_auto_reconciliation(self):
+        company = "_Test Indian Registered Company"
+        reco_doc = {
+            "company": company,
+            "company_gstin": "All",
+            "gst_return": "GSTR 2B",
+            "purchase_from_date": "2023-11-01",
+            "purchase_to_date": "2023-12-31",
+            "inward_supply_from_date": "2023-11-01",
+            "inward_supply_to_date": "2023-12-31",
+            "include_ignored": 0,
+        }
+
+        log = AutoReconcileLog(frappe.generate_hash(length=10))
+        partitions = {
+            log.get_partition_key(company, categories): categories
+            for categories in AUTO_RECONCILE_PARTITIONS
+        }
+        log.start(partitions, reco_doc=reco_doc)
+
+        # keep test data uncommitted
+        with patch.object(frappe.db, "commit"):
+            for partition_key, categories in partitions.items():
+                self.assertFalse(log.is_completed())
+                reconcile_purchases_for_partition(
+                    log.run_id, partition_key, categories, **reco_doc
+                )
+
+        self.assertDictEqual(log.get_status(), dict.fromkeys(partitions, "Completed"))
+        self.assertTrue(log.get_run().completed_on)
+
+        # reconciled data is updated once all partitions are completed
+        purchase_reconciliation_tool = frappe.get_doc("Purchase Reconciliation Tool")
+        self.assertEqual(purchase_reconciliation_tool.company, company)
+        self.assertEqual(purchase_reconciliation_tool.is_modified, 0)
+
+        for row in json.loads(purchase_reconciliation_tool.reconciliation_data):
+            self.assertDictEqual(
+                row,
+                self.reconciled_data.get(
+                    (row["purchase_invoice_name"], row["inward_supply_name"])
+                )
+                or {},
+            )
+
+    def test_reconciliation_updated_in_chunks(self):
+        """Results of more than one update chunk are saved for both documents"""
+        matches = []
+        for index in range(3):
+            values = {
+                "bill_no": f"BILL-24-CHUNK-{index}",
+                "bill_date": "2024-01-10",
+            }
+            purchase_invoice = create_purchase_invoice(
+                **values, posting_date="2024-01-10"
+            )
+            inward_supply = create_gst_inward_supply(
+                **values, return_period_2b="012024", gen_date_2b="2024-01-11"
+            )
+            matches.append((purchase_invoice.name, inward_supply.name))
+
+        reconciler = Reconciler(
+            company="_Test Indian Registered Company",
+            company_gstin="All",
+            gst_return="GSTR 2B",
+            purchase_from_date="2024-01-01",
+            purchase_to_date="2024-01-31",
+            inward_supply_from_date="2024-01-01",
+            inward_supply_to_date="2024-01-31",
+            include_ignored=0,
+            update_chunk_size=2,
+        )
+        reconciler.reconcile("B2B", "B2BA")
+
+        for purchase_invoice_name, inward_supply_name in matches:
+            self.assertEqual(
+                frappe.db.get_value(
+                    "Purchase Invoice", purchase_invoice_name, "reconciliation_status"
+                ),
+                "Match Found",
+            )
+            self.assertDocumentEqual(
+                {
+                    "match_status": "Exact Match",
+                    "link_doctype": "Purchase Invoice",
+                    "link_name": purchase_invoice_name,
+                },
+                frappe.get_doc("GST Inward Supply", inward_supply_name),
+            )
+
     @classmethod
     def create_test_data(cls):
         frappe.db.set_single_value("GST Settings", "enable_overseas_transactions", 1)
@@ -144,6 +249,100 @@ class TestPurchaseReconciliationTool(IntegrationTestCase):
         frappe.db.set_single_value("GST Settings", "enable_overseas_transactions", 0)
 
 
+class TestReconciliationMatching(IntegrationTestCase):
+    def test_bill_no_matcher_score_cutoffs(self):
+        # partial match with 100% confidence
+        self.assertSetEqual(
+            BillNoMatcher.get_matching_bill_nos(
+                "INV00123", ["ABCINV00123", "INV00124", "XYZ789"]
+            ),
+            {"ABCINV00123"},
+        )
+
+        # approximate match with 90% confidence
+        self.assertSetEqual(
+            BillNoMatcher.get_matching_bill_nos(
+                "INV00000000000000001", ["INV00000000000000002", "INV00124"]
+            ),
+            {"INV00000000000000002"},
+        )
+
+        def get_doc(doctype, name, bill_no):
+            return frappe._dict(
+                doctype=doctype, name=name, bill_no=bill_no, _bill_no=bill_no
+            )
+
+        purchase = get_doc("Purchase Invoice", "PINV-0001", "INV00123")
+        inward_supplies = [
+            get_doc("GST Inward Supply", f"GST-IS-{idx}", bill_no)
+            for idx, bill_no in enumerate(("ABCINV00123", "INV00124", "XYZ789"))
+        ]
+
+        # prefetched matches are same as matching one pair at a time
+        matcher = BillNoMatcher()
+        matcher.prefetch(purchase, inward_supplies)
+
+        self.assertListEqual(
+            [matcher.is_match(purchase, doc) for doc in inward_supplies],
+            [BillNoMatcher().is_match(purchase, doc) for doc in inward_supplies],
+        )
+        self.assertListEqual(
+            [matcher.is_match(purchase, doc) for doc in inward_supplies],
+            [True, False, False],
+        )
+
+    def test_candidate_index_blocking(self):
+        def get_doc(bill_no, place_of_supply, bill_date):
+            return frappe._dict(
+                bill_no=bill_no,
+                place_of_supply=place_of_supply,
+                bill_date=bill_date and getdate(bill_date),
+            )
+
+        inward_supplies = {
+            "GST-IS-1": get_doc("INV-1", "24-Gujarat", "2024-07-01"),
+            "GST-IS-2": get_doc("INV-2", "24-Gujarat", "2024-07-01"),
+            "GST-IS-3": get_doc("INV-1", "27-Maharashtra", "2024-07-01"),
+            "GST-IS-4": get_doc("INV-1", "24-Gujarat", "2024-09-01"),
+            "GST-IS-5": get_doc("INV-1", "24-Gujarat", None),
+        }
+        purchase = get_doc("INV-1", "24-Gujarat", "2024-07-05")
+
+        exact_rules = {
+            Fields.BILL_NO: Rule.EXACT_MATCH,
+            Fields.PLACE_OF_SUPPLY: Rule.EXACT_MATCH,
+        }
+        fuzzy_rules = {
+            Fields.BILL_NO: Rule.FUZZY_MATCH,
+            Fields.PLACE_OF_SUPPLY: Rule.EXACT_MATCH,
+        }
+
+        def get_candidates(match_status, rules):
+            index = CandidateIndex(inward_supplies, match_status, rules)
+            return [name for name, _ in index.get_candidates(purchase)]
+
+        # blocked by fields to match exactly, in original order
+        self.assertListEqual(
+            get_candidates("Exact Match", exact_rules),
+            ["GST-IS-1", "GST-IS-4", "GST-IS-5"],
+        )
+
+        # fuzzy bill number is not blocked, but bill dates far apart are
+        self.assertListEqual(
+            get_candidates("Suggested Match", fuzzy_rules),
+            ["GST-IS-1", "GST-IS-2", "GST-IS-5"],
+        )
+
+        # inward supplies matched after indexing are skipped
+        index = CandidateIndex(inward_supplies, "Suggested Match", fuzzy_rules)
+        del inward_supplies["GST-IS-1"]
+
+        self.assertListEqual(
+            [name for name, _ in index.get_candidates(purchase)],
+            ["GST-IS-2", "GST-IS-5"],
+        )
+
+
 def create_purchase_invoice(**kwargs):
     args = PURCHASE_INVOICE_DEFAULT_ARGS.copy()
     args.update(kwargs)
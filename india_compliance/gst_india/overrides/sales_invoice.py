@@ -4,6 +4,7 @@ from frappe.utils import flt, fmt_money
 
 from india_compliance.gst_india.overrides.payment_entry import get_taxes_summary
 from india_compliance.gst_india.overrides.transaction import (
+    get_gst_context,
     ignore_gst_validations,
     validate_backdated_transaction,
     validate_mandatory_fields,
@@ -102,7 +103,9 @@ def validate_fields_and_set_status_for_e_invoice(doc, gst_settings=None):
     validate_hsn_codes_for_e_invoice(doc)
 
     if is_foreign_doc(doc):
-        country = frappe.db.get_value("Address", doc.customer_address, "country")
+        country = get_gst_context(doc).get_address_value(
+            doc.customer_address, "country"
+        )
         get_validated_country_code(country)
 
     if doc.docstatus == 1 and not doc.irn:
@@ -132,7 +135,8 @@ def validate_port_address(doc):
 
 def is_shipping_address_in_india(doc):
     if doc.shipping_address_name and (
-        frappe.db.get_value("Address", doc.shipping_address_name, "country") == "India"
+        get_gst_context(doc).get_address_value(doc.shipping_address_name, "country")
+        == "India"
     ):
         return True
 
@@ -25,6 +25,7 @@ from erpnext.stock.doctype.purchase_receipt.purchase_receipt import (
 from india_compliance.gst_india.constants import SALES_DOCTYPES
 from india_compliance.gst_india.overrides.transaction import (
     DOCTYPES_WITH_GST_DETAIL,
+    get_gst_context,
     validate_item_tax_template,
 )
 from india_compliance.gst_india.utils.tests import (
@@ -976,6 +977,17 @@ class TestSpecificTransactions(IntegrationTestCase):
 
         self.assertEqual(si_return.vehicle_no, None)
 
+    def test_gst_context_for_save(self):
+        si = create_transaction(doctype="Sales Invoice", do_not_submit=True)
+
+        # shared by hooks of the last save
+        context = si.flags.gst_context
+        self.assertIsNotNone(context)
+        self.assertIs(get_gst_context(si), context)
+
+        si.save()
+        self.assertIsNot(si.flags.gst_context, context)
+
     @change_settings("GST Settings", {"restrict_changes_after_gstr_1": 1})
     def test_backdated_transaction(self):
         si = create_transaction(doctype="Sales Invoice", do_not_submit=True)
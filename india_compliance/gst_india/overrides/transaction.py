@@ -51,6 +51,62 @@ DOCTYPES_WITH_GST_DETAIL = {
 }
 
 
+class GSTContext:
+    """
+    Company and Address details needed by GST validations of a transaction,
+    fetched once and shared by its hooks while it is being saved
+    """
+
+    ADDRESS_FIELDS = ("country", "gst_category", "gst_state", "gst_state_number")
+
+    def __init__(self, doc):
+        self.modified = doc.get("modified")
+        self.addresses = {}
+        self.valid_accounts = {}
+
+    def get_address_value(self, address, fieldname):
+        if not address:
+            return
+
+        if address not in self.addresses:
+            self.addresses[address] = (
+                frappe.db.get_value(
+                    "Address", address, self.ADDRESS_FIELDS, as_dict=True
+                )
+                or frappe._dict()
+            )
+
+        return self.addresses[address].get(fieldname)
+
+    def get_valid_accounts(self, company, *, for_sales=False, for_purchase=False):
+        key = (company, for_sales, for_purchase)
+
+        if key not in self.valid_accounts:
+            self.valid_accounts[key] = get_valid_accounts(
+                company, for_sales=for_sales, for_purchase=for_purchase, throw=False
+            )
+
+        return self.valid_accounts[key]
+
+
+def get_gst_context(doc):
+    """
+    GST Context of the transaction, reused until it is saved again
+    (`modified` is updated on each save)
+    """
+    flags = getattr(doc, "flags", None)
+
+    # not a document (eg: party details)
+    if flags is None:
+        return GSTContext(doc)
+
+    context = flags.gst_context
+    if not context or context.modified != doc.get("modified"):
+        context = flags.gst_context = GSTContext(doc)
+
+    return context
+
+
 def set_gst_breakup(doc):
     gst_breakup_html = frappe.render_template(
         "templates/gst_breakup.html", dict(doc=doc)
@@ -334,11 +390,10 @@ class GSTAccounts:
             self.all_valid_accounts,
             self.intra_state_accounts,
             self.inter_state_accounts,
-        ) = get_valid_accounts(
+        ) = get_gst_context(self.doc).get_valid_accounts(
             self.doc.company,
             for_sales=self.is_sales_transaction,
             for_purchase=not self.is_sales_transaction,
-            throw=False,
         )
 
         self.first_gst_idx = self._get_matched_idx(self.gst_tax_rows, TAX_TYPES)
@@ -442,8 +497,8 @@ class GSTAccounts:
         else:
             company_address_field = "billing_address"
 
-        company_gst_category = frappe.db.get_value(
-            "Address", self.doc.get(company_address_field), "gst_category"
+        company_gst_category = get_gst_context(self.doc).get_address_value(
+            self.doc.get(company_address_field), "gst_category"
         )
 
         if company_gst_category == "SEZ":
@@ -610,7 +665,9 @@ def validate_place_of_supply(doc):
         and doc.place_of_supply != "96-Other Countries"
         and (
             not doc.shipping_address_name
-            or frappe.db.get_value("Address", doc.shipping_address_name, "country")
+            or get_gst_context(doc).get_address_value(
+                doc.shipping_address_name, "country"
+            )
             != "India"
         )
     ):
@@ -650,10 +707,8 @@ def get_source_state_code(doc):
         return "96"
 
     if doc.gst_category == "Unregistered" and doc.supplier_address:
-        return frappe.db.get_value(
-            "Address",
-            doc.supplier_address,
-            "gst_state_number",
+        return get_gst_context(doc).get_address_value(
+            doc.supplier_address, "gst_state_number"
         )
 
     # for purchase, subcontracting order and receipt
@@ -8,7 +8,7 @@ from pypika.terms import Case
 import frappe
 from frappe import _
 from frappe.query_builder import Criterion
-from frappe.query_builder.functions import Date, IfNull, Sum
+from frappe.query_builder.functions import IfNull, Sum
 from frappe.utils import cint, flt, formatdate, getdate
 
 from india_compliance.gst_india.constants.__init__ import GST_TAX_TYPES
@@ -658,8 +658,8 @@ class Gstr1Report:
             .where(IfNull(si.ecommerce_gstin, "") != "")
             .where(IfNull(si.billing_address_gstin, "") != si.company_gstin)
             .where(
-                Date(si.posting_date).between(
-                    self.filters.from_date, self.filters.to_date
+                si.posting_date.between(
+                    getdate(self.filters.from_date), getdate(self.filters.to_date)
                 )
             )
             .where(si.company == self.filters.company)
@@ -2265,7 +2265,7 @@ def get_gstr1_excel(filters, data=None, columns=None):
     gstin = report_dict["gstin"]
     report_types = TYPES_OF_BUSINESS
 
-    excel = ExcelExporter()
+    excel = ExcelExporter(write_only=True)
     excel.remove_sheet("Sheet")
 
     if isinstance(data, str):
@@ -23,6 +23,11 @@ from india_compliance.gst_india.utils.custom_fields import toggle_custom_fields
 
 ITEM_VARIANT_FIELDNAMES = frozenset(("gst_hsn_code",))
 
+# equality columns first and range column last, as used in GSTR-1 queries
+DATABASE_INDEXES = {
+    "Sales Invoice": (("company_gstin", "docstatus", "posting_date"),),
+}
+
 
 def after_install():
     create_custom_fields()
@@ -35,6 +40,7 @@ def after_install():
     set_default_print_settings()
     create_hsn_codes()
     add_fields_to_item_variant_settings()
+    create_database_indexes()
 
 
 def create_custom_fields():
@@ -62,6 +68,12 @@ def create_accounting_dimension_fields():
         make_dimension_in_accounting_doctypes(doc, doctypes)
 
 
+def create_database_indexes():
+    for doctype, indexes in DATABASE_INDEXES.items():
+        for fields in indexes:
+            frappe.db.add_index(doctype, list(fields))
+
+
 def create_property_setters(*, include_defaults=False):
     for property_setter in get_property_setters(include_defaults=include_defaults):
         frappe.make_property_setter(
@@ -659,6 +659,16 @@ def get_json_from_file(path):
     return frappe._dict(frappe.get_file_json(get_file_path(path)))
 
 
+def get_streamed_json_from_file(path):
+    """
+    Same as `get_json_from_file`, but arrays are read from the file
+    one item at a time when iterated. Useful for large files.
+    """
+    from india_compliance.gst_india.utils.json_stream import load_json_lazily
+
+    return load_json_lazily(get_file_path(path))
+
+
 def join_list_with_custom_separators(input, separator=", ", last_separator=" or "):
     if type(input) not in (list, tuple):
         return
@@ -1,14 +1,179 @@
+import random
+import threading
+import time
+
 import frappe
+from frappe.utils import flt, now, sbool
+
+LOG_BUFFER_SIZE = 50
+LOG_FLUSH_INTERVAL = 60  # seconds
+
+INTEGRATION_REQUEST_FIELDS = (
+    "name",
+    "creation",
+    "modified",
+    "owner",
+    "modified_by",
+    "integration_request_service",
+    "request_id",
+    "url",
+    "request_headers",
+    "data",
+    "output",
+    "error",
+    "status",
+    "reference_doctype",
+    "reference_docname",
+)
 
 
 def enqueue_integration_request(**kwargs):
+    """
+    Buffers the log for current job / request.
+
+    Buffered logs are inserted in bulk by a single background job
+    when the buffer is full or stale, and when the job / request ends.
+    """
+    if buffer := get_integration_request_buffer():
+        buffer.add(kwargs)
+        return
+
+    # no job / request to flush the buffer (e.g. console)
     frappe.enqueue(
         "india_compliance.gst_india.utils.api.create_integration_request",
         **kwargs,
     )
 
 
-def create_integration_request(
+def should_log_integration_request(settings, error=None, response=None):
+    """
+    Failed requests are always logged, including ignored errors
+    which are returned in the response without raising an exception.
+    Successful requests are sampled as per GST Settings.
+    """
+    if error or is_error_response(response):
+        return True
+
+    log_rate = flt(settings.successful_api_request_log_rate)
+    return log_rate >= 100 or random.random() * 100 < log_rate
+
+
+def is_error_response(response):
+    if not isinstance(response, dict):
+        return False
+
+    success = response.get("success", True)
+    if isinstance(success, str):
+        success = sbool(success)
+
+    return not success or bool(response.get("error_type"))
+
+
+class IntegrationRequestBuffer:
+    """
+    Logs of the current job / request, shared with threads started by it
+    (see `utils.concurrency.get_site_context`).
+    """
+
+    def __init__(self, size=LOG_BUFFER_SIZE, interval=LOG_FLUSH_INTERVAL):
+        self.size = size
+        self.interval = interval
+        self.logs = []
+        self.first_added_on = None
+        self.lock = threading.Lock()
+
+    def add(self, log):
+        with self.lock:
+            self.logs.append(log)
+
+            if self.first_added_on is None:
+                self.first_added_on = time.monotonic()
+
+            if not (
+                len(self.logs) >= self.size
+                or time.monotonic() - self.first_added_on >= self.interval
+            ):
+                return
+
+            logs = self.pop_logs()
+
+        self.enqueue(logs)
+
+    def flush(self):
+        with self.lock:
+            logs = self.pop_logs()
+
+        self.enqueue(logs)
+
+    def pop_logs(self):
+        logs, self.logs = self.logs, []
+        self.first_added_on = None
+        return logs
+
+    def enqueue(self, logs):
+        if not logs:
+            return
+
+        frappe.enqueue(
+            "india_compliance.gst_india.utils.api.create_integration_requests",
+            logs=logs,
+        )
+
+
+def get_integration_request_buffer():
+    if buffer := getattr(frappe.local, "integration_request_buffer", None):
+        return buffer
+
+    if job := getattr(frappe.local, "job", None):
+        buffer = IntegrationRequestBuffer()
+        job.after_job.add(buffer.flush)
+
+    elif getattr(frappe.local, "request", None):
+        # flushed by `flush_integration_requests` (after_request hook)
+        buffer = IntegrationRequestBuffer()
+
+    else:
+        return
+
+    frappe.local.integration_request_buffer = buffer
+    return buffer
+
+
+def flush_integration_requests(*args, **kwargs):
+    if buffer := getattr(frappe.local, "integration_request_buffer", None):
+        buffer.flush()
+
+
+def create_integration_requests(logs):
+    timestamp = now()
+    user = frappe.session.user
+
+    values = []
+    for log in logs:
+        integration_request = get_integration_request(**log)
+        integration_request.update(
+            name=frappe.generate_hash(length=10),
+            creation=timestamp,
+            modified=timestamp,
+            owner=user,
+            modified_by=user,
+        )
+        values.append(
+            tuple(integration_request[field] for field in INTEGRATION_REQUEST_FIELDS)
+        )
+
+    frappe.db.bulk_insert(
+        "Integration Request", INTEGRATION_REQUEST_FIELDS, values, chunk_size=100
+    )
+
+
+def create_integration_request(**kwargs):
+    return frappe.get_doc(
+        {"doctype": "Integration Request", **get_integration_request(**kwargs)}
+    ).insert(ignore_permissions=True)
+
+
+def get_integration_request(
     url=None,
     request_id=None,
     request_headers=None,
@@ -18,9 +183,8 @@ def create_integration_request(
     reference_doctype=None,
     reference_name=None,
 ):
-    return frappe.get_doc(
+    return frappe._dict(
         {
-            "doctype": "Integration Request",
             "integration_request_service": "India Compliance API",
             "request_id": request_id,
             "url": url,
@@ -32,7 +196,7 @@ def create_integration_request(
             "reference_doctype": reference_doctype,
             "reference_docname": reference_name,
         }
-    ).insert(ignore_permissions=True)
+    )
 
 
 def pretty_json(obj):
@@ -0,0 +1,203 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+
+import frappe
+
+from india_compliance.gst_india.utils.api import get_integration_request_buffer
+
+MAX_WORKERS = 4
+WORKER_DONE = object()
+
+
+def iter_concurrently(func, args_list, max_workers=MAX_WORKERS):
+    """
+    Calls `func` for each set of arguments in a bounded thread pool.
+
+    - Results are yielded in the order of `args_list`, as soon as they are available.
+    - At most `max_workers` calls are submitted ahead of the consumer, so only as
+      many results are held in memory at a time.
+    - Every call runs in its own site context (and database connection)
+      as the current user, since `frappe.local` is not shared across threads.
+    - Pending calls are cancelled if the consumer stops early or a call fails.
+
+    Usage:
+        for response in iter_concurrently(fetch, [(period,) for period in periods]):
+            save(response)
+    """
+    args_list = list(args_list)
+    if not args_list:
+        return
+
+    context = get_site_context()
+    max_workers = max(min(max_workers, len(args_list)), 1)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit(args):
+        return executor.submit(run_in_site_context, context, func, *args)
+
+    remaining_args = iter(args_list)
+
+    try:
+        futures = deque(submit(args) for args in islice(remaining_args, max_workers))
+
+        while futures:
+            result = futures.popleft().result()
+
+            # next call runs while the result is consumed
+            if (args := next(remaining_args, None)) is not None:
+                futures.append(submit(args))
+
+            yield result
+
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def iter_in_workers(func, args_list, max_workers=MAX_WORKERS):
+    """
+    Calls `func` for each set of arguments in a fixed set of worker threads.
+
+    - Each worker runs in its own site context (and database connection)
+      as the current user, and works through the calls one after another.
+    - Each call is committed individually, or rolled back if it fails.
+    - Results are yielded as calls complete, not in the order of `args_list`.
+    - Pending calls are skipped if the consumer stops early or a call fails.
+
+    Usage:
+        for result in iter_in_workers(generate, [(docname,) for docname in names]):
+            update_progress(result)
+    """
+    pending_args = queue.SimpleQueue()
+    for args in args_list:
+        pending_args.put(args)
+
+    if pending_args.empty():
+        return
+
+    context = get_site_context()
+    max_workers = max(min(max_workers, pending_args.qsize()), 1)
+    results = queue.SimpleQueue()
+    stop = threading.Event()
+
+    def work():
+        try:
+            with site_context(context):
+                while not stop.is_set():
+                    try:
+                        args = pending_args.get_nowait()
+                    except queue.Empty:
+                        break
+
+                    try:
+                        result = func(*args)
+                        frappe.db.commit()  # nosemgrep - connection of this worker
+                    except Exception:
+                        frappe.db.rollback()
+                        raise
+
+                    results.put((result, None))
+
+        except Exception as e:
+            results.put((None, e))
+
+        finally:
+            results.put(WORKER_DONE)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    try:
+        for _ in range(max_workers):
+            executor.submit(work)
+
+        running_workers = max_workers
+        while running_workers:
+            item = results.get()
+            if item is WORKER_DONE:
+                running_workers -= 1
+                continue
+
+            result, error = item
+            if error:
+                raise error
+
+            yield result
+
+    finally:
+        stop.set()
+        executor.shutdown()
+
+
+class RateLimiter:
+    """
+    Spaces out calls shared across threads to at most `rate` calls per second.
+
+    Usage:
+        rate_limiter = RateLimiter(rate=5)
+
+        def fetch(gstin):
+            rate_limiter.wait()
+            return api.get_gstin_info(gstin)
+    """
+
+    def __init__(self, rate):
+        self.interval = 1 / rate
+        self.next_call_at = 0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            wait_for = self.next_call_at - now
+            self.next_call_at = max(now, self.next_call_at) + self.interval
+
+        if wait_for > 0:
+            time.sleep(wait_for)
+
+
+def get_site_context():
+    return frappe._dict(
+        site=frappe.local.site,
+        sites_path=frappe.local.sites_path,
+        user=frappe.session.user,
+        job=getattr(frappe.local, "job", None),
+        # API request logs of threads are flushed with the parent job / request
+        integration_request_buffer=get_integration_request_buffer(),
+    )
+
+
+@contextmanager
+def site_context(context):
+    frappe.init(context.site, sites_path=context.sites_path)
+
+    try:
+        frappe.connect()
+        frappe.set_user(context.user)
+
+        # after job hooks (e.g. resetting auth token) run with the parent job
+        if context.job:
+            frappe.local.job = context.job
+
+        if context.integration_request_buffer:
+            frappe.local.integration_request_buffer = context.integration_request_buffer
+
+        yield
+
+    finally:
+        frappe.destroy()
+
+
+def run_in_site_context(context, func, *args):
+    with site_context(context):
+        try:
+            result = func(*args)
+            frappe.db.commit()  # nosemgrep - separate connection for this thread
+            return result
+
+        except Exception:
+            frappe.db.rollback()
+            raise
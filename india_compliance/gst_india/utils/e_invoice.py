@@ -50,6 +50,8 @@ from india_compliance.gst_india.utils import (
 from india_compliance.gst_india.utils.e_waybill import (
     _cancel_e_waybill,
     generate_pending_e_waybills,
+    get_bulk_generation_progress_reporter,
+    iter_bulk_generation,
     log_and_process_e_waybill_generation,
 )
 from india_compliance.gst_india.utils.transaction_data import GSTTransactionData
@@ -82,6 +84,28 @@ def generate_e_invoices(docnames, force=False):
     """
     Bulk generate e-Invoices for the given Sales Invoices.
     Permission checks are done in the `generate_e_invoice` function.
+    See `iter_concurrently_by_gstin`.
+    """
+    progress = get_bulk_generation_progress_reporter(len(docnames), "Sales Invoice")
+
+    for is_server_error in iter_bulk_generation(
+        "Sales Invoice", docnames, _generate_e_invoice_in_bulk, force
+    ):
+        if is_server_error:
+            frappe.db.set_value(
+                "Sales Invoice",
+                {"name": ("in", docnames), "irn": ("is", "not set")},
+                "einvoice_status",
+                "Auto-Retry",
+            )
+            frappe.db.commit()  # nosemgrep
+
+        progress.update(title=_("Generating e-Invoices"))
+
+
+def _generate_e_invoice_in_bulk(docname, force=False):
+    """
+    Returns True if e-Invoice generation failed as GSP server is down
     """
 
     def log_error():
@@ -92,28 +116,19 @@ def generate_e_invoices(docnames, force=False):
             message=frappe.get_traceback(),
         )
 
-    for docname in docnames:
-        try:
-            generate_e_invoice(docname, throw=False, force=force)
-
-        except GSPServerError:
-            frappe.db.set_value(
-                "Sales Invoice",
-                {"name": ("in", docnames), "irn": ("is", "not set")},
-                "einvoice_status",
-                "Auto-Retry",
-            )
+    try:
+        generate_e_invoice(docname, throw=False, force=force)
 
-            log_error()
-            frappe.clear_last_message()
+    except GSPServerError:
+        log_error()
+        frappe.clear_last_message()
+        return True
 
-        except Exception:
-            log_error()
-            frappe.clear_last_message()
+    except Exception:
+        log_error()
+        frappe.clear_last_message()
 
-        finally:
-            # each e-Invoice needs to be committed individually
-            frappe.db.commit()  # nosemgrep
+    return False
 
 
 @frappe.whitelist()
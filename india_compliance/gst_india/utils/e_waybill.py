@@ -3,7 +3,7 @@ import os
 
 import frappe
 from frappe import _
-from frappe.desk.form.load import get_docinfo
+from frappe.desk.form.load import get_docinfo, run_onload
 from frappe.utils import (
     add_days,
     add_to_date,
@@ -43,6 +43,8 @@ from india_compliance.gst_india.utils import (
     send_updated_doc,
     update_onload,
 )
+from india_compliance.gst_india.utils.concurrency import iter_in_workers
+from india_compliance.gst_india.utils.progress import ProgressReporter
 from india_compliance.gst_india.utils.transaction_data import GSTTransactionData
 
 #######################################################################################
@@ -114,23 +116,140 @@ def enqueue_bulk_e_waybill_generation(doctype, docnames):
 def generate_e_waybills(doctype, docnames, force=False):
     """
     Bulk generate e-Waybill for the given documents.
+    See `iter_concurrently_by_gstin`.
     """
+    docs = get_prefetched_docs((doctype, docname) for docname in docnames)
+    progress = get_bulk_generation_progress_reporter(len(docs), doctype)
+    args_by_gstin = {}
 
     for docname in docnames:
-        try:
-            doc = load_doc(doctype, docname, "submit")
-            _generate_e_waybill(doc, force=force)
-        except Exception:
+        doc_data = docs.get((doctype, docname))
+        if not doc_data:
             frappe.log_error(
                 title=_("e-Waybill generation failed for {0} {1}").format(
                     doctype, docname
                 ),
-                message=frappe.get_traceback(),
+                message=_("{0} {1} not found").format(doctype, docname),
             )
+            continue
+
+        args_by_gstin.setdefault(doc_data.company_gstin, []).append((doc_data, force))
+
+    for _result in iter_concurrently_by_gstin(
+        _generate_e_waybill_in_bulk, args_by_gstin.values()
+    ):
+        progress.update(title=_("Generating e-Waybills"))
+
+
+def _generate_e_waybill_in_bulk(doc_data, force=False):
+    try:
+        doc = load_prefetched_doc(doc_data, "submit")
+        _generate_e_waybill(doc, force=force)
+
+    except Exception:
+        frappe.log_error(
+            title=_("e-Waybill generation failed for {0} {1}").format(
+                doc_data.doctype, doc_data.name
+            ),
+            message=frappe.get_traceback(),
+        )
+
+
+def get_bulk_generation_progress_reporter(total_docs, doctype):
+    return ProgressReporter("bulk_generation_progress", total_docs, doctype=doctype)
+
+
+def iter_bulk_generation(doctype, docnames, func, *args):
+    """
+    Calls `func(docname, *args)` for each document and yields its result.
+    See `iter_concurrently_by_gstin`.
+    """
+    docs = get_prefetched_docs(
+        ((doctype, docname) for docname in docnames),
+        fields=("name", "company_gstin"),
+        child_tables=False,
+    )
+    args_by_gstin = {}
 
-        finally:
-            # each e-Waybill needs to be committed individually
+    for docname in docnames:
+        doc_data = docs.get((doctype, docname)) or {}
+        args_by_gstin.setdefault(doc_data.get("company_gstin"), []).append(
+            (docname, *args)
+        )
+
+    yield from iter_concurrently_by_gstin(func, args_by_gstin.values())
+
+
+def iter_concurrently_by_gstin(func, args_by_gstin):
+    """
+    Calls `func` for each set of arguments and yields its result.
+
+    - Arguments are grouped by company GSTIN, and calls for a GSTIN
+      are made by a fixed set of workers (bounding parallel requests per GSTIN).
+    - Each call is committed individually, hence `func` should handle its errors.
+    """
+    for args_list in args_by_gstin:
+        if len(args_list) == 1:
+            result = func(*args_list[0])
             frappe.db.commit()  # nosemgrep
+            yield result
+            continue
+
+        yield from iter_in_workers(func, args_list)
+
+
+def get_prefetched_docs(references, fields="*", child_tables=True):
+    """
+    Data of documents (with child tables) prefetched with one query per doctype
+    and child table, to be loaded with `load_prefetched_doc`
+
+    :param references: iterable of (doctype, docname)
+    :param fields: fields of documents, `name` is required
+    :param child_tables: whether to fetch child tables
+    :returns: dict of (doctype, docname) -> document data
+    """
+    docnames_by_doctype = {}
+    for doctype, docname in references:
+        docnames_by_doctype.setdefault(doctype, set()).add(docname)
+
+    docs = {}
+    for doctype, docnames in docnames_by_doctype.items():
+        docnames = list(docnames)
+
+        for doc_data in frappe.get_all(
+            doctype, filters={"name": ("in", docnames)}, fields=fields
+        ):
+            doc_data.doctype = doctype
+            docs[(doctype, doc_data.name)] = doc_data
+
+        if not child_tables:
+            continue
+
+        for table_field in frappe.get_meta(doctype).get_table_fields():
+            for row in frappe.get_all(
+                table_field.options,
+                filters={
+                    "parent": ("in", docnames),
+                    "parenttype": doctype,
+                    "parentfield": table_field.fieldname,
+                },
+                fields="*",
+                order_by="idx",
+                parent_doctype=doctype,
+            ):
+                if doc_data := docs.get((doctype, row.parent)):
+                    doc_data.setdefault(table_field.fieldname, []).append(row)
+
+    return docs
+
+
+def load_prefetched_doc(doc_data, perm="read"):
+    """Same as `load_doc`, for document data from `get_prefetched_docs`"""
+    doc = frappe.get_doc(doc_data)
+    doc.check_permission(perm)
+    run_onload(doc)
+
+    return doc
 
 
 @frappe.whitelist()
@@ -477,6 +596,10 @@ def update_transporter(*, doctype, docname, values):
 @frappe.whitelist()
 def extend_validity(*, doctype, docname, values, scheduled=False):
     doc = load_doc(doctype, docname, "submit")
+    return _extend_validity(doc, values, scheduled=scheduled)
+
+
+def _extend_validity(doc, values, scheduled=False):
     values = frappe.parse_json(values)
 
     if not scheduled:
@@ -530,33 +653,73 @@ def get_e_waybills_to_extend():
 
 
 def extend_scheduled_e_waybills():
+    """
+    Extend validity of e-Waybills scheduled for extension.
+    See `iter_concurrently_by_gstin`.
+    """
     e_waybills_to_extend = get_e_waybills_to_extend()
 
     if not e_waybills_to_extend:
         return
 
+    docs = get_prefetched_docs(
+        (e_waybill_data.reference_doctype, e_waybill_data.reference_name)
+        for e_waybill_data in e_waybills_to_extend
+    )
+    log_names = []
+    args_by_gstin = {}
+
     for e_waybill_data in e_waybills_to_extend:
-        frappe.db.set_value(
-            "e-Waybill Log", e_waybill_data.name, "extension_scheduled", 0
+        doc_data = docs.get(
+            (e_waybill_data.reference_doctype, e_waybill_data.reference_name)
         )
-
-        try:
-            extension_data = json.loads(e_waybill_data.extension_data)
-
-            extend_validity(
-                doctype=e_waybill_data.reference_doctype,
-                docname=e_waybill_data.reference_name,
-                values=extension_data,
-                scheduled=True,
-            )
-
-        except Exception:
+        if not doc_data:
             frappe.log_error(
                 title=_(
                     "Failed to Extend Validity of Scheduled e-Waybill #{ewb_no}"
                 ).format(ewb_no=e_waybill_data.e_waybill_number),
-                message=frappe.get_traceback(),
+                message=_("{0} {1} not found").format(
+                    e_waybill_data.reference_doctype, e_waybill_data.reference_name
+                ),
+                reference_doctype="e-Waybill Log",
+                reference_name=e_waybill_data.name,
             )
+            continue
+
+        log_names.append(e_waybill_data.name)
+        args_by_gstin.setdefault(doc_data.company_gstin, []).append(
+            (e_waybill_data, doc_data)
+        )
+
+    if not log_names:
+        return
+
+    # extension is attempted only once
+    frappe.db.set_value(
+        "e-Waybill Log", {"name": ("in", log_names)}, "extension_scheduled", 0
+    )
+    frappe.db.commit()  # nosemgrep
+
+    # errors are logged for each e-Waybill
+    list(
+        iter_concurrently_by_gstin(_extend_scheduled_e_waybill, args_by_gstin.values())
+    )
+
+
+def _extend_scheduled_e_waybill(e_waybill_data, doc_data):
+    try:
+        extension_data = json.loads(e_waybill_data.extension_data)
+        doc = load_prefetched_doc(doc_data, "submit")
+
+        _extend_validity(doc, extension_data, scheduled=True)
+
+    except Exception:
+        frappe.log_error(
+            title=_(
+                "Failed to Extend Validity of Scheduled e-Waybill #{ewb_no}"
+            ).format(ewb_no=e_waybill_data.e_waybill_number),
+            message=frappe.get_traceback(),
+        )
 
 
 def validate_data_before_schedule(doc, values):
@@ -1,6 +1,9 @@
+from copy import copy
 from io import BytesIO
+from itertools import chain
 
 import openpyxl
+from openpyxl.cell import Cell, WriteOnlyCell
 from openpyxl.formatting.rule import FormulaRule
 from openpyxl.styles import Alignment, Font, PatternFill
 from openpyxl.utils import get_column_letter
@@ -9,8 +12,14 @@ import frappe
 
 
 class ExcelExporter:
-    def __init__(self):
-        self.wb = openpyxl.Workbook()
+    def __init__(self, write_only=False):
+        """
+        :param write_only - stream rows to the file instead of holding the workbook
+            in memory. Rows are written as they are parsed, with styles built once
+            per column. Recommended for large exports.
+        """
+        self.write_only = write_only
+        self.wb = openpyxl.Workbook(write_only=write_only)
 
     def create_sheet(self, **kwargs):
         """
@@ -25,7 +34,8 @@ class ExcelExporter:
         :param data: A list of dictionary to append data to sheet
         """
 
-        Worksheet().create(workbook=self.wb, **kwargs)
+        worksheet = StreamingWorksheet() if self.write_only else Worksheet()
+        worksheet.create(workbook=self.wb, **kwargs)
 
     def save_workbook(self, file_name=None):
         """Save workbook"""
@@ -94,6 +104,9 @@ class Worksheet:
         self.row_dimension = 1
         self.column_dimension = 1
 
+        # style registry: (column, style key) => (style array, style)
+        self.cell_styles = {}
+
     def create(
         self,
         workbook,
@@ -109,6 +122,10 @@ class Worksheet:
         """Create worksheet"""
         self.headers = headers
 
+        # copy to avoid updating defaults of other worksheets
+        self.data_format = self.data_format.copy()
+        self.header_format = self.header_format.copy()
+
         if default_data_format:
             self.data_format.update(default_data_format)
 
@@ -135,9 +152,8 @@ class Worksheet:
 
         for row in self.parse_data(data):
             for idx, val in enumerate(row, 1):
-                cell = self.ws.cell(row=self.row_dimension, column=idx)
+                self.ws.cell(row=self.row_dimension, column=idx, value=val)
                 self.apply_format(row=self.row_dimension, column=idx, **kwargs)
-                cell.value = val
 
             self.row_dimension += 1
 
@@ -176,16 +192,57 @@ class Worksheet:
             if idx == 1:
                 total_row.append("Totals")
             elif column.get("fieldtype") in ("Float", "Int"):
-                cell_range = self.get_range(self.data_row, idx, self.ws.max_row, idx)
+                cell_range = self.get_range(self.data_row, idx, self.max_row, idx)
                 total_row.append(f"=SUM({cell_range})")
             else:
                 total_row.append("")
 
         return total_row
 
+    @property
+    def max_row(self):
+        """Last row added to the worksheet"""
+        return self.row_dimension - 1
+
     def apply_format(self, row, column, **kwargs):
         """Get style if defined or apply default format to the cell"""
 
+        style_array, style = self.get_cell_style(column, **kwargs)
+        if not style:
+            return
+
+        # copy as in openpyxl, so that cells can be styled independently
+        self.ws.cell(row=row, column=column)._style = copy(style_array)
+
+        if style.get("width"):
+            self.ws.column_dimensions[get_column_letter(column)].width = style.width
+
+        self.ws.row_dimensions[row].height = style.height
+
+    def get_cell_style(self, column, **kwargs):
+        """
+        Get style array of the cell from the style registry
+
+        Font, Alignment and Fill are built once for every distinct
+        combination of column and style key (header, data, total, filter).
+        """
+
+        key = (column, *kwargs.items())
+        if key in self.cell_styles:
+            return self.cell_styles[key]
+
+        style_array = None
+        if style := self.get_style(column, **kwargs):
+            cell = Cell(self.ws)
+            self.set_cell_style(cell, style)
+            style_array = cell._style
+
+        self.cell_styles[key] = (style_array, style)
+        return self.cell_styles[key]
+
+    def get_style(self, column, **kwargs):
+        """Get default style updated with custom style of the column"""
+
         key, value = kwargs.popitem()
         if not value:
             return
@@ -207,12 +264,9 @@ class Worksheet:
                 }
             )
 
-        self.apply_style(row, column, style)
-
-    def apply_style(self, row, column, style):
-        """Apply style to cell"""
+        return style
 
-        cell = self.ws.cell(row=row, column=column)
+    def set_cell_style(self, cell, style):
         cell.font = Font(name=style.font_family, size=style.font_size, bold=style.bold)
         cell.alignment = Alignment(
             horizontal=style.horizontal,
@@ -224,11 +278,6 @@ class Worksheet:
         if style.bg_color:
             cell.fill = PatternFill(fill_type="solid", fgColor=style.bg_color)
 
-        if style.get("width"):
-            self.ws.column_dimensions[get_column_letter(column)].width = style.width
-
-        self.ws.row_dimensions[row].height = style.height
-
     def apply_conditional_formatting(self, has_totals):
         """Apply conditional formatting to data based on comparable fields as defined in headers"""
 
@@ -245,7 +294,7 @@ class Worksheet:
             cell_range = self.get_range(
                 start_row=self.data_row,
                 start_column=column,
-                end_row=self.ws.max_row - has_totals,
+                end_row=self.max_row - has_totals,
                 end_column=column,
             )
 
@@ -264,31 +313,34 @@ class Worksheet:
             )
 
     def parse_data(self, data):
-        """Convert data to List of Lists"""
-        out = []
+        """Convert data to rows (List of values), yielded one at a time"""
 
         if isinstance(data, dict):
             for key, value in data.items():
                 # eg: {"fieldname": "value"} => ["fieldname", "value"]. for filters.
-                out.append([key, value])
+                yield [key, value]
+
+            return
 
-        elif isinstance(data, list):
-            # eg: ["value1", "value2"] => ["value1", "value2"]. for totals.
-            if isinstance(data[0], str):
-                return [data]
+        # lists as well as generators of rows
+        rows = iter(data)
+        if (first_row := next(rows, None)) is None:
+            return
 
-            for row in data:
-                # eg: [{"label": "value1"}] => "value1". for headers.
-                if row.get("label"):
-                    out.append(row.get("label"))
-                else:
-                    # eg: [{"fieldname1": "value1", "fieldname2": "value2"}] => ["value1", "value2"]. for data.
-                    out.append([row.get(field["fieldname"]) for field in self.headers])
+        # eg: ["value1", "value2"] => ["value1", "value2"]. for totals.
+        if isinstance(first_row, str):
+            yield data
+            return
 
-            if row.get("label"):
-                return [out]
+        # eg: [{"label": "value1"}] => ["value1"]. for headers.
+        if first_row.get("label"):
+            yield [row.get("label") for row in chain((first_row,), rows)]
+            return
 
-        return out
+        # eg: [{"fieldname1": "value1", "fieldname2": "value2"}] => ["value1", "value2"]. for data.
+        fieldnames = [field["fieldname"] for field in self.headers]
+        for row in chain((first_row,), rows):
+            yield [row.get(fieldname) for fieldname in fieldnames]
 
     def get_range(self, start_row, start_column, end_row, end_column, freeze=False):
         """
@@ -321,3 +373,93 @@ class Worksheet:
         for idx, field in enumerate(self.headers, 1):
             if field["fieldname"] == column_name:
                 return idx
+
+
+class StreamingWorksheet(Worksheet):
+    """
+    Worksheet of a write-only workbook
+
+    - Rows are written to the file as they are parsed and cannot be revisited.
+    - Style of each column is taken from the style registry.
+    - Column widths and default row height are set before the first row.
+    """
+
+    def add_data(self, data, **kwargs):
+        if not data:
+            return
+
+        if kwargs.get("is_data"):
+            self.data_row = self.row_dimension
+
+        for row in self.parse_data(data):
+            height = None
+            cells = []
+
+            for idx, val in enumerate(row, 1):
+                cell, height = self.get_cell(val, idx, **kwargs)
+                cells.append(cell)
+
+            # data rows use default row height of the worksheet
+            self.append_row(cells, height=None if kwargs.get("is_data") else height)
+
+    def add_merged_header(self, merged_headers):
+        if not merged_headers:
+            return
+
+        height = None
+        cells = {}
+
+        for key, value in merged_headers.items():
+            merge_from_idx = self.get_column_index(value[0])
+            merge_to_idx = self.get_column_index(value[1])
+
+            cell_range = self.get_range(
+                start_row=self.row_dimension,
+                start_column=merge_from_idx,
+                end_row=self.row_dimension,
+                end_column=merge_to_idx,
+            )
+
+            self.ws.merged_cells.add(cell_range)
+            cells[merge_from_idx], height = self.get_cell(
+                key, merge_from_idx, is_header=True
+            )
+
+        self.append_row(
+            [cells.get(idx) for idx in range(1, max(cells) + 1)], height=height
+        )
+
+    def append_row(self, cells, height=None):
+        if self.row_dimension == 1:
+            self.set_sheet_dimensions()
+
+        if height:
+            self.ws.row_dimensions[self.row_dimension].height = height
+
+        self.ws.append(cells)
+        self.row_dimension += 1
+
+    def set_sheet_dimensions(self):
+        """Column dimensions cannot be set once rows are written"""
+
+        for idx in range(1, len(self.headers) + 1):
+            for key in ("is_header", "is_data"):
+                style = self.get_style(idx, **{key: True})
+                if style.get("width"):
+                    column = get_column_letter(idx)
+                    self.ws.column_dimensions[column].width = style.width
+
+        self.ws.sheet_format.defaultRowHeight = self.data_format.height
+        self.ws.sheet_format.customHeight = True
+
+    def get_cell(self, value, column, **kwargs):
+        """Returns cell with style of the column and height of the style"""
+
+        cell = WriteOnlyCell(self.ws, value)
+        style_array, style = self.get_cell_style(column, **kwargs)
+
+        if not style:
+            return cell, None
+
+        cell._style = copy(style_array)
+        return cell, style.height
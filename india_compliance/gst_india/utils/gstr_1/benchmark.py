@@ -0,0 +1,511 @@
+"""
+Benchmarks for GSTR-1 with synthetic data
+
+Run on a test site, eg:
+    bench --site test_site execute \
+        india_compliance.gst_india.utils.gstr_1.benchmark.benchmark_json_map \
+        --kwargs "{'invoices': 10000}"
+
+    bench --site test_site execute \
+        india_compliance.gst_india.utils.gstr_1.benchmark.benchmark_gstr1_pipeline \
+        --kwargs "{'b2b': 20000, 'b2cs': 5000}"
+"""
+
+import copy
+import time
+import tracemalloc
+from datetime import date
+
+import frappe
+
+from india_compliance.gst_india.doctype.gst_return_log.generate_gstr_1 import (
+    GenerateGSTR1,
+)
+from india_compliance.gst_india.utils.gstr_1 import (
+    GovDataField,
+    GovJsonKey,
+    GSTR1_DataField,
+    GSTR1_SubCategory,
+)
+from india_compliance.gst_india.utils.gstr_1.gstr_1_data import GSTR1Invoices
+from india_compliance.gst_india.utils.gstr_1.gstr_1_json_map import (
+    GSTR1BooksData,
+    convert_to_gov_data_format,
+    convert_to_internal_data_format,
+)
+
+COMPANY_GSTIN = "24AAQCA8719H1ZC"
+CUSTOMERS = 100
+DOCUMENT_DATE = "15-07-2024"
+POSTING_DATE = date(2024, 7, 15)
+
+# share of invoices in each category
+INVOICE_MIX = {
+    GovJsonKey.B2B.value: 0.7,
+    GovJsonKey.B2CL.value: 0.1,
+    GovJsonKey.EXP.value: 0.1,
+    GovJsonKey.CDNR.value: 0.1,
+}
+
+
+def benchmark_json_map(invoices=10000, runs=3):
+    """
+    Throughput of mapping Gov data to internal data format and back
+    """
+    gov_data = get_gov_data(invoices)
+    internal_data = convert_to_internal_data_format(gov_data)
+    normalized_data = GenerateGSTR1.normalize_data(internal_data)
+
+    results = {
+        "convert_to_internal_data_format": time_function(
+            convert_to_internal_data_format, gov_data, runs=runs
+        ),
+        "convert_to_gov_data_format": time_function(
+            convert_to_gov_data_format, normalized_data, COMPANY_GSTIN, runs=runs
+        ),
+    }
+
+    for function, seconds in results.items():
+        results[function] = frappe._dict(
+            seconds=seconds,
+            seconds_per_10k=seconds * 10000 / invoices,
+            invoices_per_second=invoices / seconds if seconds else 0,
+        )
+
+        print(
+            f"{function}: {results[function].seconds_per_10k:.3f}s per 10k invoices"
+            f" ({results[function].invoices_per_second:.0f} invoices/s)"
+        )
+
+    return results
+
+
+def benchmark_gstr1_pipeline(
+    b2b=7000,
+    b2cs=1000,
+    cdnr=1000,
+    exports=1000,
+    hsn_codes=100,
+    items=2,
+    filters=None,
+    trace_memory=True,
+):
+    """
+    Time and peak memory of each stage of `GenerateGSTR1.generate_gstr1_data`
+
+    Books data is mapped from synthetic invoice rows for the given number of
+    invoices (with `items` each) and Gov data is derived from it, with some rows
+    mismatched or missing. Stages after mapping use this data.
+
+    :param filters: company, company_gstin, from_date and to_date to also time
+        the queries and `GSTR1BooksData.prepare_mapped_data` on invoices in the site
+    :param trace_memory: record peak memory (tracing slows down each stage)
+    """
+    results = {}
+
+    def run_stage(stage, function, *args):
+        return run_benchmark_stage(results, stage, function, *args, trace=trace_memory)
+
+    if filters:
+        run_stage(
+            "query",
+            GSTR1Invoices(frappe._dict(filters)).get_invoices_for_item_wise_summary,
+        )
+        run_stage(
+            "get_hsn_wise_totals",
+            GSTR1Invoices(frappe._dict(filters)).get_hsn_wise_totals,
+        )
+        run_stage(
+            "prepare_mapped_data",
+            GSTR1BooksData(frappe._dict(filters)).prepare_mapped_data,
+        )
+
+    _filters = frappe._dict(filters or {"company_gstin": COMPANY_GSTIN})
+    invoices = get_invoice_rows(b2b, b2cs, cdnr, exports, hsn_codes, items)
+
+    run_stage("process_invoices", GSTR1Invoices(_filters).process_invoices, invoices)
+    books_data = run_stage(
+        "map_invoice_rows", get_books_data_from_rows, _filters, invoices
+    )
+
+    gov_data = get_gov_data_from_books(books_data)
+    return_log = BenchmarkReturnLog()
+
+    reconcile_data = run_stage(
+        "get_reconcile_gstr1_data",
+        return_log.get_reconcile_gstr1_data,
+        gov_data,
+        books_data,
+    )
+    books_data["aggregate_data"] = run_stage(
+        "get_aggregate_data", return_log.get_aggregate_data, books_data
+    )
+
+    data = {
+        "reconcile": return_log.normalize_data(reconcile_data),
+        "unfiled": return_log.normalize_data(gov_data),
+        "books": return_log.normalize_data(books_data),
+    }
+    run_stage("summarize_data", return_log.summarize_data, data)
+
+    for stage, result in results.items():
+        memory = (
+            f", peak memory {result.peak_memory / 1024**2:.1f} MB"
+            if trace_memory
+            else ""
+        )
+        print(f"{stage}: {result.seconds:.3f}s{memory}")
+
+    return results
+
+
+class BenchmarkReturnLog(GenerateGSTR1):
+    """GST Return Log that does not save data to files or reuse reconciled data"""
+
+    def __init__(self):
+        self.filing_status = "Not Filed"
+        self.is_latest_data = 0
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def update_json_for(self, *args, **kwargs):
+        pass
+
+    def get_reconciled_subcategories(self):
+        return {}
+
+    def set_reconciled_subcategories(self, *args):
+        pass
+
+
+def run_benchmark_stage(results, stage, function, *args, trace=True):
+    if trace:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+
+    try:
+        return function(*args)
+
+    finally:
+        results[stage] = frappe._dict(seconds=time.perf_counter() - start)
+
+        if trace:
+            results[stage].peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+
+def time_function(function, *args, runs=3):
+    """Best of `runs`, in seconds"""
+    timings = []
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+# SYNTHETIC DATA
+
+
+def get_invoice_rows(
+    b2b=7000, b2cs=1000, cdnr=1000, exports=1000, hsn_codes=100, items=2
+):
+    """
+    Item-wise rows of invoices,
+    as returned by `GSTR1Invoices.get_invoices_for_item_wise_summary`
+    """
+    rows = []
+
+    def add_invoice(invoice_no, **invoice):
+        for idx in range(items):
+            hsn_code = f"{1001 + (len(rows) % hsn_codes)}"
+            rows.append(
+                frappe._dict(
+                    {
+                        "item_code": f"ITEM-{hsn_code}",
+                        "qty": 1,
+                        "gst_hsn_code": hsn_code,
+                        "stock_uom": "Nos",
+                        "billing_address_gstin": None,
+                        "company_gstin": COMPANY_GSTIN,
+                        "customer_name": "_Test Customer",
+                        "invoice_no": invoice_no,
+                        "posting_date": POSTING_DATE,
+                        "place_of_supply": "24-Gujarat",
+                        "is_reverse_charge": 0,
+                        "ecommerce_gstin": "",
+                        "is_export_with_gst": 0,
+                        "is_return": 0,
+                        "is_debit_note": 0,
+                        "return_against": None,
+                        "invoice_total": 1180 * items,
+                        "returned_invoice_total": 0,
+                        "gst_category": "Unregistered",
+                        "gst_treatment": "Taxable",
+                        "gst_rate": 18 if idx % 2 == 0 else 5,
+                        "taxable_value": 1000,
+                        "cgst_amount": 90,
+                        "sgst_amount": 90,
+                        "igst_amount": 0,
+                        "cess_amount": 0,
+                        "cess_non_advol_amount": 0,
+                        "total_cess_amount": 0,
+                        "total_tax": 180,
+                        "total_amount": 1180,
+                        **invoice,
+                    }
+                )
+            )
+
+    for idx in range(b2b):
+        add_invoice(
+            f"B2B-{idx}",
+            billing_address_gstin=f"24AABCU{idx % CUSTOMERS:04d}R1ZX",
+            gst_category="Registered Regular",
+        )
+
+    for idx in range(b2cs):
+        add_invoice(f"B2CS-{idx}")
+
+    for idx in range(cdnr):
+        add_invoice(
+            f"CDNR-{idx}",
+            billing_address_gstin=f"24AABCU{idx % CUSTOMERS:04d}R1ZX",
+            gst_category="Registered Regular",
+            is_return=1,
+            return_against=f"B2B-{idx}",
+            invoice_total=-1180 * items,
+            returned_invoice_total=1180 * items,
+            taxable_value=-1000,
+            cgst_amount=-90,
+            sgst_amount=-90,
+            total_tax=-180,
+            total_amount=-1180,
+        )
+
+    for idx in range(exports):
+        add_invoice(
+            f"EXP-{idx}",
+            place_of_supply="96-Other Countries",
+            gst_category="Overseas",
+            invoice_total=1000 * items,
+            cgst_amount=0,
+            sgst_amount=0,
+            total_tax=0,
+            total_amount=1000,
+        )
+
+    return rows
+
+
+def get_books_data_from_rows(filters, invoices):
+    """
+    Books data for categories derived from invoice rows, without any queries.
+
+    Unlike `GSTR1BooksData.prepare_mapped_data`, HSN Summary is aggregated from
+    invoice rows here instead of `GSTR1Invoices.get_hsn_wise_totals` (in the
+    database), and other categories (advances, documents issued) are skipped.
+    """
+    mapper = GSTR1BooksData(filters)
+    mapper.hsn_descriptions = {}
+
+    books_data = {}
+    mapper.process_invoices(invoices, books_data)
+
+    hsn_data = books_data.setdefault(GSTR1_SubCategory.HSN.value, {})
+    for invoice in invoices:
+        mapper.process_data_for_hsn_summary(invoice, hsn_data)
+
+    return books_data
+
+
+def get_gov_data_from_books(books_data, mismatch_every=10, missing_every=25):
+    """
+    Gov data (in internal data format) same as books data,
+    except for some mismatched and missing rows
+    """
+    gov_data = copy.deepcopy(books_data)
+
+    for subcategory_data in gov_data.values():
+        for idx, key in enumerate(list(subcategory_data)):
+            if idx % missing_every == 0:
+                del subcategory_data[key]
+                continue
+
+            if idx % mismatch_every == 0:
+                row = subcategory_data[key]
+                row = row[0] if isinstance(row, list) else row
+                taxable_value = GSTR1_DataField.TAXABLE_VALUE.value
+                row[taxable_value] = row.get(taxable_value, 0) + 1
+
+    return gov_data
+
+
+def get_gov_data(invoices):
+    """
+    Gov data (as downloaded from GST Portal) with given number of invoices,
+    split across categories as per INVOICE_MIX
+    """
+    counts = {
+        category: int(invoices * share) for category, share in INVOICE_MIX.items()
+    }
+
+    return {
+        GovJsonKey.B2B.value: get_b2b_data(counts[GovJsonKey.B2B.value]),
+        GovJsonKey.B2CL.value: get_b2cl_data(counts[GovJsonKey.B2CL.value]),
+        GovJsonKey.EXP.value: get_export_data(counts[GovJsonKey.EXP.value]),
+        GovJsonKey.CDNR.value: get_cdnr_data(counts[GovJsonKey.CDNR.value]),
+        GovJsonKey.B2CS.value: get_b2cs_data(),
+        GovJsonKey.HSN.value: get_hsn_data(),
+    }
+
+
+def get_b2b_data(invoices):
+    customers = {}
+
+    for idx in range(invoices):
+        customer_gstin = f"24AABCU{idx % CUSTOMERS:04d}R1ZX"
+        customers.setdefault(customer_gstin, []).append(
+            {
+                GovDataField.DOC_NUMBER.value: f"B2B-{idx}",
+                GovDataField.DOC_DATE.value: DOCUMENT_DATE,
+                GovDataField.DOC_VALUE.value: 2360,
+                GovDataField.POS.value: "24",
+                GovDataField.REVERSE_CHARGE.value: "N",
+                GovDataField.INVOICE_TYPE.value: "R",
+                GovDataField.ITEMS.value: get_gov_items(intra_state=True),
+            }
+        )
+
+    return [
+        {
+            GovDataField.CUST_GSTIN.value: customer_gstin,
+            GovDataField.INVOICES.value: customer_invoices,
+        }
+        for customer_gstin, customer_invoices in customers.items()
+    ]
+
+
+def get_b2cl_data(invoices):
+    return [
+        {
+            GovDataField.POS.value: "29",
+            GovDataField.INVOICES.value: [
+                {
+                    GovDataField.DOC_NUMBER.value: f"B2CL-{idx}",
+                    GovDataField.DOC_DATE.value: DOCUMENT_DATE,
+                    GovDataField.DOC_VALUE.value: 295000,
+                    GovDataField.ITEMS.value: get_gov_items(),
+                }
+                for idx in range(invoices)
+            ],
+        }
+    ]
+
+
+def get_export_data(invoices):
+    return [
+        {
+            GovDataField.EXPORT_TYPE.value: "WPAY",
+            GovDataField.INVOICES.value: [
+                {
+                    GovDataField.DOC_NUMBER.value: f"EXP-{idx}",
+                    GovDataField.DOC_DATE.value: DOCUMENT_DATE,
+                    GovDataField.DOC_VALUE.value: 2360,
+                    GovDataField.SHIPPING_PORT_CODE.value: "INMUN1",
+                    GovDataField.SHIPPING_BILL_NUMBER.value: f"SB-{idx}",
+                    GovDataField.SHIPPING_BILL_DATE.value: DOCUMENT_DATE,
+                    GovDataField.ITEMS.value: [
+                        item[GovDataField.ITEM_DETAILS.value]
+                        for item in get_gov_items()
+                    ],
+                }
+                for idx in range(invoices)
+            ],
+        }
+    ]
+
+
+def get_cdnr_data(notes):
+    customers = {}
+
+    for idx in range(notes):
+        customer_gstin = f"24AABCU{idx % CUSTOMERS:04d}R1ZX"
+        customers.setdefault(customer_gstin, []).append(
+            {
+                GovDataField.NOTE_TYPE.value: "C",
+                GovDataField.NOTE_NUMBER.value: f"CDNR-{idx}",
+                GovDataField.NOTE_DATE.value: DOCUMENT_DATE,
+                GovDataField.DOC_VALUE.value: 2360,
+                GovDataField.POS.value: "24",
+                GovDataField.REVERSE_CHARGE.value: "N",
+                GovDataField.INVOICE_TYPE.value: "R",
+                GovDataField.ITEMS.value: get_gov_items(intra_state=True),
+            }
+        )
+
+    return [
+        {
+            GovDataField.CUST_GSTIN.value: customer_gstin,
+            GovDataField.NOTE_DETAILS.value: customer_notes,
+        }
+        for customer_gstin, customer_notes in customers.items()
+    ]
+
+
+def get_b2cs_data(rows=50):
+    return [
+        {
+            GovDataField.TYPE.value: "OE",
+            GovDataField.POS.value: f"{idx % 37 + 1:02d}",
+            GovDataField.TAX_RATE.value: 18,
+            GovDataField.TAXABLE_VALUE.value: 10000,
+            GovDataField.IGST.value: 1800,
+            GovDataField.CESS.value: 0,
+        }
+        for idx in range(rows)
+    ]
+
+
+def get_hsn_data(rows=100):
+    return {
+        GovDataField.HSN_DATA.value: [
+            {
+                GovDataField.INDEX.value: idx + 1,
+                GovDataField.HSN_CODE.value: f"{1001 + idx}",
+                GovDataField.DESCRIPTION.value: "Goods",
+                GovDataField.UOM.value: "NOS",
+                GovDataField.QUANTITY.value: 10,
+                GovDataField.TAX_RATE.value: 18,
+                GovDataField.TAXABLE_VALUE.value: 10000,
+                GovDataField.IGST.value: 1800,
+                GovDataField.CESS.value: 0,
+            }
+            for idx in range(rows)
+        ]
+    }
+
+
+def get_gov_items(items=2, intra_state=False):
+    tax_amounts = (
+        {GovDataField.CGST.value: 90, GovDataField.SGST.value: 90}
+        if intra_state
+        else {GovDataField.IGST.value: 180}
+    )
+
+    return [
+        {
+            GovDataField.INDEX.value: idx + 1,
+            GovDataField.ITEM_DETAILS.value: {
+                GovDataField.TAX_RATE.value: 18,
+                GovDataField.TAXABLE_VALUE.value: 1000,
+                GovDataField.CESS.value: 0,
+                **tax_amounts,
+            },
+        }
+        for idx in range(items)
+    ]
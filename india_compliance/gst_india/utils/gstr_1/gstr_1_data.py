@@ -3,9 +3,10 @@
 from itertools import combinations
 
 from pypika import Order
+from pypika.terms import Case
 
 import frappe
-from frappe.query_builder.functions import Date, IfNull, Sum
+from frappe.query_builder.functions import IfNull, Sum
 from frappe.utils import getdate
 
 from india_compliance.gst_india.utils import get_full_gst_uom
@@ -53,6 +54,14 @@ CATEGORY_CONDITIONS = {
     },
 }
 
+# fields set on invoice rows by `GSTR1Invoices.assign_categories`
+CLASSIFICATION_FIELDS = (
+    "invoice_category",
+    "invoice_sub_category",
+    "invoice_type",
+    "ecommerce_supply_type",
+)
+
 
 class GSTR1Query:
     def __init__(
@@ -159,26 +168,28 @@ class GSTR1Query:
         if self.filters.company_gstin:
             query = query.where(self.si.company_gstin == self.filters.company_gstin)
 
+        # posting date is not wrapped in functions, so that index can be used
         if self.filters.from_date:
-            query = query.where(
-                Date(self.si.posting_date) >= getdate(self.filters.from_date)
-            )
+            query = query.where(self.si.posting_date >= getdate(self.filters.from_date))
 
         if self.filters.to_date:
-            query = query.where(
-                Date(self.si.posting_date) <= getdate(self.filters.to_date)
-            )
+            query = query.where(self.si.posting_date <= getdate(self.filters.to_date))
+
+        if self.filters.invoice_names:
+            query = query.where(self.si.name.isin(list(self.filters.invoice_names)))
 
         return query
 
 
 def cache_invoice_condition(func):
+    name = func.__name__
+
     def wrapped(self, invoice):
-        if (cond := self.invoice_conditions.get(func.__name__)) is not None:
+        if (cond := self.invoice_conditions.get(name)) is not None:
             return cond
 
         cond = func(self, invoice)
-        self.invoice_conditions[func.__name__] = cond
+        self.invoice_conditions[name] = cond
         return cond
 
     return wrapped
@@ -391,13 +402,44 @@ class GSTR1Invoices(GSTR1Query, GSTR1Subcategory):
     def __init__(self, filters=None):
         super().__init__(filters)
 
+        # category => (condition, sub category setter), in order of precedence
+        self.category_functions = {
+            category: (
+                getattr(self, functions["category"]),
+                getattr(self, functions["sub_category"]),
+            )
+            for category, functions in CATEGORY_CONDITIONS.items()
+        }
+
     def process_invoices(self, invoices):
-        settings = frappe.get_cached_doc("GST Settings")
-        identified_uom = {}
+        """
+        Items of an invoice with the same GST treatment are classified alike,
+        hence invoices are classified once and the result is reused for such items.
+        """
+        classifications = {}
+
         for invoice in invoices:
+            key = (invoice.invoice_no, invoice.gst_treatment)
+
+            if invoice.invoice_no and (classification := classifications.get(key)):
+                invoice.update(classification)
+                continue
+
             self.invoice_conditions = {}
             self.assign_categories(invoice)
 
+            classifications[key] = {
+                field: invoice[field]
+                for field in CLASSIFICATION_FIELDS
+                if field in invoice
+            }
+
+        self.set_gst_uom(invoices)
+
+    def set_gst_uom(self, invoices):
+        settings = frappe.get_cached_doc("GST Settings")
+        identified_uom = {}
+        for invoice in invoices:
             if invoice.gst_hsn_code and invoice.gst_hsn_code.startswith("99"):
                 invoice["stock_uom"] = "OTH-OTHERS"
                 invoice["qty"] = 0
@@ -420,15 +462,14 @@ class GSTR1Invoices(GSTR1Query, GSTR1Subcategory):
             self.set_for_ecommerce_supply_type(invoice)
 
     def set_invoice_category(self, invoice):
-        for category, functions in CATEGORY_CONDITIONS.items():
-            if getattr(self, functions["category"], None)(invoice):
+        for category, (condition, _) in self.category_functions.items():
+            if condition(invoice):
                 invoice.invoice_category = category
                 return
 
     def set_invoice_sub_category_and_type(self, invoice):
-        category = invoice.invoice_category
-        function = CATEGORY_CONDITIONS[category]["sub_category"]
-        getattr(self, function, None)(invoice)
+        _, set_sub_category = self.category_functions[invoice.invoice_category]
+        set_sub_category(invoice)
 
     def get_invoices_for_item_wise_summary(self):
         query = self.get_base_query()
@@ -464,6 +505,42 @@ class GSTR1Invoices(GSTR1Query, GSTR1Subcategory):
 
         return query.run(as_dict=True)
 
+    def get_hsn_wise_totals(self):
+        """
+        Item totals grouped by HSN Code, UOM and Tax Rate across all invoices
+
+        Services (HSN Code starting with 99) are grouped under UOM OTH-OTHERS
+        without quantity in the query itself, so that only summary rows are returned.
+        """
+        query = self.get_base_query()
+
+        is_service = query.gst_hsn_code.like("99%")
+        stock_uom = Case().when(is_service, "OTH-OTHERS").else_(query.stock_uom)
+        qty = Case().when(is_service, 0).else_(query.qty)
+
+        query = (
+            frappe.qb.from_(query)
+            .select(
+                query.gst_hsn_code,
+                stock_uom.as_("stock_uom"),
+                query.gst_rate,
+                Sum(qty).as_("qty"),
+                Sum(query.taxable_value).as_("taxable_value"),
+                Sum(query.cgst_amount).as_("cgst_amount"),
+                Sum(query.sgst_amount).as_("sgst_amount"),
+                Sum(query.igst_amount).as_("igst_amount"),
+                Sum(query.cess_amount).as_("cess_amount"),
+            )
+            .groupby(query.gst_hsn_code, stock_uom, query.gst_rate)
+        )
+
+        invoices = query.run(as_dict=True)
+
+        # map stock UOM of goods to GST UOM
+        self.set_gst_uom(invoices)
+
+        return invoices
+
     def get_filtered_invoices(
         self, invoices, invoice_category=None, invoice_sub_category=None
     ):
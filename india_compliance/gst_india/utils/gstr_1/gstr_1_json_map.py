@@ -1,4 +1,5 @@
 from datetime import datetime
+from functools import lru_cache
 
 import frappe
 from frappe.utils import flt
@@ -72,6 +73,7 @@ class GovDataMapper:
 
         self.value_formatters_for_internal = {}
         self.value_formatters_for_gov = {}
+        self.field_mappings = {}
         self.gstin_party_map = {}
         # value formatting constants
 
@@ -100,55 +102,78 @@ class GovDataMapper:
         if default_data:
             output.update(default_data)
 
-        key_mapping = self.KEY_MAPPING.copy()
-
-        if for_gov:
-            key_mapping = self.reverse_dict(key_mapping)
-
-        value_formatters = (
-            self.value_formatters_for_gov
-            if for_gov
-            else self.value_formatters_for_internal
-        )
-
-        for old_key, new_key in key_mapping.items():
+        for (
+            old_key,
+            new_key,
+            value_formatter,
+            discard_if_zero,
+            is_float,
+        ) in self.get_field_mapping(for_gov):
             invoice_data_value = data.get(old_key, "")
 
-            if not for_gov and old_key == "flag":
-                continue
-
-            if new_key in self.DISCARD_IF_ZERO_FIELDS and not invoice_data_value:
+            if discard_if_zero and not invoice_data_value:
                 continue
 
             if not (invoice_data_value or invoice_data_value == 0):
                 # continue if value is None or empty object
                 continue
 
-            value_formatter = value_formatters.get(old_key)
+            if value_formatter:
+                invoice_data_value = value_formatter(invoice_data_value, data)
 
-            if callable(value_formatter):
-                output[new_key] = value_formatter(invoice_data_value, data)
-            else:
-                output[new_key] = invoice_data_value
+            if is_float:
+                invoice_data_value = flt(invoice_data_value, 2)
 
-            if new_key in self.FLOAT_FIELDS:
-                output[new_key] = flt(output[new_key], 2)
+            output[new_key] = invoice_data_value
 
         return output
 
+    def get_field_mapping(self, for_gov=False):
+        """
+        Key mapping compiled once for each direction, as a list of
+        (old key, new key, value formatter, discard if zero, is float)
+        """
+        if for_gov in self.field_mappings:
+            return self.field_mappings[for_gov]
+
+        if for_gov:
+            key_mapping = self.reverse_dict(self.KEY_MAPPING)
+            value_formatters = self.value_formatters_for_gov
+        else:
+            key_mapping = self.KEY_MAPPING
+            value_formatters = self.value_formatters_for_internal
+
+        field_mapping = []
+        for old_key, new_key in key_mapping.items():
+            if not for_gov and old_key == "flag":
+                continue
+
+            value_formatter = value_formatters.get(old_key)
+
+            field_mapping.append(
+                (
+                    old_key,
+                    new_key,
+                    value_formatter if callable(value_formatter) else None,
+                    new_key in self.DISCARD_IF_ZERO_FIELDS,
+                    new_key in self.FLOAT_FIELDS,
+                )
+            )
+
+        self.field_mappings[for_gov] = field_mapping
+        return field_mapping
+
     # common utils
 
     def update_totals(self, invoice, items):
         """
         Update item totals to the invoice row
         """
-        total_data = self.TOTAL_DEFAULTS.copy()
-
         for item in items:
             for field, value in item.items():
                 total_field = f"total_{field}"
 
-                if total_field not in total_data:
+                if total_field not in self.TOTAL_DEFAULTS:
                     continue
 
                 invoice[total_field] = invoice.setdefault(total_field, 0) + value
@@ -195,10 +220,16 @@ class GovDataMapper:
         )
 
     def format_date_for_internal(self, date, *args):
-        return datetime.strptime(date, "%d-%m-%Y").strftime("%Y-%m-%d")
+        return convert_date_format(date, "%d-%m-%Y", "%Y-%m-%d")
 
     def format_date_for_gov(self, date, *args):
-        return datetime.strptime(date, "%Y-%m-%d").strftime("%d-%m-%Y")
+        return convert_date_format(date, "%Y-%m-%d", "%d-%m-%Y")
+
+
+@lru_cache(maxsize=1024)
+def convert_date_format(date, from_format, to_format):
+    # few distinct dates in a return period
+    return datetime.strptime(date, from_format).strftime(to_format)
 
 
 class B2B(GovDataMapper):
@@ -1869,18 +1900,46 @@ def convert_to_internal_data_format(gov_data):
     Converts Gov data format to internal data format for all categories
     """
     output = {}
+    gstin_party_map = get_gstin_party_map(gov_data)
 
     for category, mapper_class in CLASS_MAP.items():
         if not gov_data.get(category):
             continue
 
-        output.update(
-            mapper_class().convert_to_internal_data_format(gov_data.get(category))
-        )
+        mapper = mapper_class()
+        mapper.gstin_party_map = gstin_party_map
+
+        output.update(mapper.convert_to_internal_data_format(gov_data.get(category)))
 
     return output
 
 
+def get_gstin_party_map(gov_data):
+    """
+    Customers for GSTINs in Gov data, fetched in a single query.
+    GSTINs not found are looked up individually while mapping.
+    """
+    gstins = {
+        row.get(GovDataField.CUST_GSTIN.value)
+        for category in (GovJsonKey.B2B.value, GovJsonKey.CDNR.value)
+        for row in gov_data.get(category) or []
+    }
+    gstins.discard(None)
+
+    if not gstins:
+        return {}
+
+    gstin_party_map = {}
+    for customer in frappe.get_all(
+        "Customer",
+        filters={"gstin": ("in", list(gstins))},
+        fields=("name", "gstin"),
+    ):
+        gstin_party_map.setdefault(customer.gstin, customer.name)
+
+    return gstin_party_map
+
+
 def get_category_wise_data(
     subcategory_wise_data: dict,
     mapping: dict = SUB_CATEGORY_GOV_CATEGORY_MAPPING,
@@ -2168,8 +2227,8 @@ class BooksDataMapper:
                 key,
                 {
                     GSTR1_DataField.HSN_CODE.value: invoice.gst_hsn_code,
-                    GSTR1_DataField.DESCRIPTION.value: frappe.db.get_value(
-                        "GST HSN Code", invoice.gst_hsn_code, "description"
+                    GSTR1_DataField.DESCRIPTION.value: self.get_hsn_description(
+                        invoice.gst_hsn_code
                     ),
                     GSTR1_DataField.UOM.value: invoice.stock_uom,
                     GSTR1_DataField.QUANTITY.value: 0,
@@ -2248,6 +2307,28 @@ class BooksDataMapper:
 
     # utils
 
+    def set_hsn_descriptions(self, hsn_codes):
+        self.hsn_descriptions = {}
+        hsn_codes = [hsn_code for hsn_code in hsn_codes if hsn_code]
+        if not hsn_codes:
+            return
+
+        self.hsn_descriptions = dict(
+            frappe.get_all(
+                "GST HSN Code",
+                filters={"name": ("in", hsn_codes)},
+                fields=("name", "description"),
+                as_list=True,
+            )
+        )
+
+    def get_hsn_description(self, hsn_code):
+        hsn_descriptions = getattr(self, "hsn_descriptions", None)
+        if hsn_descriptions is None:
+            return frappe.db.get_value("GST HSN Code", hsn_code, "description")
+
+        return hsn_descriptions.get(hsn_code)
+
     def update_totals(self, mapped_dict, invoice, for_qty=False):
         data_invoice_amount_map = {
             GSTR1_DataField.TAXABLE_VALUE.value: GSTR1_ItemField.TAXABLE_VALUE.value,
@@ -2277,6 +2358,14 @@ class GSTR1BooksData(BooksDataMapper):
     def __init__(self, filters):
         self.filters = filters
 
+    # aggregated across invoices, hence not updated invoice-wise
+    OTHER_CATEGORIES = (
+        GSTR1_Category.AT.value,
+        GSTR1_Category.TXP.value,
+        GSTR1_Category.HSN.value,
+        GSTR1_Category.DOC_ISSUE.value,
+    )
+
     def prepare_mapped_data(self):
         prepared_data = {}
 
@@ -2284,6 +2373,36 @@ class GSTR1BooksData(BooksDataMapper):
         data = _class.get_invoices_for_item_wise_summary()
         _class.process_invoices(data)
 
+        self.process_invoices(data, prepared_data)
+        self.prepare_other_categories(prepared_data)
+
+        return prepared_data
+
+    def update_mapped_data(self, prepared_data, invoice_names):
+        """
+        Updates previously prepared data for changed invoices only
+
+        - Rows of changed invoices are removed and prepared again
+          from their current state (cancelled invoices are not added back).
+        - Other categories are prepared afresh.
+        """
+        self.remove_invoices(prepared_data, invoice_names)
+
+        if invoice_names:
+            _class = GSTR1Invoices(
+                frappe._dict(self.filters, invoice_names=invoice_names)
+            )
+            data = _class.get_invoices_for_item_wise_summary()
+            _class.process_invoices(data)
+
+            self.process_invoices(data, prepared_data)
+            self.sort_invoices(prepared_data)
+
+        self.prepare_other_categories(prepared_data)
+
+        return prepared_data
+
+    def process_invoices(self, data, prepared_data):
         for invoice in data:
             if invoice.get("taxable_value") == 0:
                 continue
@@ -2301,18 +2420,70 @@ class GSTR1BooksData(BooksDataMapper):
             elif invoice["invoice_category"] == GSTR1_Category.B2CS.value:
                 self.process_data_for_b2cs(invoice, prepared_data)
 
+    def prepare_other_categories(self, prepared_data):
         other_categories = {
             GSTR1_Category.AT.value: self.prepare_advances_recevied_data(),
             GSTR1_Category.TXP.value: self.prepare_advances_adjusted_data(),
-            GSTR1_Category.HSN.value: self.prepare_hsn_data(data),
+            GSTR1_Category.HSN.value: self.prepare_hsn_data(),
             GSTR1_Category.DOC_ISSUE.value: self.prepare_document_issued_data(),
         }
 
         for category, data in other_categories.items():
             if data:
                 prepared_data[category] = data
+            else:
+                prepared_data.pop(category, None)
 
-        return prepared_data
+    def remove_invoices(self, prepared_data, invoice_names):
+        doc_number = GSTR1_DataField.DOC_NUMBER.value
+
+        for subcategory, subcategory_data in list(prepared_data.items()):
+            if subcategory in self.OTHER_CATEGORIES:
+                continue
+
+            for key, value in list(subcategory_data.items()):
+                if isinstance(value, list):
+                    value[:] = [
+                        row for row in value if row.get(doc_number) not in invoice_names
+                    ]
+                    is_removed = not value
+
+                else:
+                    is_removed = value.get(doc_number) in invoice_names
+
+                if is_removed:
+                    del subcategory_data[key]
+
+            if not subcategory_data:
+                del prepared_data[subcategory]
+
+    def sort_invoices(self, prepared_data):
+        """
+        Sort as per query (latest first), since updated invoices are appended
+        """
+
+        def get_sort_key(row):
+            return (
+                str(row[GSTR1_DataField.DOC_DATE.value]),
+                row[GSTR1_DataField.DOC_NUMBER.value],
+            )
+
+        for subcategory, subcategory_data in prepared_data.items():
+            if subcategory in self.OTHER_CATEGORIES:
+                continue
+
+            if not isinstance(next(iter(subcategory_data.values())), list):
+                prepared_data[subcategory] = dict(
+                    sorted(
+                        subcategory_data.items(),
+                        key=lambda item: get_sort_key(item[1]),
+                        reverse=True,
+                    )
+                )
+                continue
+
+            for rows in subcategory_data.values():
+                rows.sort(key=get_sort_key, reverse=True)
 
     def prepare_document_issued_data(self):
         doc_issued_data = {}
@@ -2323,8 +2494,11 @@ class GSTR1BooksData(BooksDataMapper):
 
         return doc_issued_data
 
-    def prepare_hsn_data(self, data):
+    def prepare_hsn_data(self):
+        """HSN Summary from totals aggregated in the database"""
         hsn_summary_data = {}
+        data = GSTR1Invoices(self.filters).get_hsn_wise_totals()
+        self.set_hsn_descriptions({row.gst_hsn_code for row in data})
 
         for row in data:
             self.process_data_for_hsn_summary(row, hsn_summary_data)
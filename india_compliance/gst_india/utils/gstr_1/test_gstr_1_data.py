@@ -0,0 +1,128 @@
+import re
+
+import frappe
+from frappe.tests import IntegrationTestCase
+
+from india_compliance.gst_india.utils.gstr_1 import GSTR1_DataField
+from india_compliance.gst_india.utils.gstr_1.gstr_1_data import GSTR1Invoices
+from india_compliance.gst_india.utils.gstr_1.gstr_1_json_map import GSTR1BooksData
+from india_compliance.gst_india.utils.tests import append_item, create_sales_invoice
+
+
+class TestGSTR1Query(IntegrationTestCase):
+    def test_query_plan_uses_indexes(self):
+        query = GSTR1Invoices(
+            frappe._dict(
+                company="_Test Indian Registered Company",
+                company_gstin="24AAQCA8719H1ZC",
+                from_date="2024-07-01",
+                to_date="2024-07-31",
+            )
+        ).get_base_query()
+
+        # functions on posting date prevent use of index for date range
+        self.assertIsNone(
+            re.search(r"(?i)date\(`tabSales Invoice`\.`posting_date`\)", str(query))
+        )
+
+        plan = {
+            row.table: row for row in frappe.db.sql(f"EXPLAIN {query}", as_dict=True)
+        }
+
+        self.assertIn(
+            "company_gstin_docstatus_posting_date_index",
+            plan["tabSales Invoice"].possible_keys or "",
+        )
+        self.assertIn("parent", plan["tabSales Invoice Item"].possible_keys or "")
+
+    def test_invoice_classification_for_items(self):
+        invoice = {
+            "invoice_no": "SINV-0001",
+            "company_gstin": "24AAQCA8719H1ZC",
+            "billing_address_gstin": "29AABCR1718E1ZL",
+            "place_of_supply": "29-Karnataka",
+            "gst_category": "Registered Regular",
+            "invoice_total": 1000,
+        }
+        items = [
+            frappe._dict(invoice, gst_treatment="Taxable"),
+            frappe._dict(invoice, gst_treatment="Nil-Rated"),
+            frappe._dict(invoice, gst_treatment="Taxable"),
+        ]
+
+        GSTR1Invoices(frappe._dict()).process_invoices(items)
+
+        self.assertListEqual(
+            [(item.invoice_sub_category, item.invoice_type) for item in items],
+            [
+                ("B2B Regular", "Regular B2B"),
+                (
+                    "Nil-Rated, Exempted, Non-GST",
+                    "Inter-State supplies to registered persons",
+                ),
+                ("B2B Regular", "Regular B2B"),
+            ],
+        )
+
+    def test_hsn_wise_totals(self):
+        """HSN Summary from totals is same as that prepared from item-wise rows"""
+        invoice = create_sales_invoice(do_not_save=1, is_in_state=True)
+        append_item(invoice, frappe._dict(qty=2))
+        append_item(invoice, frappe._dict(item_code="_Test Service Item", qty=3))
+        append_item(invoice, frappe._dict(item_code="_Test Service Item", qty=4))
+        invoice.submit()
+
+        # mixed stock UOMs for the same HSN Code
+        for item in (invoice.items[1], invoice.items[3]):
+            frappe.db.set_value("Sales Invoice Item", item.name, "stock_uom", "Kg")
+
+        filters = frappe._dict(
+            company=invoice.company,
+            company_gstin=invoice.company_gstin,
+            from_date=invoice.posting_date,
+            to_date=invoice.posting_date,
+        )
+
+        _class = GSTR1Invoices(filters)
+        items = _class.get_invoices_for_item_wise_summary()
+        _class.process_invoices(items)
+
+        books_data = GSTR1BooksData(filters)
+        expected_hsn_data = {}
+        for item in items:
+            books_data.process_data_for_hsn_summary(item, expected_hsn_data)
+
+        hsn_data = books_data.prepare_hsn_data()
+        self.assertDictEqual(round_values(hsn_data), round_values(expected_hsn_data))
+
+        # services are summarised under OTH-OTHERS without quantity
+        service_rows = [
+            row
+            for row in hsn_data.values()
+            if row[GSTR1_DataField.HSN_CODE.value] == "999900"
+        ]
+        self.assertEqual(len(service_rows), 1)
+        self.assertEqual(service_rows[0][GSTR1_DataField.UOM.value], "OTH-OTHERS")
+        self.assertEqual(service_rows[0][GSTR1_DataField.QUANTITY.value], 0)
+
+        # goods are summarised for each UOM
+        self.assertEqual(
+            len(
+                [
+                    row
+                    for row in hsn_data.values()
+                    if row[GSTR1_DataField.HSN_CODE.value] == "61149090"
+                ]
+            ),
+            2,
+        )
+
+
+def round_values(hsn_data):
+    return {
+        key: {
+            field: round(value, 2) if isinstance(value, float) else value
+            for field, value in row.items()
+        }
+        for key, row in hsn_data.items()
+    }
@@ -1,3 +1,5 @@
+import threading
+from collections import defaultdict
 from enum import Enum
 
 import frappe
@@ -10,8 +12,10 @@ from india_compliance.gst_india.doctype.gstr_import_log.gstr_import_log import (
     create_import_log,
 )
 from india_compliance.gst_india.utils import get_party_for_gstin
+from india_compliance.gst_india.utils.concurrency import iter_concurrently
 from india_compliance.gst_india.utils.gstr_2 import gstr_2a, gstr_2b
 from india_compliance.gst_india.utils.gstr_utils import ReturnType
+from india_compliance.gst_india.utils.progress import ProgressReporter
 
 
 class GSTRCategory(Enum):
@@ -42,37 +46,40 @@ GSTR_MODULES = {
 
 IMPORT_CATEGORY = ("IMPG", "IMPGSEZ")
 
+# GSP rate limits are applied per GSTIN
+MAX_CONCURRENT_REQUESTS = 4
+REQUEST_SLOTS = defaultdict(lambda: threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS))
+REQUEST_SLOTS_LOCK = threading.Lock()
+
 
 def download_gstr_2a(gstin, return_periods, gst_categories=None):
-    total_expected_requests = len(return_periods) * len(ACTIONS)
-    requests_made = 0
+    progress = get_api_progress_reporter(len(return_periods) * len(ACTIONS))
     queued_message = False
 
     return_type = ReturnType.GSTR2A
-    api = GSTR2aAPI(gstin)
+    responses = fetch_data(
+        GSTR2aAPI,
+        gstin,
+        [
+            (action, return_period)
+            for return_period in return_periods
+            for action, category in ACTIONS.items()
+            if not gst_categories or category.value in gst_categories
+        ],
+    )
+
     for return_period in return_periods:
         is_last_period = return_periods[-1] == return_period
 
         json_data = frappe._dict({"gstin": gstin, "fp": return_period})
         has_data = False
         for action, category in ACTIONS.items():
-            requests_made += 1
-
-            frappe.publish_realtime(
-                "update_api_progress",
-                {
-                    "current_progress": requests_made * 100 / total_expected_requests,
-                    "return_period": return_period,
-                    "is_last_period": is_last_period,
-                },
-                user=frappe.session.user,
-                doctype="Purchase Reconciliation Tool",
-            )
+            progress.update(return_period=return_period, is_last_period=is_last_period)
 
             if gst_categories and category.value not in gst_categories:
                 continue
 
-            response = api.get_data(action, return_period)
+            response = next(responses)
 
             if response.error_type == "no_docs_found":
                 create_import_log(
@@ -123,27 +130,19 @@ def download_gstr_2a(gstin, return_periods, gst_categories=None):
 
 
 def download_gstr_2b(gstin, return_periods):
-    total_expected_requests = len(return_periods)
-    requests_made = 0
+    progress = get_api_progress_reporter(len(return_periods))
     queued_message = False
 
-    api = GSTR2bAPI(gstin)
+    responses = fetch_data(
+        GSTR2bAPI, gstin, [(return_period,) for return_period in return_periods]
+    )
+
     for return_period in return_periods:
         has_data = False
         is_last_period = return_periods[-1] == return_period
-        requests_made += 1
-        frappe.publish_realtime(
-            "update_api_progress",
-            {
-                "current_progress": requests_made * 100 / total_expected_requests,
-                "return_period": return_period,
-                "is_last_period": is_last_period,
-            },
-            user=frappe.session.user,
-            doctype="Purchase Reconciliation Tool",
-        )
+        progress.update(return_period=return_period, is_last_period=is_last_period)
 
-        response = api.get_data(return_period)
+        response = next(responses)
 
         if response.error_type == "not_generated":
             frappe.msgprint(
@@ -176,8 +175,14 @@ def download_gstr_2b(gstin, return_periods):
 
         # Handle multiple files for GSTR2B
         if response.data and (file_count := response.data.get("fc")):
-            for file_num in range(1, file_count + 1):
-                r = api.get_data(return_period, file_num=file_num)
+            for r in fetch_data(
+                GSTR2bAPI,
+                gstin,
+                [
+                    (return_period, None, file_num)
+                    for file_num in range(1, file_count + 1)
+                ],
+            ):
                 save_gstr_2b(gstin, return_period, r)
 
             continue  # skip first response if file_count is greater than 1
@@ -191,6 +196,44 @@ def download_gstr_2b(gstin, return_periods):
         end_transaction_progress(return_period)
 
 
+def fetch_data(api_class, gstin, args_list):
+    """
+    Yields responses of `get_data` for each set of arguments, in order.
+
+    - First request is made in the current context so that the auth token
+      is validated (and OTP requested, if required) only once.
+    - Remaining requests are made concurrently, bounded by `MAX_CONCURRENT_REQUESTS`
+      per GSTIN across the process (including GSTR-2B files of a period).
+    - The bound applies only within the current process. Jobs running in other
+      workers (or on other servers) for the same GSTIN are not accounted for.
+    """
+    if not args_list:
+        return
+
+    yield api_class(gstin).get_data(*args_list[0])
+    yield from iter_concurrently(
+        _get_data,
+        ((api_class, gstin, args) for args in args_list[1:]),
+        max_workers=MAX_CONCURRENT_REQUESTS,
+    )
+
+
+def _get_data(api_class, gstin, args):
+    with REQUEST_SLOTS_LOCK:
+        request_slot = REQUEST_SLOTS[gstin]
+
+    with request_slot:
+        return api_class(gstin).get_data(*args)
+
+
+def get_api_progress_reporter(total_expected_requests):
+    return ProgressReporter(
+        "update_api_progress",
+        total_expected_requests,
+        doctype="Purchase Reconciliation Tool",
+    )
+
+
 def save_gstr_2a(gstin, return_period, json_data):
     return_type = ReturnType.GSTR2A
     if (
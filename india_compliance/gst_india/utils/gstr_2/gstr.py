@@ -2,8 +2,14 @@ import frappe
 
 from india_compliance.gst_india.constants import STATE_NUMBERS
 from india_compliance.gst_india.doctype.gst_inward_supply.gst_inward_supply import (
+    bulk_create_inward_supply,
     create_inward_supply,
 )
+from india_compliance.gst_india.utils.progress import ProgressReporter
+
+# Minimum number of transactions in a category to import them in bulk
+BULK_IMPORT_THRESHOLD = 500
+BULK_IMPORT_CHUNK_SIZE = 5000
 
 
 def get_mapped_value(value, mapping):
@@ -54,29 +60,47 @@ class GSTR:
         if not suppliers:
             return
 
-        transactions = self.get_all_transactions(category, suppliers)
-        total_transactions = len(transactions)
-        current_transaction = 0
-
-        for transaction in transactions:
-            create_inward_supply(transaction)
-
-            current_transaction += 1
-            frappe.publish_realtime(
-                "update_transactions_progress",
-                {
-                    "current_progress": current_transaction * 100 / total_transactions,
-                    "return_period": self.return_period,
-                },
-                user=frappe.session.user,
-                doctype="Purchase Reconciliation Tool",
-            )
+        progress = self.get_progress_reporter(len(suppliers))
+
+        # suppliers may be streamed from file, hence transactions are created in chunks
+        for chunk in self.iter_transaction_chunks(category, suppliers):
+            transactions = [
+                transaction
+                for supplier_transactions in chunk
+                for transaction in supplier_transactions
+            ]
+
+            if self.is_bulk_import(transactions):
+                bulk_create_inward_supply(transactions)
+                progress.update(len(chunk), return_period=self.return_period)
 
-            if transaction.get("unique_key") in self.existing_transaction:
-                self.existing_transaction.pop(transaction.get("unique_key"))
+            else:
+                for supplier_transactions in chunk:
+                    for transaction in supplier_transactions:
+                        create_inward_supply(transaction)
 
+                    progress.update(return_period=self.return_period)
+
+            for transaction in transactions:
+                self.pop_existing_transaction(transaction)
+
+        progress.finish(return_period=self.return_period)
         self.delete_missing_transactions()
 
+    def is_bulk_import(self, transactions):
+        return len(transactions) >= BULK_IMPORT_THRESHOLD
+
+    def get_progress_reporter(self, total_suppliers):
+        return ProgressReporter(
+            "update_transactions_progress",
+            total_suppliers,
+            doctype="Purchase Reconciliation Tool",
+        )
+
+    def pop_existing_transaction(self, transaction):
+        if transaction.get("unique_key") in self.existing_transaction:
+            self.existing_transaction.pop(transaction.get("unique_key"))
+
     def delete_missing_transactions(self):
         """
         For GSTR2a, transactions are reflected immediately after it's pushed to GSTR-1.
@@ -86,14 +110,28 @@ class GSTR:
         """
         return
 
-    def get_all_transactions(self, category, suppliers):
-        transactions = []
+    def iter_transaction_chunks(self, category, suppliers):
+        """
+        Yields lists of transactions for each supplier,
+        in chunks of at least `BULK_IMPORT_CHUNK_SIZE` transactions.
+        """
+        chunk = []
+        chunk_size = 0
+
         for supplier in suppliers:
-            transactions.extend(self.get_supplier_transactions(category, supplier))
+            transactions = self.get_supplier_transactions(category, supplier)
+            chunk.append(transactions)
+            chunk_size += len(transactions)
+
+            if chunk_size >= BULK_IMPORT_CHUNK_SIZE:
+                yield chunk
+                chunk = []
+                chunk_size = 0
 
         self.update_gstins()
 
-        return transactions
+        if chunk:
+            yield chunk
 
     def get_supplier_transactions(self, category, supplier):
         return [
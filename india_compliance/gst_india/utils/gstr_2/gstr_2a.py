@@ -2,6 +2,7 @@ from datetime import datetime
 
 import frappe
 
+from india_compliance.gst_india.doctype.gstin.gstin import clear_gstin_status_cache
 from india_compliance.gst_india.utils import get_datetime, parse_datetime
 from india_compliance.gst_india.utils.gstr_2.gstr import GSTR, get_mapped_value
 
@@ -99,6 +100,8 @@ class GSTR2a(GSTR):
             "last_updated_on",
             get_datetime(),
         )
+        clear_gstin_status_cache(self.all_gstins)
+
         if not self.cancelled_gstins:
             return
 
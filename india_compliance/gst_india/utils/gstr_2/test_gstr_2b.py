@@ -1,4 +1,5 @@
 from datetime import date
+from unittest.mock import patch
 
 import frappe
 from frappe import parse_json, read_file
@@ -295,3 +296,14 @@ class TestGSTR2b(IntegrationTestCase, TestGSTRMixin):
             },
             doc,
         )
+
+
+class TestGSTR2bBulkImport(TestGSTR2b):
+    """Same assertions as `TestGSTR2b`, with transactions imported in bulk"""
+
+    @classmethod
+    def setUpClass(cls):
+        with patch(
+            "india_compliance.gst_india.utils.gstr_2.gstr.BULK_IMPORT_THRESHOLD", 0
+        ):
+            super().setUpClass()
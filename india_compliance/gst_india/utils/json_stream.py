@@ -0,0 +1,222 @@
+import json
+import re
+
+import frappe
+
+CHUNK_SIZE = 1024 * 1024  # characters
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+SCALAR_END = re.compile(r"[ \t\n\r,\]}]")
+DECODER = json.JSONDecoder()
+
+
+def load_json_lazily(file_path):
+    """
+    Loads JSON from file without loading arrays in memory.
+
+    Objects are returned as `frappe._dict` and every array is replaced
+    by a `JSONArrayStream`, which reads its items from the file when iterated.
+    Memory usage stays flat irrespective of the size of the file.
+    """
+    with open(file_path, encoding="utf-8") as file:
+        return _read_skeleton(JSONStreamReader(file), file_path, ())
+
+
+def _read_skeleton(reader, file_path, path):
+    char = reader.peek()
+
+    if char == "{":
+        return frappe._dict(
+            {
+                key: _read_skeleton(reader, file_path, (*path, key))
+                for key in reader.iter_object()
+            }
+        )
+
+    if char == "[":
+        position = reader.tell()
+        length = sum(1 for _ in reader.iter_array())
+        return JSONArrayStream(file_path, path, length, position)
+
+    return reader.read_value()
+
+
+class JSONArrayStream:
+    """
+    Array at `path` in a JSON file.
+
+    Items are parsed one at a time from the file on iteration,
+    starting directly at the `position` of the array in the file.
+    """
+
+    def __init__(self, file_path, path, length, position):
+        self.file_path = file_path
+        self.path = path
+        self.length = length
+        self.position = position
+
+    def __len__(self):
+        return self.length
+
+    def __bool__(self):
+        return bool(self.length)
+
+    def __iter__(self):
+        with open(self.file_path, encoding="utf-8") as file:
+            reader = JSONStreamReader(file)
+            reader.seek(self.position)
+            yield from reader.iter_array()
+
+    def __repr__(self):
+        return f"<JSONArrayStream {'.'.join(self.path)} ({self.length} items)>"
+
+
+class JSONStreamReader:
+    """
+    Incremental JSON reader over a text file.
+
+    Only the value being read (and a chunk of the file) is kept in memory.
+    Scalars and array items are decoded with the standard JSON decoder.
+    """
+
+    def __init__(self, file, chunk_size=CHUNK_SIZE):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+        # (file position, index in buffer) of chunks, to return to a position
+        self.chunks = []
+
+    def read_more(self):
+        if self.eof:
+            return False
+
+        file_position = self.file.tell()
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.chunks = [(position, index - self.pos) for position, index in self.chunks]
+        self.chunks.append((file_position, len(self.buffer) - len(chunk)))
+        self.pos = 0
+
+        # only the last chunk starting before the buffer is required
+        while len(self.chunks) > 1 and self.chunks[1][1] <= 0:
+            self.chunks.pop(0)
+
+        return True
+
+    def tell(self):
+        """Returns position of the next value, to return to it using `seek`"""
+        self.peek()
+
+        for file_position, index in reversed(self.chunks):
+            if index <= self.pos:
+                return (file_position, self.pos - index)
+
+    def seek(self, position):
+        file_position, offset = position
+
+        self.file.seek(file_position)
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.chunks = []
+
+        while len(self.buffer) <= offset and self.read_more():
+            pass
+
+        self.pos = offset
+
+    def peek(self):
+        """Returns next non-whitespace character without consuming it"""
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+
+            if not self.read_more():
+                raise self.get_error("Unexpected end of JSON")
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise self.get_error(f"Expecting '{char}'")
+
+        self.pos += 1
+
+    def read_value(self):
+        if self.peek() not in '"{[':
+            # numbers and literals may continue in the next chunk
+            while not SCALAR_END.search(self.buffer, self.pos) and self.read_more():
+                pass
+
+        while True:
+            try:
+                value, end = DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.read_more():
+                    continue
+
+                raise
+
+            self.pos = end
+            return value
+
+    def skip_value(self):
+        char = self.peek()
+
+        if char == "{":
+            for _ in self.iter_object():
+                self.skip_value()
+
+        elif char == "[":
+            for _ in self.iter_array():
+                pass
+
+        else:
+            self.read_value()
+
+    def iter_object(self):
+        """
+        Yields keys of the object at current position.
+        Value of each key must be consumed before the next key is requested.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+
+        while True:
+            key = self.read_value()
+            self.expect(":")
+            yield key
+
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+
+            self.expect("}")
+            return
+
+    def iter_array(self):
+        """Yields decoded items of the array at current position"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+
+        while True:
+            yield self.read_value()
+
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+
+            self.expect("]")
+            return
+
+    def get_error(self, message):
+        return json.JSONDecodeError(message, self.buffer, self.pos)
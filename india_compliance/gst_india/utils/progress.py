@@ -0,0 +1,98 @@
+import time
+
+import frappe
+
+
+class ProgressReporter:
+    """
+    Publishes realtime progress of long running jobs.
+
+    Progress is published only when it has advanced by `min_step` percent
+    or `min_interval` seconds have passed since it was last published.
+    This keeps the number of realtime events bounded irrespective of data size.
+
+    Progress of 100% is always published.
+
+    Usage:
+        progress = ProgressReporter("update_transactions_progress", total=len(docs))
+        for doc in docs:
+            ...
+            progress.update(return_period=return_period)
+    """
+
+    def __init__(
+        self,
+        event,
+        total,
+        *,
+        doctype=None,
+        docname=None,
+        user=None,
+        min_step=5,
+        min_interval=2,
+    ):
+        self.event = event
+        self.total = total
+        self.doctype = doctype
+        self.docname = docname
+        self.user = user or frappe.session.user
+        self.min_step = min_step
+        self.min_interval = min_interval
+
+        self.current = 0
+        self.last_progress = None
+        self.last_published_on = 0
+
+    @property
+    def progress(self):
+        if not self.total:
+            return 100
+
+        return min(self.current * 100 / self.total, 100)
+
+    def update(self, increment=1, **data):
+        """Increments current count and publishes progress if required"""
+        self.set_current(self.current + increment, **data)
+
+    def set_current(self, current, **data):
+        self.current = current
+
+        if self.should_publish():
+            self.publish(**data)
+
+    def finish(self, **data):
+        """Publishes 100% progress, if not already published"""
+        self.current = max(self.current, self.total)
+
+        if self.last_progress != 100:
+            self.publish(**data)
+
+    def should_publish(self):
+        progress = self.progress
+        if progress == self.last_progress:
+            return False
+
+        if progress == 100 or self.last_progress is None:
+            return True
+
+        return (
+            progress - self.last_progress >= self.min_step
+            or time.monotonic() - self.last_published_on >= self.min_interval
+        )
+
+    def publish(self, **data):
+        self.last_progress = self.progress
+        self.last_published_on = time.monotonic()
+
+        frappe.publish_realtime(
+            self.event,
+            {
+                "current_progress": self.last_progress,
+                "current": self.current,
+                "total": self.total,
+                **data,
+            },
+            user=self.user,
+            doctype=self.doctype,
+            docname=self.docname,
+        )
@@ -0,0 +1,88 @@
+from unittest.mock import patch
+
+import frappe
+from frappe.tests import IntegrationTestCase
+
+from india_compliance.gst_india.utils.api import (
+    IntegrationRequestBuffer,
+    enqueue_integration_request,
+    should_log_integration_request,
+)
+from india_compliance.gst_india.utils.concurrency import iter_concurrently
+
+
+class TestIntegrationRequestLogs(IntegrationTestCase):
+    def test_sampling(self):
+        settings = frappe._dict(successful_api_request_log_rate=0)
+
+        self.assertFalse(should_log_integration_request(settings))
+        self.assertFalse(
+            should_log_integration_request(settings, response={"success": True})
+        )
+
+        # failed and ignored errors are always logged
+        self.assertTrue(should_log_integration_request(settings, "Request failed"))
+        self.assertTrue(
+            should_log_integration_request(
+                settings,
+                response={"success": False, "error_type": "no_docs_found"},
+            )
+        )
+        self.assertTrue(
+            should_log_integration_request(settings, response={"success": "false"})
+        )
+
+        settings.successful_api_request_log_rate = 100
+        self.assertTrue(
+            should_log_integration_request(settings, response={"success": True})
+        )
+
+    @patch("frappe.enqueue")
+    def test_buffer_flush(self, enqueue):
+        buffer = IntegrationRequestBuffer(size=2)
+
+        for index in range(3):
+            buffer.add({"url": f"/{index}"})
+
+        # flushed when full
+        enqueue.assert_called_once()
+        self.assertEqual(
+            enqueue.call_args.kwargs["logs"], [{"url": "/0"}, {"url": "/1"}]
+        )
+
+        buffer.flush()
+        self.assertEqual(enqueue.call_count, 2)
+        self.assertEqual(enqueue.call_args.kwargs["logs"], [{"url": "/2"}])
+
+        # nothing to flush
+        buffer.flush()
+        self.assertEqual(enqueue.call_count, 2)
+
+    @patch("frappe.enqueue")
+    def test_buffer_flush_stale(self, enqueue):
+        buffer = IntegrationRequestBuffer(interval=0)
+        buffer.add({"url": "/0"})
+
+        enqueue.assert_called_once()
+
+    @patch("frappe.enqueue")
+    def test_buffer_shared_with_threads(self, enqueue):
+        buffer = IntegrationRequestBuffer()
+        frappe.local.integration_request_buffer = buffer
+
+        try:
+            list(
+                iter_concurrently(
+                    lambda index: enqueue_integration_request(url=f"/{index}"),
+                    [(index,) for index in range(5)],
+                )
+            )
+
+            enqueue.assert_not_called()
+            self.assertEqual(
+                sorted(log["url"] for log in buffer.logs),
+                [f"/{index}" for index in range(5)],
+            )
+
+        finally:
+            del frappe.local.integration_request_buffer
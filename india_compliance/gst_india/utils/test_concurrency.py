@@ -0,0 +1,138 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from frappe.tests import IntegrationTestCase
+
+from india_compliance.gst_india.utils.concurrency import (
+    get_site_context,
+    iter_concurrently,
+    run_in_site_context,
+)
+from india_compliance.gst_india.utils.gstr_2 import MAX_CONCURRENT_REQUESTS, fetch_data
+
+TEST_GSTIN = "24AAQCA8719H1ZC"
+
+
+class ConcurrencyTracker:
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+    def __exit__(self, *args):
+        with self.lock:
+            self.active -= 1
+
+
+class TestIterConcurrently(IntegrationTestCase):
+    def test_results_in_order(self):
+        def get_square(number):
+            # later calls complete first
+            time.sleep((5 - number) / 100)
+            return number * number
+
+        self.assertListEqual(
+            list(iter_concurrently(get_square, [(number,) for number in range(6)])),
+            [0, 1, 4, 9, 16, 25],
+        )
+
+    def test_max_workers(self):
+        tracker = ConcurrencyTracker()
+
+        def work(number):
+            with tracker:
+                time.sleep(0.02)
+
+        list(iter_concurrently(work, [(number,) for number in range(8)], max_workers=2))
+        self.assertLessEqual(tracker.max_active, 2)
+
+    def test_error_cancels_pending_calls(self):
+        tracker = ConcurrencyTracker()
+
+        def work(number):
+            tracker.calls.append(number)
+            if number == 1:
+                raise ValueError("Failed")
+
+            return number
+
+        with self.assertRaisesRegex(ValueError, "Failed"):
+            list(
+                iter_concurrently(
+                    work, [(number,) for number in range(10)], max_workers=1
+                )
+            )
+
+        self.assertListEqual(tracker.calls, [0, 1])
+
+    def test_consumer_stops_early(self):
+        tracker = ConcurrencyTracker()
+
+        def work(number):
+            tracker.calls.append(number)
+            return number
+
+        results = iter_concurrently(
+            work, [(number,) for number in range(10)], max_workers=1
+        )
+        self.assertEqual(next(results), 0)
+        results.close()
+
+        # at most the call submitted while the first result is consumed
+        self.assertLessEqual(len(tracker.calls), 2)
+
+
+class TestFetchData(IntegrationTestCase):
+    def test_requests_bounded_per_gstin(self):
+        tracker = ConcurrencyTracker()
+
+        class API:
+            def __init__(self, gstin):
+                self.gstin = gstin
+
+            def get_data(self, return_period):
+                # first request of each `fetch_data` is made without a slot
+                if return_period == 0:
+                    return return_period
+
+                with tracker:
+                    time.sleep(0.02)
+
+                return return_period
+
+        def download(gstin):
+            return list(fetch_data(API, gstin, [(period,) for period in range(8)]))
+
+        # eg: GSTR-2B files of a period downloaded by separate threads
+        context = get_site_context()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(run_in_site_context, context, download, TEST_GSTIN)
+                for _ in range(2)
+            ]
+
+            for future in futures:
+                self.assertListEqual(future.result(), list(range(8)))
+
+        self.assertLessEqual(tracker.max_active, MAX_CONCURRENT_REQUESTS)
+
+    def test_error_propagation(self):
+        class API:
+            def __init__(self, gstin):
+                pass
+
+            def get_data(self, return_period):
+                if return_period == 2:
+                    raise ValueError("Invalid return period")
+
+                return return_period
+
+        with self.assertRaisesRegex(ValueError, "Invalid return period"):
+            list(fetch_data(API, TEST_GSTIN, [(period,) for period in range(4)]))
@@ -1,5 +1,6 @@
 import json
 import re
+from unittest.mock import patch
 
 import responses
 from responses import matchers
@@ -10,12 +11,15 @@ from frappe.utils import add_to_date, get_datetime, getdate, now_datetime
 from frappe.utils.data import format_date
 from erpnext.controllers.sales_and_purchase_return import make_return_doc
 
+from india_compliance.exceptions import GSPServerError
 from india_compliance.gst_india.api_classes.base import BASE_URL
 from india_compliance.gst_india.utils import load_doc
+from india_compliance.gst_india.utils.concurrency import iter_in_workers
 from india_compliance.gst_india.utils.e_invoice import (
     EInvoiceData,
     cancel_e_invoice,
     generate_e_invoice,
+    generate_e_invoices,
     mark_e_invoice_as_cancelled,
     validate_e_invoice_applicability,
     validate_if_e_invoice_can_be_cancelled,
@@ -774,6 +778,40 @@ class TestEInvoice(IntegrationTestCase):
             si.name,
         )
 
+    def test_bulk_generation_auto_retry(self):
+        """e-Invoices are set to Auto-Retry if GSP server is down in bulk generation"""
+        docnames = [create_sales_invoice(is_in_state=True).name for _ in range(3)]
+        failed_docname = docnames[1]
+
+        def generate(docname, throw=True, force=False):
+            if docname == failed_docname:
+                raise GSPServerError
+
+        # commit of this connection, workers only call the mocked `generate`
+        with patch.object(frappe.db, "commit"), patch(
+            "india_compliance.gst_india.utils.e_waybill.iter_in_workers",
+            wraps=iter_in_workers,
+        ) as mock_iter_in_workers, patch(
+            "india_compliance.gst_india.utils.e_invoice.generate_e_invoice",
+            side_effect=generate,
+        ) as mock_generate:
+            generate_e_invoices(docnames)
+
+        mock_iter_in_workers.assert_called_once()
+        self.assertCountEqual(
+            [call.args[0] for call in mock_generate.call_args_list], docnames
+        )
+
+        # e-Invoices are pending for all invoices, since none were generated
+        self.assertListEqual(
+            frappe.get_all(
+                "Sales Invoice",
+                filters={"name": ("in", docnames)},
+                pluck="einvoice_status",
+            ),
+            ["Auto-Retry"] * 3,
+        )
+
     def _cancel_e_invoice(self, invoice_no):
         values = frappe._dict(
             {"reason": "Data Entry Mistake", "remark": "Data Entry Mistake"}
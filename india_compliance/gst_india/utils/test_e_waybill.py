@@ -1,6 +1,7 @@
 import datetime
 import random
 import re
+from unittest.mock import patch
 
 import pytz
 import responses
@@ -16,14 +17,17 @@ from erpnext.controllers.sales_and_purchase_return import make_return_doc
 
 from india_compliance.gst_india.api_classes.base import BASE_URL
 from india_compliance.gst_india.utils import load_doc
+from india_compliance.gst_india.utils.concurrency import iter_in_workers
 from india_compliance.gst_india.utils.e_invoice import (
     retry_e_invoice_e_waybill_generation,
 )
 from india_compliance.gst_india.utils.e_waybill import (
     EWaybillData,
     cancel_e_waybill,
+    extend_scheduled_e_waybills,
     fetch_e_waybill_data,
     generate_e_waybill,
+    generate_e_waybills,
     get_e_waybills_to_extend,
     schedule_ewaybill_for_extension,
     update_transporter,
@@ -640,6 +644,103 @@ class TestEWaybill(IntegrationTestCase):
                 "e-Waybill not found in list of scheduled e-Waybills",
             )
 
+    def test_bulk_generation(self):
+        docnames = [
+            self.create_sales_invoice_for("goods_item_with_ewaybill").name
+            for _ in range(3)
+        ]
+
+        with patch(
+            "india_compliance.gst_india.utils.e_waybill.iter_in_workers",
+            wraps=iter_in_workers,
+        ) as mock_iter_in_workers, patch(
+            "india_compliance.gst_india.utils.e_waybill._generate_e_waybill"
+        ) as mock_generate:
+            generate_e_waybills("Sales Invoice", docnames)
+
+        mock_iter_in_workers.assert_called_once()
+
+        # documents are loaded with child tables from prefetched data
+        self.assertCountEqual(
+            [
+                (call.args[0].name, len(call.args[0].items))
+                for call in mock_generate.call_args_list
+            ],
+            [
+                (docname, len(frappe.get_doc("Sales Invoice", docname).items))
+                for docname in docnames
+            ],
+        )
+
+    def test_extend_scheduled_e_waybills(self):
+        docnames = [
+            self.create_sales_invoice_for("goods_item_with_ewaybill").name
+            for _ in range(3)
+        ]
+        extension_data = self.e_waybill_test_data.get("extend_validity").get("values")
+
+        def create_log(docname):
+            return frappe.get_doc(
+                {
+                    "doctype": "e-Waybill Log",
+                    "e_waybill_number": str(random.randint(10**11, 10**12 - 1)),
+                    "reference_doctype": "Sales Invoice",
+                    "reference_name": docname,
+                    "valid_upto": add_to_date(now_datetime(), hours=-1),
+                    "extension_scheduled": 1,
+                    "extension_data": frappe.as_json(extension_data),
+                }
+            ).insert(ignore_links=True)
+
+        for docname in docnames:
+            create_log(docname)
+
+        missing_log = create_log("SINV-MISSING-00001")
+
+        extension_scheduled = {}
+
+        def extend_validity(doc, values, scheduled=False):
+            extension_scheduled[doc.name] = frappe.db.get_value(
+                "e-Waybill Log", {"reference_name": doc.name}, "extension_scheduled"
+            )
+
+        # workers run in this connection, hence nothing is committed
+        with patch.object(frappe.db, "commit"), patch(
+            "india_compliance.gst_india.utils.e_waybill.iter_in_workers",
+            side_effect=lambda func, args_list: [func(*args) for args in args_list],
+        ) as mock_iter_in_workers, patch(
+            "india_compliance.gst_india.utils.e_waybill._extend_validity",
+            side_effect=extend_validity,
+        ):
+            extend_scheduled_e_waybills()
+
+        # documents of a company GSTIN are extended together
+        mock_iter_in_workers.assert_called_once()
+        self.assertEqual(len(mock_iter_in_workers.call_args.args[1]), 3)
+
+        # extension is unscheduled before extending
+        self.assertDictEqual(
+            {docname: extension_scheduled.get(docname) for docname in docnames},
+            dict.fromkeys(docnames, 0),
+        )
+
+        # logs with missing reference are not unscheduled, and an error is logged
+        self.assertEqual(
+            frappe.db.get_value(
+                "e-Waybill Log", missing_log.name, "extension_scheduled"
+            ),
+            1,
+        )
+        self.assertTrue(
+            frappe.db.exists(
+                "Error Log",
+                {
+                    "reference_doctype": "e-Waybill Log",
+                    "reference_name": missing_log.name,
+                },
+            )
+        )
+
     def test_validate_doctype_for_e_waybill(self):
         """Validate if doctype is supported for e-waybill"""
         purchase_order = create_transaction(doctype="Purchase Order")
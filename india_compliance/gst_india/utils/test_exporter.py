@@ -0,0 +1,84 @@
+from io import BytesIO
+
+import openpyxl
+
+import frappe
+from frappe.tests import IntegrationTestCase
+
+from india_compliance.gst_india.utils.exporter import ExcelExporter
+
+HEADERS = [
+    {
+        "label": "Invoice Number",
+        "fieldname": "invoice_number",
+        "header_format": {"width": 30},
+    },
+    {
+        "label": "Taxable Value",
+        "fieldname": "taxable_value",
+        "fieldtype": "Float",
+        "data_format": {"number_format": "0.00"},
+    },
+    {
+        "label": "Taxable Value (2B)",
+        "fieldname": "taxable_value_2b",
+        "fieldtype": "Float",
+        "compare_with": "taxable_value",
+    },
+]
+
+
+class TestExcelExporter(IntegrationTestCase):
+    def test_write_only_workbook(self):
+        self.assertEqual(
+            self.get_workbook_details(write_only=True),
+            self.get_workbook_details(write_only=False),
+        )
+
+    def get_workbook_details(self, write_only):
+        excel = ExcelExporter(write_only=write_only)
+        excel.create_sheet(
+            sheet_name="Invoice Data",
+            filters=frappe._dict({"GSTIN": "24AAQCA8719H1ZC"}),
+            merged_headers={"Values": ["taxable_value", "taxable_value_2b"]},
+            headers=HEADERS,
+            data=[
+                {
+                    "invoice_number": f"SINV-{idx}",
+                    "taxable_value": idx * 100.5,
+                    "taxable_value_2b": idx * 100,
+                }
+                for idx in range(1, 11)
+            ],
+            default_data_format={"bg_color": "f2f2f2"},
+        )
+        excel.remove_sheet("Sheet")
+
+        ws = openpyxl.load_workbook(BytesIO(excel.save_workbook().getvalue()))[
+            "Invoice Data"
+        ]
+
+        return {
+            "merged_cells": [str(cell_range) for cell_range in ws.merged_cells.ranges],
+            "widths": {
+                column: dimension.width
+                for column, dimension in ws.column_dimensions.items()
+                if dimension.width
+            },
+            "conditional_formatting": [
+                str(rule.sqref) for rule in ws.conditional_formatting
+            ],
+            "cells": [
+                (
+                    cell.coordinate,
+                    cell.value,
+                    cell.font.b,
+                    cell.number_format,
+                    cell.fill.fgColor.rgb,
+                    cell.alignment.horizontal,
+                )
+                for row in ws.iter_rows()
+                for cell in row
+                if cell.value is not None
+            ],
+        }
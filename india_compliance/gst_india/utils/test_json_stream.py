@@ -0,0 +1,70 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from frappe.tests import IntegrationTestCase
+
+from india_compliance.gst_india.utils.json_stream import (
+    JSONArrayStream,
+    JSONStreamReader,
+    load_json_lazily,
+)
+
+DATA = {
+    "gstin": "24AAQCA8719H1ZC",
+    "amount": 1234.56,
+    "b2b": [
+        {
+            "ctin": "29AABCR1718E1ZL",
+            "inv": [{"val": 1e5, "rt": 18, "txval": -0.25, "flag": True}],
+        },
+        {"ctin": "27AAACE5789K1ZS", "inv": [], "note": 'quoted "value"'},
+    ],
+    "cdnr": [],
+    "summary": {"count": 12345678901234567890, "rate": 2.5e-3, "nil": None},
+    "last": 98.7,
+}
+
+
+class TestJSONStream(IntegrationTestCase):
+    def test_values_across_chunk_boundaries(self):
+        content = json.dumps(DATA)
+
+        for chunk_size in range(1, 40):
+            reader = JSONStreamReader(StringIO(content), chunk_size=chunk_size)
+            self.assertEqual(reader.read_value(), DATA, f"chunk size {chunk_size}")
+
+    def test_array_positions_across_chunk_boundaries(self):
+        content = json.dumps(DATA)
+
+        for chunk_size in range(1, 40):
+            reader = JSONStreamReader(StringIO(content), chunk_size=chunk_size)
+            positions = {}
+
+            for key in reader.iter_object():
+                if reader.peek() == "[":
+                    positions[key] = reader.tell()
+
+                reader.skip_value()
+
+            for key, position in positions.items():
+                reader.seek(position)
+                self.assertEqual(
+                    list(reader.iter_array()), DATA[key], f"chunk size {chunk_size}"
+                )
+
+    def test_load_json_lazily(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as file:
+            json.dump(DATA, file)
+
+        self.addCleanup(os.remove, file.name)
+        data = load_json_lazily(file.name)
+
+        self.assertIsInstance(data.b2b, JSONArrayStream)
+        self.assertEqual(len(data.b2b), 2)
+        self.assertFalse(data.cdnr)
+
+        self.assertEqual(list(data.b2b), DATA["b2b"])
+        self.assertEqual(data.summary, DATA["summary"])
+        self.assertEqual(data.last, DATA["last"])
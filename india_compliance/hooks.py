@@ -22,6 +22,8 @@ before_tests = "india_compliance.tests.before_tests"
 
 boot_session = "india_compliance.boot.set_bootinfo"
 
+after_request = "india_compliance.gst_india.utils.api.flush_integration_requests"
+
 setup_wizard_requires = "assets/india_compliance/js/setup_wizard.js"
 setup_wizard_complete = "india_compliance.gst_india.setup.setup_wizard_complete"
 setup_wizard_stages = "india_compliance.setup_wizard.get_setup_wizard_stages"
@@ -447,6 +449,9 @@ scheduler_events = {
         "0 1 * * *": [
             "india_compliance.gst_india.utils.e_waybill.extend_scheduled_e_waybills"
         ],
+        "0 3 * * *": [
+            "india_compliance.gst_india.doctype.gstin.gstin.refresh_stale_gstin_statuses"
+        ],
     }
 }
 